@@ -0,0 +1,52 @@
+"""
+Benchmark: ActivitySeries recording and trend queries as event volume grows
+
+Events are spread over the last 30 days. Recording adds each one to its
+minute, hour and day bucket; queries read at most one ring of buckets,
+so their cost stays flat however many events were recorded.
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.activity_series import ActivitySeries, READ, MINUTE, HOUR, DAY
+from utils.logger import configure_logging
+
+EVENT_COUNTS = [10000, 100000, 1000000]
+QUERIES = 200
+
+def main():
+    configure_logging(level="WARNING")
+    now = time.time()
+    print(f"{'events':>8} | {'record us/event':>15} | {'30d by day us':>13} | "
+          f"{'7d by hour us':>13} | {'1d by minute us':>15}")
+    print("-" * 78)
+    for count in EVENT_COUNTS:
+        rng = random.Random(count)
+        # Events mostly arrive in time order, with some jitter
+        timestamps = sorted(now - 30 * 86400 * rng.random() for _ in range(count))
+        series = ActivitySeries(retention_days=365)
+
+        start = time.perf_counter()
+        series.record_many(READ, timestamps)
+        record = (time.perf_counter() - start) / count * 1e6
+
+        timings = []
+        for resolution, window in ((DAY, timedelta(days=30)), (HOUR, timedelta(days=7)),
+                                   (MINUTE, timedelta(days=1))):
+            since = datetime.now() - window
+            start = time.perf_counter()
+            for _ in range(QUERIES):
+                series.series(READ, resolution, since)
+            timings.append((time.perf_counter() - start) / QUERIES * 1e6)
+
+        print(f"{count:>8} | {record:>15.2f} | {timings[0]:>13.1f} | {timings[1]:>13.1f} | {timings[2]:>15.1f}")
+
+if __name__ == "__main__":
+    main()
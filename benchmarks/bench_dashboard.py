@@ -0,0 +1,75 @@
+"""
+Benchmark: UserAPI.get_user_dashboard against a growing inbox
+
+The old dashboard formatted every visible alert (get_alerts plus
+get_snoozed_alerts) and then categorised the lists on each request. The
+dashboard now reads counters kept up to date by the inbox index, so after
+the first build a request only formats the handful of alerts it shows.
+
+Each round marks one alert read before fetching the dashboard, so the
+incremental counter update is part of the measured cost.
+"""
+
+import os
+import sys
+import time
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_service import AlertService
+from services.notification_service import NotificationService
+from api.user_api import UserAPI
+from models.user import User
+from models.alert import Severity, VisibilityType
+from utils.logger import configure_logging
+
+ROUNDS = 200
+INBOX_SIZES = [100, 1000, 10000]
+SEVERITIES = [Severity.INFO, Severity.WARNING, Severity.CRITICAL]
+
+def build_api(size: int):
+    alert_service = AlertService()
+    notification_service = NotificationService(alert_service)
+    user_api = UserAPI(alert_service, notification_service)
+    alert_service.add_user(User("reader", "Reader", "reader@example.com"))
+    alert_service.add_team("reader-team", {"reader"})
+    alert_ids = []
+    for i in range(size):
+        alert = alert_service.create_alert(f"Team {i}", "m", SEVERITIES[i % 3], "admin1",
+                                           VisibilityType.TEAM, {"reader-team"})
+        alert_ids.append(alert.alert_id)
+    for alert_id in alert_ids[::10]:
+        user_api.snooze_alert("reader", alert_id)
+    return user_api, alert_ids
+
+def old_dashboard(user_api: UserAPI, user_id: str):
+    all_alerts = user_api.get_alerts(user_id)
+    snoozed_alerts = user_api.get_snoozed_alerts(user_id)
+    critical_alerts = [a for a in all_alerts if a['severity'] == 'critical' and not a['is_snoozed']]
+    unread_alerts = [a for a in all_alerts if a['status'] == 'unread' and not a['is_snoozed']]
+    return len(all_alerts), len(unread_alerts), len(snoozed_alerts), len(critical_alerts)
+
+def time_rounds(user_api: UserAPI, alert_ids, dashboard) -> float:
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        user_api.mark_alert_read("reader", alert_ids[(i * 7 + 1) % len(alert_ids)])
+        dashboard()
+    return (time.perf_counter() - start) / ROUNDS * 1e3
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{'inbox':>7} | {'full scan ms':>12} | {'counters ms':>11} | {'speedup':>7}")
+    print("-" * 47)
+    for size in INBOX_SIZES:
+        user_api, alert_ids = build_api(size)
+        scan = time_rounds(user_api, alert_ids, lambda: old_dashboard(user_api, "reader"))
+
+        user_api, alert_ids = build_api(size)
+        user_api.get_user_dashboard("reader")  # first build
+        counters = time_rounds(user_api, alert_ids, lambda: user_api.get_user_dashboard("reader"))
+
+        print(f"{size:>7} | {scan:>12.3f} | {counters:>11.3f} | {scan / counters:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: memory per million deliveries, NotificationDelivery objects versus DeliveryLog
+
+The old log kept one object per send with a uuid4 string and a datetime.
+DeliveryLog stores 18-byte records, keeps a bounded ring in memory and
+spills older segments to a memory-mapped file. Append times include the
+tracemalloc overhead, so only compare them with each other.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.notification import NotificationDelivery
+from services.delivery_log import DeliveryLog
+from utils.logger import configure_logging
+
+DELIVERIES = 1000000
+USERS = 100000
+ALERTS = 50
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    log = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return log, current, elapsed
+
+# Id strings are shared with the User and Alert objects, so neither store pays for them
+USER_IDS = [f"user{i}" for i in range(USERS)]
+ALERT_IDS = [f"alert{i}" for i in range(ALERTS)]
+
+def build_objects():
+    return [
+        NotificationDelivery(str(uuid.uuid4()), USER_IDS[i % USERS], ALERT_IDS[i % ALERTS], "in_app")
+        for i in range(DELIVERIES)
+    ]
+
+def build_log(capacity: int):
+    log = DeliveryLog(capacity=capacity)
+    for i in range(DELIVERIES):
+        log.append(USER_IDS[i % USERS], ALERT_IDS[i % ALERTS], "in_app")
+    return log
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{DELIVERIES} deliveries to {USERS} users across {ALERTS} alerts")
+    print(f"{'store':>26} | {'MB in memory':>12} | {'MB on disk':>10} | {'s to append':>11}")
+    print("-" * 70)
+
+    _, memory, elapsed = measure(build_objects)
+    print(f"{'NotificationDelivery list':>26} | {memory / 1e6:>12.1f} | {0:>10.1f} | {elapsed:>11.2f}")
+
+    for capacity in (DELIVERIES, DELIVERIES // 8):
+        log, memory, elapsed = measure(lambda: build_log(capacity))
+        on_disk = log.get_spilled_count() * 18
+        label = f"DeliveryLog cap={capacity}"
+        print(f"{label:>26} | {memory / 1e6:>12.1f} | {on_disk / 1e6:>10.1f} | {elapsed:>11.2f}")
+
+        start = time.perf_counter()
+        history = log.get_user_history("user42")
+        print(f"{'':>26}   user history: {len(history)} rows in "
+              f"{(time.perf_counter() - start) * 1000:.0f}ms")
+        log.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: email throughput for a 10k-recipient alert, one SMTP connection versus a pool
+
+Messages go to a local SMTP stub that spends a little time per message to
+stand in for a remote relay. A single connection is bound by that per-message
+round trip; the pool keeps several connections busy at once.
+"""
+
+import os
+import sys
+import time
+
+# Add src and the repo root (for the test stubs) to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.delivery.email_delivery import EmailDeliveryChannel
+from models.user import User
+from models.alert import Alert, AlertVisibility, Severity, VisibilityType, DeliveryType
+from utils.logger import configure_logging
+from tests.stub_servers import StubSMTPServer
+
+RECIPIENTS = 10000
+RELAY_DELAY_SECONDS = 0.0005
+POOL_SIZES = [1, 4, 8]
+
+def main():
+    configure_logging(level="WARNING")
+    server = StubSMTPServer(delay=RELAY_DELAY_SECONDS).start()
+    users = [User(f"user{i}", f"User {i}", f"user{i}@example.com") for i in range(RECIPIENTS)]
+    alert = Alert("bench", "Outage", "Service degraded", Severity.CRITICAL, "admin1",
+                  AlertVisibility(VisibilityType.ORGANIZATION, set()), DeliveryType.EMAIL)
+
+    print(f"{RECIPIENTS} recipients, relay delay {RELAY_DELAY_SECONDS * 1000:.1f}ms/message")
+    print(f"{'connections':>11} | {'seconds':>7} | {'msgs/s':>8}")
+    print("-" * 33)
+    for pool_size in POOL_SIZES:
+        channel = EmailDeliveryChannel(host="127.0.0.1", port=server.port, pool_size=pool_size)
+
+        start = time.perf_counter()
+        results = channel.send_batch(users, alert)
+        elapsed = time.perf_counter() - start
+        channel.close()
+
+        assert all(results)
+        print(f"{pool_size:>11} | {elapsed:>7.2f} | {RECIPIENTS / elapsed:>8.0f}")
+
+    server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: time-to-read percentiles from sketches vs scanning preferences
+
+The scan reads every read preference's delivery and read times and takes
+exact percentiles per severity and team (even vectorised, its cost grows
+with the preference count). EngagementMetrics pays a small cost per read
+transition and answers from bounded sketches.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.alert import Severity
+from services.engagement_metrics import EngagementMetrics, READ_LATENCY
+from utils.logger import configure_logging
+
+READ_COUNTS = [10000, 100000, 1000000]
+TEAMS = 50
+SEVERITIES = list(Severity)
+QUERIES = 20
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{'reads':>8} | {'record us/read':>14} | {'scan ms':>8} | {'sketch ms':>9} | {'max p99 error':>13}")
+    print("-" * 65)
+    for count in READ_COUNTS:
+        rng = np.random.default_rng(count)
+        delivered_at = rng.uniform(0, 86400 * 30, count)
+        read_at = delivered_at + rng.lognormal(mean=6, sigma=1.5, size=count)
+        severity = rng.integers(0, len(SEVERITIES), count)
+        team = rng.integers(0, TEAMS, count)
+
+        metrics = EngagementMetrics()
+        latencies = (read_at - delivered_at).tolist()
+        start = time.perf_counter()
+        for seconds, severity_code, team_code in zip(latencies, severity.tolist(), team.tolist()):
+            metrics.record(READ_LATENCY, seconds, SEVERITIES[severity_code], (f"team{team_code}",))
+        record = (time.perf_counter() - start) / count * 1e6
+
+        start = time.perf_counter()
+        for _ in range(QUERIES):
+            exact = {t: np.percentile(read_at[team == t] - delivered_at[team == t], [50, 95, 99], method="lower")
+                     for t in range(TEAMS)}
+            for code in range(len(SEVERITIES)):
+                np.percentile(read_at[severity == code] - delivered_at[severity == code], [50, 95, 99], method="lower")
+        scan = (time.perf_counter() - start) / QUERIES * 1e3
+
+        start = time.perf_counter()
+        for _ in range(QUERIES):
+            summary = metrics.get_summary(READ_LATENCY)
+        sketch = (time.perf_counter() - start) / QUERIES * 1e3
+
+        error = max(abs(summary['by_team'][f"team{t}"]['p99'] - exact[t][2]) / exact[t][2] for t in range(TEAMS))
+        print(f"{count:>8} | {record:>14.2f} | {scan:>8.2f} | {sketch:>9.2f} | {error:>12.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: organization-wide fan-out throughput at different log levels
+
+Records go to os.devnull through the async sink, so the numbers show what
+the delivery path pays for emitting (or skipping) log records.
+"""
+
+import os
+import sys
+import time
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_service import AlertService
+from services.notification_service import NotificationService
+from models.user import User
+from models.alert import Severity, VisibilityType
+from utils.logger import configure_logging, flush_logging
+
+USERS = 20000
+LEVELS = ["DEBUG", "INFO", "WARNING", "OFF"]
+
+def run_fanout(level: str, sink) -> float:
+    configure_logging(level=level, async_sink=True, stream=sink)
+
+    alert_service = AlertService()
+    notification_service = NotificationService(alert_service)
+    for i in range(USERS):
+        alert_service.add_user(User(f"user{i}", f"User {i}", f"user{i}@example.com"))
+
+    start = time.perf_counter()
+    alert_service.create_alert("Outage", "Database down", Severity.CRITICAL, "admin1",
+                               VisibilityType.ORGANIZATION, set())
+    elapsed = time.perf_counter() - start
+
+    flush_logging()
+    assert notification_service.get_delivery_stats()["total_deliveries"] == USERS
+    return elapsed
+
+def main():
+    with open(os.devnull, "w") as sink:
+        results = [(level, run_fanout(level, sink)) for level in LEVELS]
+    configure_logging()
+
+    print(f"Fan-out to {USERS} users")
+    print(f"{'level':>8} | {'seconds':>8} | {'deliveries/s':>12}")
+    print("-" * 34)
+    for level, elapsed in results:
+        print(f"{level:>8} | {elapsed:>8.3f} | {USERS / elapsed:>12.0f}")
+
+if __name__ == "__main__":
+    main()
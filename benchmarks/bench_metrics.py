@@ -0,0 +1,93 @@
+"""
+Benchmark: admin metrics and the analytics report against a growing alert count
+
+The old code rebuilt every count from list_all_alerts on each call:
+severity and visibility breakdowns, top creators and the time windows,
+several passes per report. Counts now come from the MetricsAggregator
+(kept current by alert events) and the created_at index, so a report
+costs the same however many alerts exist.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_service import AlertService
+from services.metrics_aggregator import MetricsAggregator
+from services.notification_service import NotificationService
+from services.report_cache import ReportCache
+from api.admin_api import AdminAPI
+from api.analytics_api import AnalyticsAPI
+from models.alert import Severity, VisibilityType
+from utils.logger import configure_logging
+
+ROUNDS = 5
+ALERT_COUNTS = [10000, 100000, 300000]
+SEVERITIES = [Severity.INFO, Severity.WARNING, Severity.CRITICAL]
+
+def build_apis(count: int):
+    alert_service = AlertService()
+    # The report only reads alert counts, so no users or fan-out are needed
+    notification_service = NotificationService(alert_service)
+    alert_service.remove_observer(notification_service)
+    metrics = MetricsAggregator(alert_service)
+    alert_service.create_alerts_bulk([
+        dict(title=f"Alert {i}", message="m", severity=SEVERITIES[i % 3], created_by=f"admin{i % 40}",
+             visibility_type=VisibilityType.ORGANIZATION, target_ids=set())
+        for i in range(count)
+    ])
+    # A zero TTL recomputes every section, so the report cost is measured rather than cached
+    analytics_api = AnalyticsAPI(alert_service, notification_service, metrics, ReportCache(ttl=0))
+    return AdminAPI(alert_service, metrics), analytics_api
+
+def old_counts(alert_service: AlertService):
+    """The passes the old get_alert_metrics + generate_report made over the alerts"""
+    def severities(alerts):
+        return {s.value: len([a for a in alerts if a.severity == s]) for s in SEVERITIES}
+
+    def visibilities(alerts):
+        breakdown = {vt.value: 0 for vt in VisibilityType}
+        for alert in alerts:
+            breakdown[alert.visibility.type.value] += 1
+        return breakdown
+
+    def creators(alerts):
+        counts = {}
+        for alert in alerts:
+            counts[alert.created_by] = counts.get(alert.created_by, 0) + 1
+        return sorted(counts.items(), key=lambda x: x[1], reverse=True)[:5]
+
+    today = datetime.now().date()
+    admin = alert_service.list_all_alerts()
+    system = alert_service.list_all_alerts()
+    analytics = alert_service.list_all_alerts()
+    windows = [
+        [a for a in analytics if a.created_at.date() == today],
+        [a for a in analytics if a.created_at.date() >= today - timedelta(days=7)],
+        [a for a in analytics if a.created_at.date() >= today - timedelta(days=30)],
+    ]
+    return (severities(admin), visibilities(admin), severities(system), visibilities(system),
+            [severities(w) for w in windows], creators(analytics))
+
+def timed(run) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        run()
+    return (time.perf_counter() - start) / ROUNDS * 1e3
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{'alerts':>8} | {'full scans ms':>13} | {'aggregated ms':>13}")
+    print("-" * 40)
+    for count in ALERT_COUNTS:
+        admin_api, analytics_api = build_apis(count)
+        scans = timed(lambda: old_counts(admin_api.alert_service))
+        aggregated = timed(lambda: (admin_api.get_alert_metrics(), analytics_api.generate_report()))
+        print(f"{count:>8} | {scans:>13.2f} | {aggregated:>13.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: onboarding users, teams and alerts one at a time versus in bulk
+
+Loads 100k users and 1k teams, then creates 1k team alerts with a
+NotificationService attached, once through add_user/add_team/create_alert
+and once through the bulk APIs, which update the indexes once per batch,
+persist each batch in one storage call and fan out the alerts with a
+single on_alerts_created event. Runs in memory and against SQLiteStorage.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.alert import Severity, VisibilityType
+from models.user import User
+from services.alert_service import AlertService
+from services.notification_service import NotificationService
+from storage.sqlite_storage import SQLiteStorage
+from utils.logger import configure_logging
+
+USERS = 100000
+TEAMS = 1000
+ALERTS = 1000
+
+def make_users():
+    return [User(f"user{i}", f"User {i}", f"user{i}@example.com") for i in range(USERS)]
+
+def make_teams():
+    return {f"team{team}": {f"user{i}" for i in range(team, USERS, TEAMS)} for team in range(TEAMS)}
+
+def make_alert_specs():
+    return [
+        dict(title=f"Alert {i}", message="Message", severity=Severity.INFO, created_by="admin",
+             visibility_type=VisibilityType.TEAM, target_ids={f"team{i % TEAMS}"})
+        for i in range(ALERTS)
+    ]
+
+def one_at_a_time(alert_service, users, teams, specs):
+    return (
+        lambda: [alert_service.add_user(user) for user in users],
+        lambda: [alert_service.add_team(team_id, member_ids) for team_id, member_ids in teams.items()],
+        lambda: [alert_service.create_alert(**spec) for spec in specs],
+    )
+
+def bulk(alert_service, users, teams, specs):
+    return (
+        lambda: alert_service.add_users_bulk(users),
+        lambda: alert_service.add_teams_bulk(teams),
+        lambda: alert_service.create_alerts_bulk(specs),
+    )
+
+def run(phases, storage=None):
+    users, teams, specs = make_users(), make_teams(), make_alert_specs()
+    alert_service = AlertService(storage=storage)
+    notification_service = NotificationService(alert_service)
+    timings = []
+    for phase in phases(alert_service, users, teams, specs):
+        start = time.perf_counter()
+        phase()
+        timings.append(time.perf_counter() - start)
+    return timings, notification_service.get_delivery_stats()["user_preferences"]
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{USERS} users, {TEAMS} teams, {ALERTS} team alerts (seconds; alerts include initial delivery)")
+    print(f"{'mode':>22} | {'users':>6} | {'teams':>6} | {'alerts':>6} | {'total':>6} | {'preferences':>11}")
+    print("-" * 75)
+    directory = tempfile.mkdtemp()
+    try:
+        for backend in ("memory", "sqlite"):
+            for name, phases in (("one at a time", one_at_a_time), ("bulk", bulk)):
+                storage = None
+                if backend == "sqlite":
+                    storage = SQLiteStorage(os.path.join(directory, f"{phases.__name__}.db"))
+                (users_s, teams_s, alerts_s), preferences = run(phases, storage)
+                total = users_s + teams_s + alerts_s
+                print(f"{backend:>7} {name:>14} | {users_s:>6.2f} | {teams_s:>6.2f} | {alerts_s:>6.2f} | "
+                      f"{total:>6.2f} | {preferences:>11}")
+                if storage:
+                    storage.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: reading a page of a heavy user's inbox and of the admin listing
+
+Before keyset pagination a client showing 50 alerts still had the whole
+inbox formatted (and sorted) by UserAPI.get_alerts, or the whole alert list
+returned by AdminAPI.list_alerts. A page is now a bisect per sorted index
+plus the page itself, wherever in the history the cursor points.
+"""
+
+import os
+import sys
+import time
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_service import AlertService
+from services.notification_service import NotificationService
+from api.admin_api import AdminAPI
+from api.user_api import UserAPI
+from models.user import User
+from models.alert import Severity, VisibilityType
+from utils.logger import configure_logging
+
+ROUNDS = 50
+PAGE_SIZE = 50
+INBOX_SIZES = [1000, 5000, 20000]
+
+def build_apis(size: int):
+    alert_service = AlertService()
+    notification_service = NotificationService(alert_service)
+    alert_service.add_user(User("reader", "Reader", "reader@example.com"))
+    alert_service.add_teams_bulk({"team-a": {"reader"}, "team-b": {"reader"}})
+    targets = [(VisibilityType.ORGANIZATION, set()), (VisibilityType.TEAM, {"team-a"}),
+               (VisibilityType.TEAM, {"team-b"}), (VisibilityType.USER, {"reader"})]
+    alert_service.create_alerts_bulk([
+        dict(title=f"Alert {i}", message="m", severity=Severity.INFO, created_by="admin1",
+             visibility_type=targets[i % 4][0], target_ids=targets[i % 4][1])
+        for i in range(size)
+    ])
+    return UserAPI(alert_service, notification_service), AdminAPI(alert_service)
+
+def timed(read) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        read()
+    return (time.perf_counter() - start) / ROUNDS * 1e3
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{'inbox':>7} | {'get_alerts ms':>13} | {'page 1 ms':>9} | {'mid page ms':>11} | "
+          f"{'list_alerts ms':>14} | {'admin page ms':>13}")
+    print("-" * 84)
+    for size in INBOX_SIZES:
+        user_api, admin_api = build_apis(size)
+
+        # A cursor halfway down the inbox
+        cursor = None
+        for _ in range(size // PAGE_SIZE // 2):
+            cursor = user_api.get_alerts_page("reader", cursor, PAGE_SIZE)['next_cursor']
+
+        full = timed(lambda: user_api.get_alerts("reader")[:PAGE_SIZE])
+        first = timed(lambda: user_api.get_alerts_page("reader", None, PAGE_SIZE))
+        middle = timed(lambda: user_api.get_alerts_page("reader", cursor, PAGE_SIZE))
+        listing = timed(lambda: admin_api.list_alerts()[:PAGE_SIZE])
+        admin_page = timed(lambda: admin_api.list_alerts_page(cursor, PAGE_SIZE))
+
+        print(f"{size:>7} | {full:>13.3f} | {first:>9.3f} | {middle:>11.3f} | "
+              f"{listing:>14.3f} | {admin_page:>13.3f}")
+
+if __name__ == "__main__":
+    main()
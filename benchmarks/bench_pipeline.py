@@ -0,0 +1,92 @@
+"""
+Benchmark: synchronous delivery versus the asyncio delivery pipeline
+
+A fake channel adds artificial latency per batch. The pipeline keeps
+create_alert latency flat regardless of audience size and overlaps the
+channel latency across workers.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_service import AlertService
+from services.notification_service import NotificationService
+from services.delivery.base_delivery import DeliveryChannel, DeliveryResult
+from services.delivery.delivery_factory import DeliveryFactory
+from services.delivery.pipeline import DeliveryPipeline
+from models.user import User
+from models.alert import Severity, VisibilityType, DeliveryType
+from utils.logger import configure_logging
+
+BATCH_LATENCY_SECONDS = 0.02
+GATEWAY_BATCH_SIZE = 100  # recipients the fake gateway accepts per round trip
+AUDIENCE_SIZES = [1000, 5000, 20000]
+
+class LatencyChannel(DeliveryChannel):
+    """Pretends every batch is a network round trip"""
+
+    def __init__(self, delivery_logger=None):
+        self.delivery_logger = delivery_logger
+
+    def send(self, user: User, alert) -> bool:
+        time.sleep(BATCH_LATENCY_SECONDS)
+        return True
+
+    def send_batch(self, users: List[User], alert) -> List[DeliveryResult]:
+        time.sleep(BATCH_LATENCY_SECONDS * self._round_trips(users))
+        return [DeliveryResult(True, user_id=user.user_id) for user in users]
+
+    async def send_batch_async(self, users: List[User], alert) -> List[DeliveryResult]:
+        await asyncio.sleep(BATCH_LATENCY_SECONDS * self._round_trips(users))
+        return [DeliveryResult(True, user_id=user.user_id) for user in users]
+
+    def _round_trips(self, users: List[User]) -> int:
+        return -(-len(users) // GATEWAY_BATCH_SIZE)
+
+    def get_channel_type(self) -> str:
+        return "latency"
+
+def run(audience: int, pipeline: DeliveryPipeline = None):
+    alert_service = AlertService()
+    notification_service = NotificationService(alert_service, pipeline=pipeline)
+    for i in range(audience):
+        alert_service.add_user(User(f"user{i}", f"User {i}", f"user{i}@example.com"))
+
+    start = time.perf_counter()
+    alert_service.create_alert("Outage", "m", Severity.CRITICAL, "admin1",
+                               VisibilityType.ORGANIZATION, set())
+    create_latency = time.perf_counter() - start
+
+    if pipeline:
+        pipeline.wait_until_idle()
+    total = time.perf_counter() - start
+
+    assert notification_service.get_delivery_stats()["total_deliveries"] == audience
+    return create_latency, total
+
+def main():
+    configure_logging(level="WARNING")
+    DeliveryFactory.register_channel(DeliveryType.IN_APP, LatencyChannel)
+
+    pipeline = DeliveryPipeline(workers=8, per_channel_concurrency=8, batch_size=GATEWAY_BATCH_SIZE)
+    pipeline.start()
+
+    print(f"Batch latency {BATCH_LATENCY_SECONDS * 1000:.0f}ms, batch size {pipeline.batch_size}")
+    print(f"{'audience':>9} | {'mode':>8} | {'create ms':>9} | {'total s':>7} | {'msgs/s':>8}")
+    print("-" * 54)
+    for audience in AUDIENCE_SIZES:
+        for mode, active_pipeline in (("sync", None), ("pipeline", pipeline)):
+            create_latency, total = run(audience, active_pipeline)
+            print(f"{audience:>9} | {mode:>8} | {create_latency * 1000:>9.1f} | "
+                  f"{total:>7.2f} | {audience / total:>8.0f}")
+
+    pipeline.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: UserAlertPreference objects versus the columnar PreferenceStore
+
+Builds 10M user × alert preferences (100 org-wide alerts to 100k users) and
+measures memory and the time to find every preference due for a reminder.
+Objects are only built up to OBJECT_LIMIT, which already needs several GB;
+their figures for larger sizes are scaled linearly and marked with '*'.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.notification import UserAlertPreference
+from services.preference_store import PreferenceStore
+from utils.logger import configure_logging
+
+USERS = 100000
+PREFERENCE_COUNTS = [1000000, 10000000]
+OBJECT_LIMIT = 1000000
+FREQUENCY_MINUTES = 120
+
+USER_IDS = [f"user{i}" for i in range(USERS)]
+
+def alert_ids(count: int):
+    return [f"alert{i}" for i in range(count // USERS)]
+
+def build_objects(count: int):
+    # user_id -> {alert_id -> preference}, as NotificationService used to hold them
+    overdue = datetime.now() - timedelta(days=1)
+    preferences = {}
+    for alert_index, alert_id in enumerate(alert_ids(count)):
+        for user_index, user_id in enumerate(USER_IDS):
+            preference = UserAlertPreference(user_id, alert_id)
+            if (user_index + alert_index) % 10:
+                preference.last_reminded_at = overdue if user_index % 7 == 0 else datetime.now()
+            preferences.setdefault(user_id, {})[alert_id] = preference
+    return preferences
+
+def build_store(count: int) -> PreferenceStore:
+    store = PreferenceStore()
+    now = datetime.now().timestamp()
+    overdue = now - 86400
+    user_index = np.arange(USERS)
+    for alert_index, alert_id in enumerate(alert_ids(count)):
+        rows, _ = store.get_or_create_rows(USER_IDS, alert_id)
+        reminded = ((user_index + alert_index) % 10) != 0
+        store._last_reminded_at[rows[reminded]] = np.where(user_index[reminded] % 7 == 0, overdue, now)
+    return store
+
+def measure(build, count: int):
+    tracemalloc.start()
+    preferences = build(count)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return preferences, memory
+
+def scan_objects(preferences) -> int:
+    return sum(
+        1 for by_alert in preferences.values() for preference in by_alert.values()
+        if preference.should_remind(FREQUENCY_MINUTES)
+    )
+
+def scan_store(store: PreferenceStore, count: int) -> int:
+    frequencies = {alert_id: FREQUENCY_MINUTES * 60 for alert_id in alert_ids(count)}
+    return len(store.due_rows(frequencies))
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{'preferences':>12} | {'store':>7} | {'MB':>9} | {'bytes/pref':>10} | {'scan ms':>9} | {'due':>8}")
+    print("-" * 71)
+
+    object_row = None
+    for count in PREFERENCE_COUNTS:
+        if count <= OBJECT_LIMIT:
+            preferences, memory = measure(build_objects, count)
+            due, elapsed = timed(scan_objects, preferences)
+            object_row = (count, memory, elapsed, due)
+            del preferences
+            scale, mark = 1, " "
+        else:
+            scale, mark = count / object_row[0], "*"
+        _, memory, elapsed, due = object_row
+        print(f"{count:>12} | {'objects':>7} | {memory * scale / 1e6:>8.0f}{mark} | "
+              f"{memory / object_row[0]:>10.0f} | {elapsed * scale * 1000:>8.0f}{mark} | {int(due * scale):>8}")
+
+        store, memory = measure(build_store, count)
+        due, elapsed = timed(scan_store, store, count)
+        print(f"{count:>12} | {'columns':>7} | {memory / 1e6:>9.0f} | "
+              f"{memory / count:>10.0f} | {elapsed * 1000:>9.0f} | {due:>8}")
+        del store
+
+if __name__ == "__main__":
+    main()
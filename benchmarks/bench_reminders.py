@@ -0,0 +1,62 @@
+"""
+Benchmark: NotificationService.process_reminders tick cost
+
+Builds a growing number of stored preferences that are not due and a fixed
+number that are, then times one reminder tick. Tick time should follow the
+due count, not the total number of preferences.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_service import AlertService
+from services.notification_service import NotificationService
+from models.user import User
+from models.alert import Severity, VisibilityType
+from utils.logger import configure_logging
+
+DUE_REMINDERS = 100
+USER_COUNTS = [1000, 10000, 50000]
+ALERTS = 4
+
+def build_service(user_count: int) -> NotificationService:
+    alert_service = AlertService()
+    notification_service = NotificationService(alert_service)
+
+    for i in range(user_count):
+        alert_service.add_user(User(f"user{i}", f"User {i}", f"user{i}@example.com"))
+    for i in range(ALERTS):
+        alert_service.create_alert(f"Alert {i}", "m", Severity.INFO, "admin1",
+                                   VisibilityType.ORGANIZATION, set())
+
+    # Make a fixed slice of preferences overdue
+    alert_id = next(iter(alert_service._alerts))
+    overdue = datetime.now() - timedelta(days=1)
+    for i in range(DUE_REMINDERS):
+        preference = notification_service.get_user_preference(f"user{i}", alert_id)
+        preference.last_reminded_at = overdue
+        notification_service._schedule_reminder(preference)
+
+    return notification_service
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{'preferences':>12} | {'due':>5} | {'tick ms':>8}")
+    print("-" * 32)
+    for user_count in USER_COUNTS:
+        notification_service = build_service(user_count)
+        stored = notification_service.get_delivery_stats()["user_preferences"]
+
+        start = time.perf_counter()
+        sent = notification_service.process_reminders()
+        elapsed = time.perf_counter() - start
+
+        print(f"{stored:>12} | {sent:>5} | {elapsed * 1000:>8.2f}")
+
+if __name__ == "__main__":
+    main()
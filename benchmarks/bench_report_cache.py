@@ -0,0 +1,95 @@
+"""
+Benchmark: dashboards polling generate_report with and without the report cache
+
+Each poll used to rebuild every section. With a ReportCache a poll is a
+dictionary lookup until the TTL runs out or an alert event bumps the
+sections' generation, and dashboards polling at the same moment share a
+single recomputation instead of each running their own.
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_service import AlertService
+from services.metrics_aggregator import MetricsAggregator
+from services.notification_service import NotificationService
+from services.report_cache import ReportCache
+from api.analytics_api import AnalyticsAPI
+from models.alert import Severity, VisibilityType
+from models.user import User
+from utils.logger import configure_logging
+
+USERS = 5000
+TEAMS = 50
+POLLS = 200
+DASHBOARDS = 8
+EVENTS_EVERY = [0, 50, 10]  # polls between alert events, 0 for none
+
+def build_services():
+    alert_service = AlertService()
+    notification_service = NotificationService(alert_service)
+    alert_service.add_users_bulk([User(f"user{i}", f"User {i}", f"user{i}@example.com") for i in range(USERS)])
+    alert_service.add_teams_bulk({f"team{t}": {f"user{i}" for i in range(t, USERS, TEAMS)} for t in range(TEAMS)})
+    return alert_service, notification_service, MetricsAggregator(alert_service)
+
+def create_alert(alert_service: AlertService, i: int):
+    alert_service.create_alert(f"Alert {i}", "m", Severity.INFO, "admin1", VisibilityType.TEAM, {f"team{i % TEAMS}"})
+
+def poll(alert_service: AlertService, analytics_api: AnalyticsAPI, events_every: int) -> float:
+    """Milliseconds per generate_report call, alert creation excluded"""
+    elapsed = 0.0
+    for i in range(POLLS):
+        if events_every and i % events_every == 0:
+            create_alert(alert_service, i)
+        start = time.perf_counter()
+        analytics_api.generate_report()
+        elapsed += time.perf_counter() - start
+    return elapsed / POLLS * 1e3
+
+def burst(analytics_api: AnalyticsAPI) -> float:
+    """Wall-clock milliseconds for DASHBOARDS threads polling right after an invalidation"""
+    threads = [threading.Thread(target=analytics_api.generate_report) for _ in range(DASHBOARDS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - start) * 1e3
+
+def main():
+    configure_logging(level="WARNING")
+    alert_service, notification_service, metrics = build_services()
+    uncached = AnalyticsAPI(alert_service, notification_service, metrics, ReportCache(ttl=0))
+    cache = ReportCache(alert_service, ttl=5, stale_while_revalidate=False)
+    cached = AnalyticsAPI(alert_service, notification_service, metrics, cache)
+
+    print(f"{'event every':>11} | {'uncached ms':>11} | {'cached ms':>9} | {'hit rate':>8} | {'recompute p95 ms':>16}")
+    print("-" * 68)
+    for events_every in EVENTS_EVERY:
+        before = cache.get_stats()
+        baseline = poll(alert_service, uncached, events_every)
+        per_poll = poll(alert_service, cached, events_every)
+        stats = cache.get_stats()
+        hits = stats['hits'] - before['hits']
+        lookups = hits + stats['misses'] - before['misses'] + stats['shared_computations'] - before['shared_computations']
+        label = events_every or 'never'
+        print(f"{label:>11} | {baseline:>11.3f} | {per_poll:>9.4f} | {hits / lookups:>8.1%} | "
+              f"{stats['recompute_seconds']['p95'] * 1e3:>16.3f}")
+
+    print()
+    print(f"{'dashboards':>10} | {'uncached ms':>11} | {'single-flight ms':>16} | {'recomputes':>10}")
+    print("-" * 57)
+    before = cache.get_stats()['recomputes']
+    baseline = burst(uncached)
+    cache.invalidate()
+    shared = burst(cached)
+    recomputes = cache.get_stats()['recomputes'] - before
+    print(f"{DASHBOARDS:>10} | {baseline:>11.2f} | {shared:>16.2f} | {recomputes:>10}")
+
+if __name__ == "__main__":
+    main()
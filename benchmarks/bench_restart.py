@@ -0,0 +1,154 @@
+"""
+Benchmark: journal write cost and restart time from snapshot plus journal tail
+
+Builds 1M alerts and 20M preferences behind a JournalStorage, snapshots
+them, then journals a tail of mutations through the services and restarts
+from disk. Restart loads the snapshot (preference columns are read as raw
+arrays) and replays only the tail; it must stay under RESTART_TARGET_S.
+
+Most preferences are read, as in a long-running deployment; reminders are
+only rebuilt for the unread ones. Pass smaller counts to scale down:
+    python benchmarks/bench_restart.py [alerts] [preferences]
+"""
+
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.alert import Severity, VisibilityType
+from models.user import User, UserRole
+from services.alert_service import AlertService
+from services.notification_service import NotificationService
+from services.preference_store import READ, UNREAD
+from storage.journal_storage import JournalStorage
+from utils.logger import configure_logging
+
+ALERTS = 1000000
+PREFERENCES = 20000000
+USERS = 100000
+TEAMS = 1000
+TAIL_MUTATIONS = 50000
+UNREAD_EVERY = 20  # one preference in 20 is still unread
+RESTART_TARGET_S = 60.0
+
+def build(storage: JournalStorage, alerts: int, preferences: int):
+    alert_service = AlertService(storage=storage)
+    notification_service = NotificationService(alert_service)
+    alert_service.add_user(User("admin", "Admin", "admin@example.com", UserRole.ADMIN))
+    for i in range(USERS):
+        alert_service.add_user(User(f"user{i}", f"User {i}", f"user{i}@example.com"))
+    for team in range(TEAMS):
+        alert_service.add_team(f"team{team}", {f"user{i}" for i in range(team, USERS, TEAMS)})
+
+    # The notification service is attached after the bulk load so alerts don't fan out one by one
+    alert_service.remove_observer(notification_service)
+    start = time.perf_counter()
+    for i in range(alerts):
+        alert_service.create_alert(
+            title=f"Alert {i}", message="Disk usage above threshold", severity=Severity.WARNING,
+            created_by="admin", visibility_type=VisibilityType.TEAM, target_ids={f"team{i % TEAMS}"}
+        )
+    storage.journal.flush()
+    journaled = time.perf_counter() - start
+    alert_service.add_observer(notification_service)
+
+    # Synthetic preference columns: each alert reaches preferences // alerts distinct users
+    per_alert = preferences // alerts
+    rows = np.arange(per_alert * alerts)
+    now = time.time()
+    status = np.full(len(rows), READ, np.int8)
+    status[::UNREAD_EVERY] = UNREAD
+    columns = {
+        'user': ((rows // per_alert) * per_alert + rows % per_alert) % USERS,
+        'alert': rows // per_alert,
+        'status': status,
+        'snoozed_until': np.full(len(rows), np.nan),
+        'last_reminded_at': np.full(len(rows), now - 3600),
+        'read_at': np.where(status == READ, now - 1800, np.nan),
+        'created_at': np.full(len(rows), now - 7200),
+    }
+    user_ids = [f"user{i}" for i in range(USERS)]
+    alert_ids = list(alert_service.ids.alerts)
+    notification_service._preferences.load_columns(columns, user_ids, alert_ids)
+    return alert_service, notification_service, journaled
+
+def journal_tail(alert_service, notification_service, count: int) -> float:
+    alerts = alert_service.list_all_alerts()
+    start = time.perf_counter()
+    for i in range(count):
+        alert_index = (i * 7919) % len(alerts)
+        alert = alerts[alert_index]
+        # A member of the alert's team: team k holds users k, k + TEAMS, ...
+        user_id = f"user{alert_index % TEAMS + TEAMS * (i % (USERS // TEAMS))}"
+        if i % 2:
+            notification_service.mark_as_read(user_id, alert.alert_id)
+        else:
+            notification_service.snooze_alert(user_id, alert.alert_id)
+    return time.perf_counter() - start
+
+def fsync_per_record_rate(directory: str, count: int = 500) -> float:
+    storage = JournalStorage(directory, group_commit_records=1)
+    start = time.perf_counter()
+    for i in range(count):
+        storage.journal.wait(storage.journal.append(1, i))
+    elapsed = time.perf_counter() - start
+    storage.close()
+    return count / elapsed
+
+def restart(directory: str):
+    start = time.perf_counter()
+    storage = JournalStorage(directory)
+    alert_service = AlertService(storage=storage)
+    notification_service = NotificationService(alert_service)
+    alert_service.load_from_storage()
+    alerts_loaded = time.perf_counter() - start
+    notification_service.load_from_storage()
+    return storage, alert_service, notification_service, alerts_loaded, time.perf_counter() - start
+
+def main():
+    configure_logging(level="WARNING")
+    alerts = int(sys.argv[1]) if len(sys.argv) > 1 else ALERTS
+    preferences = int(sys.argv[2]) if len(sys.argv) > 2 else PREFERENCES
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"{alerts} alerts, {preferences} preferences, {USERS} users, tail of {TAIL_MUTATIONS} mutations")
+        print(f"fsync per record:          {fsync_per_record_rate(os.path.join(directory, 'fsync')):>10.0f} records/s")
+
+        state_dir = os.path.join(directory, "state")
+        storage = JournalStorage(state_dir)
+        alert_service, notification_service, journaled = build(storage, alerts, preferences)
+        print(f"create_alert, group commit: {alerts / journaled:>9.0f} alerts/s "
+              f"({storage.journal.get_fsync_count()} fsyncs)")
+
+        start = time.perf_counter()
+        storage.snapshot(alert_service, notification_service)
+        snapshot_s = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(state_dir, name)) for name in os.listdir(state_dir))
+        print(f"snapshot:                  {snapshot_s:>10.2f} s, {size / 1e6:.0f} MB on disk")
+
+        tail_s = journal_tail(alert_service, notification_service, TAIL_MUTATIONS)
+        print(f"tail mutations:            {TAIL_MUTATIONS / tail_s:>10.0f} mutations/s")
+        storage.close()
+        del alert_service, notification_service, storage
+        gc.collect()
+
+        storage, alert_service, notification_service, alerts_s, total_s = restart(state_dir)
+        verdict = "within" if total_s <= RESTART_TARGET_S else "OVER"
+        print(f"restart:                   {total_s:>10.2f} s ({alerts_s:.2f} s alerts), "
+              f"{verdict} the {RESTART_TARGET_S:.0f}s target")
+        print(f"restored:                  {len(alert_service.list_all_alerts())} alerts, "
+              f"{notification_service.get_delivery_stats()['user_preferences']} preferences")
+        storage.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: SMS gateway latency and throughput per bulk batch size
+
+A 10k-recipient critical broadcast goes to a local gateway stub that spends
+a fixed time per request, standing in for the network round trip. Larger
+bulk payloads amortise that round trip across more recipients; the last
+rows show the configured per-second cap holding throughput down.
+"""
+
+import os
+import sys
+import time
+
+# Add src and the repo root (for the test stubs) to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.delivery.sms_delivery import SmsDeliveryChannel
+from models.user import User
+from models.alert import Alert, AlertVisibility, Severity, VisibilityType, DeliveryType
+from utils.logger import configure_logging
+from tests.stub_servers import StubSMSGateway
+
+RECIPIENTS = 10000
+GATEWAY_DELAY_SECONDS = 0.01
+POOL_SIZE = 4
+BULK_SIZES = [1, 10, 50, 100, 500]
+RATE_LIMITS = [2000, 5000]
+
+class TimedSmsChannel(SmsDeliveryChannel):
+    """Records how long each gateway request takes"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.request_times = []
+
+    def _send_chunk(self, users, alert, text):
+        start = time.perf_counter()
+        results = super()._send_chunk(users, alert, text)
+        self.request_times.append(time.perf_counter() - start)
+        return results
+
+def run(gateway: StubSMSGateway, users, alert, bulk_size: int, rate_limit: float = 0):
+    channel = TimedSmsChannel(gateway_url=gateway.url, bulk_size=bulk_size,
+                              rate_limit=rate_limit, pool_size=POOL_SIZE)
+    start = time.perf_counter()
+    results = channel.send_batch(users, alert)
+    elapsed = time.perf_counter() - start
+    channel.close()
+
+    assert all(results)
+    times = sorted(channel.request_times)
+    return len(times), times[len(times) // 2], times[int(len(times) * 0.99)], elapsed
+
+def main():
+    configure_logging(level="WARNING")
+    gateway = StubSMSGateway(delay=GATEWAY_DELAY_SECONDS).start()
+    users = [User(f"user{i}", f"User {i}", f"user{i}@example.com", phone=f"+1555{i:07d}")
+             for i in range(RECIPIENTS)]
+    alert = Alert("bench", "Outage", "Service degraded", Severity.CRITICAL, "admin1",
+                  AlertVisibility(VisibilityType.ORGANIZATION, set()), DeliveryType.SMS)
+
+    print(f"{RECIPIENTS} recipients, {POOL_SIZE} connections, "
+          f"gateway delay {GATEWAY_DELAY_SECONDS * 1000:.0f}ms/request")
+    print(f"{'bulk size':>9} | {'rate cap':>8} | {'requests':>8} | {'p50 ms':>7} | "
+          f"{'p99 ms':>7} | {'total s':>7} | {'msgs/s':>8}")
+    print("-" * 73)
+    cases = [(bulk_size, 0) for bulk_size in BULK_SIZES] + [(100, rate) for rate in RATE_LIMITS]
+    for bulk_size, rate_limit in cases:
+        requests, p50, p99, elapsed = run(gateway, users, alert, bulk_size, rate_limit)
+        cap = f"{rate_limit:.0f}/s" if rate_limit else "none"
+        print(f"{bulk_size:>9} | {cap:>8} | {requests:>8} | {p50 * 1000:>7.1f} | "
+              f"{p99 * 1000:>7.1f} | {elapsed:>7.2f} | {RECIPIENTS / elapsed:>8.0f}")
+
+    gateway.stop()
+
+if __name__ == "__main__":
+    main()
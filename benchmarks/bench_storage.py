@@ -0,0 +1,114 @@
+"""
+Benchmark: writes and reads per second, MemoryStorage versus SQLiteStorage
+
+Writes go through the bulk methods in batches, so SQLite pays for one
+transaction per batch; a batch size of 1 shows the per-transaction cost.
+Reads are the hot indexed queries: alerts by visibility target,
+preferences by (user, status) and deliveries in a time window.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.alert import Alert, AlertVisibility, Severity, VisibilityType
+from storage.base_storage import PreferenceRecord, DeliveryRecord
+from storage.memory_storage import MemoryStorage
+from storage.sqlite_storage import SQLiteStorage
+from utils.logger import configure_logging
+
+USERS = 10000
+TEAMS = 100
+ALERTS = 2000
+PREFERENCES = 200000
+DELIVERIES = 200000
+READS = 5000
+STATUSES = ("unread", "read", "snoozed")
+
+def make_alerts():
+    alerts = []
+    for i in range(ALERTS):
+        visibility = AlertVisibility(VisibilityType.TEAM, {f"team{i % TEAMS}"})
+        alerts.append(Alert(f"alert{i}", "Title", "Message", Severity.INFO, "admin", visibility))
+    return alerts
+
+def timed(operation, count):
+    start = time.perf_counter()
+    operation()
+    return count / (time.perf_counter() - start)
+
+def in_batches(write, records, batch_size):
+    def run():
+        for i in range(0, len(records), batch_size):
+            write(records[i:i + batch_size])
+    return run
+
+def bench(storage, batch_size):
+    alerts = make_alerts()
+    now = time.time()
+    preferences = [
+        PreferenceRecord(f"user{i % USERS}", f"alert{i // USERS}", STATUSES[i % 3], None, None, None, now)
+        for i in range(PREFERENCES)
+    ]
+    deliveries = [
+        DeliveryRecord(f"user{i % USERS}", f"alert{i % ALERTS}", "in_app", "sent", now + i * 0.01)
+        for i in range(DELIVERIES)
+    ]
+
+    if batch_size == 1:
+        # One transaction per row is far slower, so time a slice
+        preferences, deliveries = preferences[:PREFERENCES // 20], deliveries[:DELIVERIES // 20]
+    writes = {
+        "alerts": timed(in_batches(storage.save_alerts, alerts, batch_size), len(alerts)),
+        "preferences": timed(in_batches(storage.save_preferences, preferences, batch_size), len(preferences)),
+        "deliveries": timed(in_batches(storage.append_deliveries, deliveries, batch_size), len(deliveries)),
+    }
+    if batch_size == 1:
+        return writes, {}
+
+    reads = {
+        "alerts by team": timed(lambda: [storage.get_alert_ids_for_target(VisibilityType.TEAM, f"team{i % TEAMS}")
+                                         for i in range(READS)], READS),
+        "prefs by user+status": timed(lambda: [storage.get_preferences_for_user(f"user{i % USERS}", "unread")
+                                               for i in range(READS)], READS),
+        "deliveries by time": timed(lambda: [storage.get_deliveries_between(
+            *_window(now, i)) for i in range(READS)], READS),
+    }
+    return writes, reads
+
+def _window(now, i):
+    start = now + (i % 1000) * 1.0
+    return datetime.fromtimestamp(start), datetime.fromtimestamp(start + 1.0)
+
+def main():
+    configure_logging(level="WARNING")
+    directory = tempfile.mkdtemp()
+    print(f"{ALERTS} alerts, {PREFERENCES} preferences, {DELIVERIES} deliveries; {READS} reads per query")
+    print(f"{'backend':>22} | {'batch':>5} | {'operation':>20} | {'ops/s':>10}")
+    print("-" * 68)
+    try:
+        backends = [
+            ("MemoryStorage", lambda path: MemoryStorage()),
+            ("SQLiteStorage (WAL)", SQLiteStorage),
+        ]
+        for name, factory in backends:
+            for batch_size in (1000, 1):
+                path = os.path.join(directory, f"bench-{batch_size}.db")
+                storage = factory(path)
+                writes, reads = bench(storage, batch_size)
+                for operation, rate in writes.items():
+                    print(f"{name:>22} | {batch_size:>5} | {'write ' + operation:>20} | {rate:>10.0f}")
+                for operation, rate in reads.items():
+                    print(f"{name:>22} | {'':>5} | {operation:>20} | {rate:>10.0f}")
+                storage.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
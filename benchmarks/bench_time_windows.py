@@ -0,0 +1,70 @@
+"""
+Benchmark: today / 7-day / 30-day alert counts with severity breakdowns
+
+The analytics used to filter every alert by created_at.date() for each
+window and then count severities over the filtered lists. They now count
+on AlertService's created_at index, two bisects per count.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, time as day_start, timedelta
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_service import AlertService
+from models.alert import Severity, VisibilityType
+from utils.logger import configure_logging
+
+ROUNDS = 20
+ALERT_COUNTS = [10000, 50000, 200000]
+SEVERITIES = [Severity.INFO, Severity.WARNING, Severity.CRITICAL]
+
+def build_service(count: int) -> AlertService:
+    alert_service = AlertService()
+    alert_service.create_alerts_bulk([
+        dict(title=f"Alert {i}", message="m", severity=SEVERITIES[i % 3], created_by="admin1",
+             visibility_type=VisibilityType.ORGANIZATION, target_ids=set())
+        for i in range(count)
+    ])
+    return alert_service
+
+def scan_windows(alert_service: AlertService):
+    all_alerts = alert_service.list_all_alerts()
+    today = datetime.now().date()
+    windows = [
+        [a for a in all_alerts if a.created_at.date() == today],
+        [a for a in all_alerts if a.created_at.date() >= today - timedelta(days=7)],
+        [a for a in all_alerts if a.created_at.date() >= today - timedelta(days=30)],
+    ]
+    return [(len(w), {s: len([a for a in w if a.severity == s]) for s in SEVERITIES}) for w in windows]
+
+def indexed_windows(alert_service: AlertService):
+    today = datetime.combine(datetime.now().date(), day_start.min)
+    windows = [(today, today + timedelta(days=1)), (today - timedelta(days=7), None),
+               (today - timedelta(days=30), None)]
+    return [(alert_service.count_alerts_between(start, end),
+             {s: alert_service.count_alerts_between(start, end, severity=s) for s in SEVERITIES})
+            for start, end in windows]
+
+def timed(run):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = run()
+    return (time.perf_counter() - start) / ROUNDS * 1e3, result
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{'alerts':>8} | {'scan ms':>9} | {'index ms':>9}")
+    print("-" * 32)
+    for count in ALERT_COUNTS:
+        alert_service = build_service(count)
+        scan, expected = timed(lambda: scan_windows(alert_service))
+        indexed, result = timed(lambda: indexed_windows(alert_service))
+        assert result == expected
+        print(f"{count:>8} | {scan:>9.2f} | {indexed:>9.3f}")
+
+if __name__ == "__main__":
+    main()
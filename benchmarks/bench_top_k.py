@@ -0,0 +1,59 @@
+"""
+Benchmark: top-5 creators from a full count-and-sort vs a Space-Saving counter
+
+The old _get_top_creators counted every alert into a dict and sorted it on
+each call. SpaceSaving keeps 100 counters however many distinct creators
+appear, costs amortised O(log K) per alert and answers top-N in O(K).
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.space_saving import SpaceSaving
+from utils.logger import configure_logging
+
+ALERT_COUNTS = [100000, 1000000]
+DISTINCT = [1000, 100000]
+QUERIES = 20
+
+def count_and_sort(creators):
+    counts = {}
+    for creator in creators:
+        counts[creator] = counts.get(creator, 0) + 1
+    return sorted(counts.items(), key=lambda x: x[1], reverse=True)[:5]
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{'alerts':>8} | {'creators':>8} | {'update us':>9} | {'scan ms':>8} | {'top-5 us':>8} | {'same top 5':>10}")
+    print("-" * 68)
+    for count in ALERT_COUNTS:
+        for distinct in DISTINCT:
+            rng = np.random.default_rng(count + distinct)
+            creators = [f"user{value % distinct}" for value in rng.zipf(1.3, count)]
+
+            counter = SpaceSaving(100)
+            start = time.perf_counter()
+            for creator in creators:
+                counter.add(creator)
+            update = (time.perf_counter() - start) / count * 1e6
+
+            start = time.perf_counter()
+            exact = count_and_sort(creators)
+            scan = (time.perf_counter() - start) * 1e3
+
+            start = time.perf_counter()
+            for _ in range(QUERIES):
+                top = counter.top(5)
+            query = (time.perf_counter() - start) / QUERIES * 1e6
+
+            same = [item for item, _, _ in top] == [item for item, _ in exact]
+            print(f"{count:>8} | {distinct:>8} | {update:>9.2f} | {scan:>8.1f} | {query:>8.1f} | {str(same):>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: AlertService.get_alerts_for_user against a growing alert history
+
+The user below only sees a fixed handful of alerts. Everything else is aimed
+at other teams and users, so lookup time should stay flat as it grows.
+
+The second table checks a single alert's visibility, as UserAPI does on
+every read/unread/snooze, for a user whose own inbox grows: the old list
+membership test over get_alerts_for_user versus can_user_see.
+"""
+
+import os
+import sys
+import time
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_service import AlertService
+from models.user import User
+from models.alert import Severity, VisibilityType
+from utils.logger import configure_logging
+
+LOOKUPS = 1000
+UNRELATED_COUNTS = [0, 1000, 10000, 50000]
+INBOX_SIZES = [10, 1000, 10000]
+
+def build_service(unrelated_alerts: int) -> AlertService:
+    alert_service = AlertService()
+    alert_service.add_user(User("reader", "Reader", "reader@example.com"))
+    alert_service.add_team("reader-team", {"reader"})
+    alert_service.add_team("other-team", set())
+
+    # Alerts the reader can see
+    alert_service.create_alert("Org", "m", Severity.INFO, "admin1",
+                               VisibilityType.ORGANIZATION, set())
+    alert_service.create_alert("Team", "m", Severity.INFO, "admin1",
+                               VisibilityType.TEAM, {"reader-team"})
+    alert_service.create_alert("Direct", "m", Severity.INFO, "admin1",
+                               VisibilityType.USER, {"reader"})
+
+    # Alerts aimed at everybody else
+    for i in range(unrelated_alerts):
+        if i % 2:
+            alert_service.create_alert(f"Other {i}", "m", Severity.INFO, "admin1",
+                                       VisibilityType.TEAM, {"other-team"})
+        else:
+            alert_service.create_alert(f"Other {i}", "m", Severity.INFO, "admin1",
+                                       VisibilityType.USER, {f"user{i}"})
+    return alert_service
+
+def build_inbox(size: int) -> AlertService:
+    alert_service = AlertService()
+    alert_service.add_user(User("reader", "Reader", "reader@example.com"))
+    alert_service.add_team("reader-team", {"reader"})
+    for i in range(size):
+        alert_service.create_alert(f"Team {i}", "m", Severity.INFO, "admin1",
+                                   VisibilityType.TEAM, {"reader-team"})
+    return alert_service
+
+def time_checks(check, alert_ids) -> float:
+    start = time.perf_counter()
+    for i in range(LOOKUPS):
+        check("reader", alert_ids[i % len(alert_ids)])
+    return (time.perf_counter() - start) / LOOKUPS * 1e6
+
+def main():
+    configure_logging(level="WARNING")
+    print(f"{'unrelated alerts':>18} | {'visible':>7} | {'us/lookup':>10}")
+    print("-" * 42)
+    for unrelated in UNRELATED_COUNTS:
+        alert_service = build_service(unrelated)
+
+        start = time.perf_counter()
+        for _ in range(LOOKUPS):
+            visible = alert_service.get_alerts_for_user("reader")
+        elapsed = time.perf_counter() - start
+
+        print(f"{unrelated:>18} | {len(visible):>7} | {elapsed / LOOKUPS * 1e6:>10.2f}")
+
+    print()
+    print(f"{'inbox size':>10} | {'list scan us':>12} | {'can_user_see us':>15}")
+    print("-" * 43)
+    for size in INBOX_SIZES:
+        alert_service = build_inbox(size)
+        alert_ids = [alert.alert_id for alert in alert_service.list_all_alerts()]
+
+        def list_scan(user_id, alert_id):
+            return alert_id in [alert.alert_id for alert in alert_service.get_alerts_for_user(user_id)]
+
+        scan_us = time_checks(list_scan, alert_ids)
+        direct_us = time_checks(alert_service.can_user_see, alert_ids)
+        print(f"{size:>10} | {scan_us:>12.2f} | {direct_us:>15.2f}")
+
+if __name__ == "__main__":
+    main()
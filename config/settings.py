@@ -24,6 +24,11 @@ class Settings:
         self.MAX_RETRY_ATTEMPTS = 3
         self.RETRY_DELAY_SECONDS = 30
         self.BATCH_PROCESSING_SIZE = 100
+        self.DELIVERY_WORKERS = 4
+        self.DELIVERY_CONCURRENCY_PER_CHANNEL = 8
+        self.DELIVERY_LOG_CAPACITY = 1000000      # records kept in memory
+        self.DELIVERY_LOG_SEGMENT_SIZE = 65536    # records moved to disk at a time
+        self.DELIVERY_LOG_SPILL_PATH = None       # None spills to a temporary file
         
         # User settings
         self.MAX_ALERTS_PER_USER = 1000
@@ -32,20 +37,43 @@ class Settings:
         
         # System settings
         self.LOG_LEVEL = "INFO"
+        self.LOG_ASYNC = True  # write log records from a background thread
         self.ENABLE_ANALYTICS = True
         self.DATA_RETENTION_DAYS = 365
+        self.REPORT_CACHE_TTL_SECONDS = 5                # analytics sections reused for this long, 0 to disable
+        self.REPORT_CACHE_STALE_WHILE_REVALIDATE = False  # serve the old section while it is recomputed
         
         # Delivery settings
-        self.ENABLED_DELIVERY_CHANNELS = ["in_app"]
+        self.ENABLED_DELIVERY_CHANNELS = ["in_app", "email", "sms"]
         self.DEFAULT_DELIVERY_CHANNEL = "in_app"
         
+        # Email settings
+        self.SMTP_HOST = "localhost"
+        self.SMTP_PORT = 25
+        self.SMTP_USE_TLS = False
+        self.SMTP_USERNAME = None
+        self.SMTP_PASSWORD = None
+        self.SMTP_POOL_SIZE = 4  # persistent connections per email channel
+        self.EMAIL_SENDER = "alerts@localhost"
+        
+        # SMS settings
+        self.SMS_GATEWAY_URL = "http://localhost:8080/messages"
+        self.SMS_GATEWAY_TOKEN = None
+        self.SMS_SENDER_ID = "ALERTS"
+        self.SMS_BULK_SIZE = 100   # recipients per gateway request
+        self.SMS_RATE_LIMIT = 50   # messages per second, 0 to disable
+        self.SMS_POOL_SIZE = 4     # keep-alive connections per SMS channel
+        
         # Security settings
         self.ENABLE_AUTHENTICATION = False  # For MVP
         self.API_RATE_LIMIT = 1000  # requests per hour
         
-        # Database settings (for future use)
+        # Database settings
         self.DATABASE_URL = "sqlite:///alerts.db"
-        self.ENABLE_PERSISTENCE = False  # For MVP using in-memory storage
+        self.ENABLE_PERSISTENCE = False  # in-memory only unless enabled
+        self.JOURNAL_GROUP_COMMIT_MS = 5          # max wait before a journal group is fsynced
+        self.JOURNAL_GROUP_COMMIT_RECORDS = 1000  # records that force an early group commit
+        self.SNAPSHOT_INTERVAL = 300              # seconds between journal snapshots
         
         # Load environment variables
         self._load_environment_variables()
@@ -64,6 +92,53 @@ class Settings:
         log_level = os.getenv('LOG_LEVEL')
         if log_level:
             self.LOG_LEVEL = log_level.upper()
+        
+        log_async = os.getenv('LOG_ASYNC')
+        if log_async:
+            self.LOG_ASYNC = log_async.lower() == 'true'
+        
+        report_cache_ttl = os.getenv('REPORT_CACHE_TTL_SECONDS')
+        if report_cache_ttl:
+            self.REPORT_CACHE_TTL_SECONDS = float(report_cache_ttl)
+        
+        stale_while_revalidate = os.getenv('REPORT_CACHE_STALE_WHILE_REVALIDATE')
+        if stale_while_revalidate:
+            self.REPORT_CACHE_STALE_WHILE_REVALIDATE = stale_while_revalidate.lower() == 'true'
+        
+        # Email settings
+        smtp_host = os.getenv('SMTP_HOST')
+        if smtp_host:
+            self.SMTP_HOST = smtp_host
+        
+        smtp_port = os.getenv('SMTP_PORT')
+        if smtp_port:
+            self.SMTP_PORT = int(smtp_port)
+        
+        self.SMTP_USERNAME = os.getenv('SMTP_USERNAME', self.SMTP_USERNAME)
+        self.SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', self.SMTP_PASSWORD)
+        
+        # SMS settings
+        self.SMS_GATEWAY_URL = os.getenv('SMS_GATEWAY_URL', self.SMS_GATEWAY_URL)
+        self.SMS_GATEWAY_TOKEN = os.getenv('SMS_GATEWAY_TOKEN', self.SMS_GATEWAY_TOKEN)
+        
+        sms_rate_limit = os.getenv('SMS_RATE_LIMIT')
+        if sms_rate_limit:
+            self.SMS_RATE_LIMIT = float(sms_rate_limit)
+        
+        # Database settings
+        self.DATABASE_URL = os.getenv('DATABASE_URL', self.DATABASE_URL)
+        
+        enable_persistence = os.getenv('ENABLE_PERSISTENCE')
+        if enable_persistence:
+            self.ENABLE_PERSISTENCE = enable_persistence.lower() == 'true'
+        
+        group_commit_ms = os.getenv('JOURNAL_GROUP_COMMIT_MS')
+        if group_commit_ms:
+            self.JOURNAL_GROUP_COMMIT_MS = float(group_commit_ms)
+        
+        snapshot_interval = os.getenv('SNAPSHOT_INTERVAL')
+        if snapshot_interval:
+            self.SNAPSHOT_INTERVAL = int(snapshot_interval)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert settings to dictionary"""
@@ -92,7 +167,7 @@ class Settings:
             
             assert self.MAX_ALERTS_PER_USER > 0, "Max alerts per user must be positive"
             
-            assert self.LOG_LEVEL in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'], \
+            assert self.LOG_LEVEL in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL', 'OFF'], \
                 "Invalid log level"
             
             return True
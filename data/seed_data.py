@@ -28,8 +28,7 @@ def seed_sample_data(alert_service, notification_service):
         User("user5", "Frank Manager", "frank.manager@company.com")
     ]
     
-    for user in users:
-        alert_service.add_user(user)
+    alert_service.add_users_bulk(users)
     
     print(f"✅ Created {len(users)} users")
     
@@ -43,8 +42,7 @@ def seed_sample_data(alert_service, notification_service):
         "product": {"user2", "user5"}       # Charlie (Designer), Frank (Manager)
     }
     
-    for team_id, user_ids in teams.items():
-        alert_service.add_team(team_id, user_ids)
+    alert_service.add_teams_bulk(teams)
     
     print(f"✅ Created {len(teams)} teams")
     
@@ -110,23 +108,20 @@ def seed_sample_data(alert_service, notification_service):
     
     # Create alerts with different creation times to simulate real usage
     base_time = datetime.now()
-    created_alerts = []
-    
-    for i, alert_data in enumerate(sample_alerts):
-        # Stagger creation times
-        created_time = base_time - timedelta(hours=i*3)
-        
-        alert = alert_service.create_alert(
-            title=alert_data["title"],
-            message=alert_data["message"],
-            severity=alert_data["severity"],
-            created_by="admin1",
-            visibility_type=alert_data["visibility"],
-            target_ids=alert_data["targets"],
-            delivery_type=DeliveryType.IN_APP,
-            start_time=created_time
-        )
-        created_alerts.append(alert)
+    created_alerts = alert_service.create_alerts_bulk([
+        {
+            "title": alert_data["title"],
+            "message": alert_data["message"],
+            "severity": alert_data["severity"],
+            "created_by": "admin1",
+            "visibility_type": alert_data["visibility"],
+            "target_ids": alert_data["targets"],
+            "delivery_type": DeliveryType.IN_APP,
+            # Stagger creation times
+            "start_time": base_time - timedelta(hours=i*3)
+        }
+        for i, alert_data in enumerate(sample_alerts)
+    ])
     
     print(f"✅ Created {len(created_alerts)} sample alerts")
     
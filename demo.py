@@ -10,6 +10,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from services.alert_service import AlertService
 from services.notification_service import NotificationService
+from services.metrics_aggregator import MetricsAggregator
+from services.report_cache import ReportCache
 from api.admin_api import AdminAPI
 from api.user_api import UserAPI
 from api.analytics_api import AnalyticsAPI
@@ -26,10 +28,13 @@ def run_demo():
     alert_service = AlertService()
     notification_service = NotificationService(alert_service)
     
+    metrics = MetricsAggregator(alert_service)
+    report_cache = ReportCache(alert_service)
+    
     # Create APIs
-    admin_api = AdminAPI(alert_service)
+    admin_api = AdminAPI(alert_service, metrics)
     user_api = UserAPI(alert_service, notification_service)
-    analytics_api = AnalyticsAPI(alert_service, notification_service)
+    analytics_api = AnalyticsAPI(alert_service, notification_service, metrics, report_cache)
     
     print("✅ Services initialized")
     
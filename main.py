@@ -10,6 +10,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from services.alert_service import AlertService
 from services.notification_service import NotificationService
+from services.metrics_aggregator import MetricsAggregator
+from services.expirer import AlertExpirer
+from services.snapshotter import Snapshotter
+from storage.journal_storage import JournalStorage
+from storage.storage_factory import StorageFactory
 from api.admin_api import AdminAPI
 from api.user_api import UserAPI
 from models.user import User, UserRole
@@ -22,21 +27,49 @@ def main():
     print("=" * 50)
     
     # Initialize services
-    alert_service = AlertService()
+    # Persistent storage is used only when ENABLE_PERSISTENCE is set
+    storage = StorageFactory.from_settings()
+    alert_service = AlertService(storage=storage)
     notification_service = NotificationService(alert_service)
+    loaded = 0
+    if storage:
+        loaded = alert_service.load_from_storage()
+        notification_service.load_from_storage()
+    
+    # Expired events fire as alerts expire, not only when a read path checks
+    expirer = AlertExpirer(alert_service)
+    expirer.start()
+    
+    # Snapshots let the journal be trimmed, so a restart only replays what came after
+    snapshotter = None
+    if isinstance(storage, JournalStorage):
+        snapshotter = Snapshotter(storage, alert_service, notification_service)
+        snapshotter.start()
+    
+    # One aggregator per AlertService, shared by the APIs that read it
+    metrics = MetricsAggregator(alert_service)
     
     # Create APIs
-    admin_api = AdminAPI(alert_service)
+    admin_api = AdminAPI(alert_service, metrics)
     user_api = UserAPI(alert_service, notification_service)
     
-    # Seed sample data
-    seed_sample_data(alert_service, notification_service)
+    # Seed sample data, unless the alerts were restored from storage
+    if not loaded:
+        seed_sample_data(alert_service, notification_service)
     
     print("\n✅ System initialized successfully!")
     print("\nAvailable Commands:")
     print("1. Run 'python demo.py' for a full demo")
     print("2. Run tests with 'python -m unittest discover tests'")
     print("3. Check individual modules in src/ directory")
+    
+    # Shut down: take a last snapshot and commit what is still pending
+    expirer.stop()
+    if snapshotter:
+        snapshotter.stop()
+        snapshotter.run_once()
+    if storage:
+        storage.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
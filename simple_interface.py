@@ -12,6 +12,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from services.alert_service import AlertService
 from services.notification_service import NotificationService
+from services.metrics_aggregator import MetricsAggregator
+from services.report_cache import ReportCache
 from api.admin_api import AdminAPI
 from api.user_api import UserAPI
 from api.analytics_api import AnalyticsAPI
@@ -22,9 +24,12 @@ class AlertingPlatformCLI:
     def __init__(self):
         self.alert_service = AlertService()
         self.notification_service = NotificationService(self.alert_service)
-        self.admin_api = AdminAPI(self.alert_service)
+        self.metrics = MetricsAggregator(self.alert_service)
+        self.report_cache = ReportCache(self.alert_service)
+        self.admin_api = AdminAPI(self.alert_service, self.metrics)
         self.user_api = UserAPI(self.alert_service, self.notification_service)
-        self.analytics_api = AnalyticsAPI(self.alert_service, self.notification_service)
+        self.analytics_api = AnalyticsAPI(self.alert_service, self.notification_service, self.metrics,
+                                          self.report_cache)
         
         # Current logged in user
         self.current_user = None
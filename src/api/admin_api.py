@@ -1,14 +1,23 @@
-from typing import List, Optional, Set
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+from datetime import datetime, time, timedelta
 
 from models.alert import Alert, Severity, VisibilityType, DeliveryType
 from services.alert_service import AlertService
+from services.metrics_aggregator import MetricsAggregator
+from utils.keyset import alert_key, clamp_page_size, decode_cursor, encode_cursor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class AdminAPI:
     """API for admin operations"""
     
-    def __init__(self, alert_service: AlertService):
+    def __init__(self, alert_service: AlertService, metrics: Optional[MetricsAggregator] = None):
         self.alert_service = alert_service
+        # Without one passed in, share the aggregator already observing the service, if any
+        if metrics is None:
+            metrics = alert_service.find_observer(MetricsAggregator) or MetricsAggregator(alert_service)
+        self.metrics = metrics
     
     def create_alert(
         self,
@@ -25,10 +34,10 @@ class AdminAPI:
     ) -> Alert:
         """Create a new alert"""
         
-        print(f"🛠️  Admin creating alert: {title}")
-        print(f"   Severity: {severity.value}")
-        print(f"   Visibility: {visibility_type.value}")
-        print(f"   Targets: {target_ids or 'All users'}")
+        logger.info("🛠️  Admin creating alert: %s", title)
+        logger.debug("   Severity: %s", severity.value)
+        logger.debug("   Visibility: %s", visibility_type.value)
+        logger.debug("   Targets: %s", target_ids or 'All users')
         
         alert = self.alert_service.create_alert(
             title=title,
@@ -43,40 +52,49 @@ class AdminAPI:
             expiry_time=expiry_time
         )
         
-        print(f"✅ Alert created successfully: {alert.alert_id}")
+        logger.info("✅ Alert created successfully: %s", alert.alert_id)
         return alert
     
+    def create_alerts_bulk(self, alerts: List[dict]) -> List[Alert]:
+        """Create many alerts, each given as create_alert keyword arguments, in one batch"""
+        logger.info("🛠️  Admin creating %d alerts", len(alerts))
+        
+        created = self.alert_service.create_alerts_bulk(alerts)
+        
+        logger.info("✅ %d alerts created successfully", len(created))
+        return created
+    
     def get_alert(self, alert_id: str) -> Optional[Alert]:
         """Get a specific alert by ID"""
         alert = self.alert_service.get_alert(alert_id)
         if alert:
-            print(f"📋 Retrieved alert: {alert.title}")
+            logger.debug("📋 Retrieved alert: %s", alert.title)
         else:
-            print(f"❌ Alert not found: {alert_id}")
+            logger.warning("❌ Alert not found: %s", alert_id)
         return alert
     
     def update_alert(self, alert_id: str, **kwargs) -> Optional[Alert]:
         """Update an existing alert"""
-        print(f"🛠️  Updating alert: {alert_id}")
-        print(f"   Changes: {kwargs}")
+        logger.info("🛠️  Updating alert: %s", alert_id)
+        logger.debug("   Changes: %s", kwargs)
         
         alert = self.alert_service.update_alert(alert_id, **kwargs)
         if alert:
-            print(f"✅ Alert updated successfully: {alert.title}")
+            logger.info("✅ Alert updated successfully: %s", alert.title)
         else:
-            print(f"❌ Failed to update alert: {alert_id}")
+            logger.warning("❌ Failed to update alert: %s", alert_id)
         
         return alert
     
     def archive_alert(self, alert_id: str) -> bool:
         """Archive an alert"""
-        print(f"🗃️  Archiving alert: {alert_id}")
+        logger.info("🗃️  Archiving alert: %s", alert_id)
         
         success = self.alert_service.archive_alert(alert_id)
         if success:
-            print(f"✅ Alert archived successfully")
+            logger.info("✅ Alert archived successfully")
         else:
-            print(f"❌ Failed to archive alert: {alert_id}")
+            logger.warning("❌ Failed to archive alert: %s", alert_id)
         
         return success
     
@@ -94,59 +112,59 @@ class AdminAPI:
             filters.append(f"status={status}")
         
         filter_str = " with filters: " + ", ".join(filters) if filters else ""
-        print(f"📋 Listing alerts{filter_str}")
+        logger.debug("📋 Listing alerts%s", filter_str)
         
         alerts = self.alert_service.list_all_alerts(severity=severity, status=status)
-        print(f"✅ Found {len(alerts)} alerts")
+        logger.debug("✅ Found %s alerts", len(alerts))
         
         return alerts
     
+    def list_alerts_page(
+        self,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+        severity: Optional[Severity] = None,
+        status: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """List one page of alerts, newest first, with optional filtering
+
+        Returns 'alerts' and a 'next_cursor' to pass back for the following
+        page (None on the last one). page_size defaults to DEFAULT_PAGE_SIZE
+        and is capped at MAX_PAGE_SIZE. Raises ValueError for a malformed cursor.
+        """
+        page_size = clamp_page_size(page_size)
+        before = decode_cursor(cursor) if cursor else None
+        logger.debug("📋 Listing a page of %s alerts", page_size)
+        
+        # One extra alert tells whether another page follows
+        alerts = self.alert_service.list_alerts_page(before, page_size + 1, severity=severity, status=status)
+        page = alerts[:page_size]
+        next_cursor = encode_cursor(alert_key(page[-1])) if len(alerts) > page_size else None
+        
+        logger.debug("✅ Page has %s alerts", len(page))
+        return {'alerts': page, 'next_cursor': next_cursor}
+    
     def get_alert_metrics(self) -> dict:
         """Get system-wide alert metrics"""
-        print("📊 Generating alert metrics...")
+        logger.debug("📊 Generating alert metrics...")
         
-        alerts = self.alert_service.list_all_alerts()
-        
-        active_alerts = [a for a in alerts if a.is_active and not a.is_expired()]
-        expired_alerts = [a for a in alerts if a.is_expired()]
-        archived_alerts = [a for a in alerts if not a.is_active]
-        
-        severity_breakdown = {
-            'info': len([a for a in alerts if a.severity == Severity.INFO]),
-            'warning': len([a for a in alerts if a.severity == Severity.WARNING]),
-            'critical': len([a for a in alerts if a.severity == Severity.CRITICAL]),
-        }
+        status_counts = self.metrics.get_status_counts()
         
         metrics = {
-            'total_alerts': len(alerts),
-            'active_alerts': len(active_alerts),
-            'expired_alerts': len(expired_alerts),
-            'archived_alerts': len(archived_alerts),
-            'severity_breakdown': severity_breakdown,
-            'visibility_breakdown': self._get_visibility_breakdown(alerts)
+            'total_alerts': self.metrics.total_alerts(),
+            'active_alerts': status_counts['active'],
+            'expired_alerts': status_counts['expired'],
+            'archived_alerts': status_counts['archived'],
+            'severity_breakdown': self.metrics.get_severity_counts(),
+            'visibility_breakdown': self.metrics.get_visibility_counts()
         }
         
-        print("✅ Metrics generated successfully")
+        logger.debug("✅ Metrics generated successfully")
         return metrics
     
-    def _get_visibility_breakdown(self, alerts: List[Alert]) -> dict:
-        """Get breakdown of alerts by visibility type"""
-        breakdown = {
-            'organization': 0,
-            'team': 0,
-            'user': 0
-        }
-        
-        for alert in alerts:
-            visibility_type = alert.visibility.type.value
-            if visibility_type in breakdown:
-                breakdown[visibility_type] += 1
-        
-        return breakdown
-    
     def get_system_stats(self) -> dict:
         """Get comprehensive system statistics"""
-        print("📈 Generating system statistics...")
+        logger.debug("📈 Generating system statistics...")
         
         alert_metrics = self.get_alert_metrics()
         service_stats = self.alert_service.get_stats()
@@ -161,17 +179,10 @@ class AdminAPI:
             }
         }
         
-        print("✅ System statistics generated")
+        logger.debug("✅ System statistics generated")
         return stats
     
     def _get_today_alerts_count(self) -> int:
         """Get count of alerts created today"""
-        alerts = self.alert_service.list_all_alerts()
-        today = datetime.now().date()
-        
-        today_alerts = [
-            alert for alert in alerts 
-            if alert.created_at.date() == today
-        ]
-        
-        return len(today_alerts)
\ No newline at end of file
+        today = datetime.combine(datetime.now().date(), time.min)
+        return self.alert_service.count_alerts_between(today, today + timedelta(days=1))
\ No newline at end of file
@@ -1,30 +1,48 @@
-from typing import Dict, List, Any
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+from datetime import datetime, time, timedelta
 from services.alert_service import AlertService
+from services.activity_series import CREATED, DELIVERED, READ, SNOOZED, DAY
+from services.metrics_aggregator import MetricsAggregator
 from services.notification_service import NotificationService
+from services.report_cache import ReportCache, ALERTS, MEMBERSHIP
+from utils.constants import DATE_FORMAT
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class AnalyticsAPI:
     """API for analytics and reporting"""
     
-    def __init__(self, alert_service: AlertService, notification_service: NotificationService):
+    def __init__(self, alert_service: AlertService, notification_service: NotificationService,
+                 metrics: Optional[MetricsAggregator] = None, cache: Optional[ReportCache] = None):
         self.alert_service = alert_service
         self.notification_service = notification_service
+        # Both observe the AlertService; ones not passed in are shared with earlier APIs on it
+        if metrics is None:
+            metrics = alert_service.find_observer(MetricsAggregator) or MetricsAggregator(alert_service)
+        if cache is None:
+            cache = alert_service.find_observer(ReportCache) or ReportCache(alert_service)
+        # Alert counts are read from the aggregator rather than recounted per call
+        self.metrics = metrics
+        # Sections are reused until their TTL runs out or an alert or membership event invalidates them
+        self.cache = cache
     
     def get_system_metrics(self) -> Dict[str, Any]:
         """Get comprehensive system metrics"""
-        print("📈 Generating comprehensive system metrics...")
+        return self.cache.get('system_metrics', self._build_system_metrics, (ALERTS, MEMBERSHIP))
+    
+    def _build_system_metrics(self) -> Dict[str, Any]:
+        logger.debug("📈 Generating comprehensive system metrics...")
         
         # Get basic metrics from services
         alert_stats = self.alert_service.get_stats()
         delivery_stats = self.notification_service.get_delivery_stats()
         
         # Calculate additional metrics
-        all_alerts = self.alert_service.list_all_alerts()
         all_users = self.alert_service.get_all_users()
         
         # Alert metrics
-        active_alerts = [a for a in all_alerts if a.is_active and not a.is_expired()]
-        expired_alerts = [a for a in all_alerts if a.is_expired()]
+        status_counts = self.metrics.get_status_counts()
         
         # User engagement metrics (simulated)
         user_engagement = self._calculate_user_engagement()
@@ -39,13 +57,13 @@ class AnalyticsAPI:
         
         metrics = {
             'alerts': {
-                'total': len(all_alerts),
-                'active': len(active_alerts),
-                'expired': len(expired_alerts),
-                'archived': len([a for a in all_alerts if not a.is_active]),
-                'by_severity': self._get_severity_breakdown(all_alerts),
-                'by_visibility': self._get_visibility_breakdown(all_alerts),
-                'creation_trend': self._get_creation_trend(all_alerts)
+                'total': self.metrics.total_alerts(),
+                'active': status_counts['active'],
+                'expired': status_counts['expired'],
+                'archived': status_counts['archived'],
+                'by_severity': self.metrics.get_severity_counts(),
+                'by_visibility': self.metrics.get_visibility_counts(),
+                'creation_trend': self._get_creation_trend()
             },
             'users': {
                 'total': len(all_users),
@@ -58,46 +76,52 @@ class AnalyticsAPI:
             'timestamp': datetime.now().isoformat()
         }
         
-        print("✅ Comprehensive metrics generated")
+        logger.debug("✅ Comprehensive metrics generated")
         return metrics
     
     def get_alert_analytics(self) -> Dict[str, Any]:
         """Get detailed analytics for alerts"""
-        print("📊 Generating alert analytics...")
-        
-        all_alerts = self.alert_service.list_all_alerts()
+        return self.cache.get('alert_analytics', self._build_alert_analytics, (ALERTS,))
+    
+    def _build_alert_analytics(self) -> Dict[str, Any]:
+        logger.debug("📊 Generating alert analytics...")
         
-        # Time-based analytics
-        today = datetime.now().date()
+        # Time-based analytics, counted on the created_at index
+        today = datetime.combine(datetime.now().date(), time.min)
+        tomorrow = today + timedelta(days=1)
         last_week = today - timedelta(days=7)
         last_month = today - timedelta(days=30)
         
-        alerts_today = [a for a in all_alerts if a.created_at.date() == today]
-        alerts_week = [a for a in all_alerts if a.created_at.date() >= last_week]
-        alerts_month = [a for a in all_alerts if a.created_at.date() >= last_month]
-        
         analytics = {
             'time_periods': {
-                'today': len(alerts_today),
-                'last_7_days': len(alerts_week),
-                'last_30_days': len(alerts_month)
+                'today': self.alert_service.count_alerts_between(today, tomorrow),
+                'last_7_days': self.alert_service.count_alerts_between(last_week),
+                'last_30_days': self.alert_service.count_alerts_between(last_month)
             },
             'severity_trends': {
-                'today': self._get_severity_breakdown(alerts_today),
-                'week': self._get_severity_breakdown(alerts_week),
-                'month': self._get_severity_breakdown(alerts_month)
+                'today': self._count_severities_between(today, tomorrow),
+                'week': self._count_severities_between(last_week),
+                'month': self._count_severities_between(last_month)
+            },
+            'activity': {
+                'today': self._count_activity_since(today),
+                'last_7_days': self._count_activity_since(last_week),
+                'last_30_days': self._count_activity_since(last_month)
             },
-            'top_alert_creators': self._get_top_creators(all_alerts),
-            'most_active_teams': self._get_most_active_teams(all_alerts),
-            'alert_lifespan': self._get_alert_lifespan_stats(all_alerts)
+            'top_alert_creators': self._get_top_creators(),
+            'most_active_teams': self._get_most_active_teams(),
+            'alert_lifespan': self._get_alert_lifespan_stats()
         }
         
-        print("✅ Alert analytics generated")
+        logger.debug("✅ Alert analytics generated")
         return analytics
     
     def get_user_analytics(self) -> Dict[str, Any]:
         """Get analytics for user behavior"""
-        print("👤 Generating user analytics...")
+        return self.cache.get('user_analytics', self._build_user_analytics, (MEMBERSHIP,))
+    
+    def _build_user_analytics(self) -> Dict[str, Any]:
+        logger.debug("👤 Generating user analytics...")
         
         all_users = self.alert_service.get_all_users()
         user_engagement = self._calculate_user_engagement()
@@ -110,84 +134,82 @@ class AnalyticsAPI:
             },
             'engagement': user_engagement,
             'team_distribution': self._get_team_distribution(),
+            'top_recipients': self._get_top_recipients(),
             'user_activity': self._get_user_activity_stats()
         }
         
-        print("✅ User analytics generated")
+        logger.debug("✅ User analytics generated")
         return analytics
     
     def _calculate_user_engagement(self) -> Dict[str, Any]:
-        """Calculate user engagement metrics (simulated)"""
-        # In a real system, this would query user activity data
+        """Calculate user engagement metrics
+
+        Rates are reads and snoozes per delivery over the last 30 days, from
+        the activity buckets.
+        """
+        delivery_stats = self.notification_service.get_delivery_stats()
+        since = datetime.now() - timedelta(days=30)
+        delivered = self.notification_service.count_activity(DELIVERED, DAY, since)
+        
+        def rate(kind: str) -> str:
+            if not delivered:
+                return '0%'
+            return f"{100 * self.notification_service.count_activity(kind, DAY, since) / delivered:.0f}%"
+        
         return {
-            'active_users': len(self.alert_service.get_all_users()),  # Simulated
-            'avg_alerts_per_user': 3.2,  # Simulated
-            'response_rate': '85%',  # Simulated
-            'snooze_rate': '15%'  # Simulated
+            'active_users': len(self.alert_service.get_all_users()),
+            'avg_alerts_per_user': round(delivery_stats['user_preferences'] / delivery_stats['unique_users'], 1)
+                                   if delivery_stats['unique_users'] else 0,
+            'response_rate': rate(READ),
+            'snooze_rate': rate(SNOOZED)
         }
     
-    def _get_severity_breakdown(self, alerts: List) -> Dict[str, int]:
-        """Get breakdown of alerts by severity"""
+    def _count_severities_between(self, start: datetime, end: Optional[datetime] = None) -> Dict[str, int]:
+        """Get breakdown by severity of the alerts created in [start, end)"""
         from models.alert import Severity
         
-        breakdown = {severity.value: 0 for severity in Severity}
-        
-        for alert in alerts:
-            severity_value = alert.severity.value
-            if severity_value in breakdown:
-                breakdown[severity_value] += 1
-        
-        return breakdown
-    
-    def _get_visibility_breakdown(self, alerts: List) -> Dict[str, int]:
-        """Get breakdown of alerts by visibility type"""
-        from models.alert import VisibilityType
-        
-        breakdown = {vt.value: 0 for vt in VisibilityType}
-        
-        for alert in alerts:
-            visibility_value = alert.visibility.type.value
-            if visibility_value in breakdown:
-                breakdown[visibility_value] += 1
-        
-        return breakdown
+        return {
+            severity.value: self.alert_service.count_alerts_between(start, end, severity=severity)
+            for severity in Severity
+        }
     
-    def _get_creation_trend(self, alerts: List) -> List[Dict[str, Any]]:
-        """Get alert creation trend (simulated)"""
-        # In a real system, this would analyze creation dates
+    def _get_creation_trend(self, days: int = 7) -> List[Dict[str, Any]]:
+        """Get alerts created per day over the last few days, oldest first, from the day buckets"""
+        start = datetime.now() - timedelta(days=days - 1)
         return [
-            {'date': '2024-01-01', 'count': 5},
-            {'date': '2024-01-02', 'count': 8},
-            {'date': '2024-01-03', 'count': 12},
-            {'date': '2024-01-04', 'count': 7},
-            {'date': '2024-01-05', 'count': 10}
+            {'date': bucket.strftime(DATE_FORMAT), 'count': count}
+            for bucket, count in self.notification_service.get_activity_series(CREATED, DAY, start)
         ]
     
-    def _get_top_creators(self, alerts: List) -> List[Dict[str, Any]]:
+    def _count_activity_since(self, start: datetime) -> Dict[str, int]:
+        """Get deliveries, reads and snoozes from the day buckets since start"""
+        return {
+            kind: self.notification_service.count_activity(kind, DAY, start)
+            for kind in (DELIVERED, READ, SNOOZED)
+        }
+    
+    def _get_top_creators(self) -> List[Dict[str, Any]]:
         """Get top alert creators"""
-        creator_counts = {}
-        
-        for alert in alerts:
-            creator = alert.created_by
-            creator_counts[creator] = creator_counts.get(creator, 0) + 1
-        
-        top_creators = [
+        return [
             {'user_id': creator, 'alert_count': count}
-            for creator, count in sorted(creator_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+            for creator, count, _ in self.metrics.get_top_creators(5)
+        ]
+    
+    def _get_most_active_teams(self) -> List[Dict[str, Any]]:
+        """Get the teams targeted by the most alerts"""
+        return [
+            {'team_id': team_id, 'alert_count': count}
+            for team_id, count, _ in self.metrics.get_top_teams(5)
         ]
-        
-        return top_creators
     
-    def _get_most_active_teams(self, alerts: List) -> List[Dict[str, Any]]:
-        """Get most active teams (simulated)"""
-        # In a real system, this would analyze team activity
+    def _get_top_recipients(self) -> List[Dict[str, Any]]:
+        """Get the users sent the most notifications"""
         return [
-            {'team_id': 'engineering', 'alert_count': 15},
-            {'team_id': 'marketing', 'alert_count': 8},
-            {'team_id': 'qa', 'alert_count': 5}
+            {'user_id': user_id, 'delivery_count': count}
+            for user_id, count, _ in self.notification_service.get_top_recipients(5)
         ]
     
-    def _get_alert_lifespan_stats(self, alerts: List) -> Dict[str, Any]:
+    def _get_alert_lifespan_stats(self) -> Dict[str, Any]:
         """Get alert lifespan statistics (simulated)"""
         return {
             'average_lifespan_hours': 24.5,
@@ -209,17 +231,16 @@ class AnalyticsAPI:
         }
     
     def _get_user_activity_stats(self) -> Dict[str, Any]:
-        """Get user activity statistics (simulated)"""
-        return {
-            'daily_active_users': 45,
-            'weekly_active_users': 120,
-            'monthly_active_users': 450,
-            'avg_session_minutes': 8.5
-        }
+        """Get time-to-read and time-to-snooze p50/p95/p99 in seconds, overall, per severity and per team"""
+        return self.notification_service.get_engagement_latencies()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit, miss and recompute-time figures for the report cache"""
+        return self.cache.get_stats()
     
     def generate_report(self, report_type: str = "weekly") -> Dict[str, Any]:
-        """Generate a comprehensive report"""
-        print(f"📄 Generating {report_type} report...")
+        """Generate a comprehensive report from the cached sections"""
+        logger.debug("📄 Generating %s report...", report_type)
         
         report = {
             'report_type': report_type,
@@ -230,7 +251,7 @@ class AnalyticsAPI:
             'recommendations': self._generate_recommendations()
         }
         
-        print(f"✅ {report_type.capitalize()} report generated")
+        logger.debug("✅ %s report generated", report_type.capitalize())
         return report
     
     def _generate_recommendations(self) -> List[str]:
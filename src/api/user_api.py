@@ -1,6 +1,11 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from models.alert import Alert
 from services.alert_service import AlertService
 from services.notification_service import NotificationService
+from utils.keyset import alert_key, clamp_page_size, decode_cursor, encode_cursor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class UserAPI:
     """API for user operations"""
@@ -11,45 +16,70 @@ class UserAPI:
     
     def get_alerts(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all alerts for a user with their preferences"""
-        print(f"👤 User {user_id} fetching alerts...")
+        logger.debug("👤 User %s fetching alerts...", user_id)
         
         alerts_with_prefs = self.notification_service.get_user_alerts_with_preferences(user_id)
         
         # Format the response - FIXED: Use the correct structure
-        formatted_alerts = []
-        for alert_data in alerts_with_prefs:
-            alert = alert_data['alert']
-            preference = alert_data['preference']
-            
-            formatted_alert = {
-                'alert': alert,  # Keep the alert object for internal use
-                'preference': preference,  # Keep preference object
-                'alert_id': alert.alert_id,
-                'title': alert.title,
-                'message': alert.message,
-                'severity': alert.severity.value,
-                'created_at': alert.created_at,
-                'status': alert_data['status'],
-                'is_snoozed': alert_data['is_snoozed'],
-                'is_active': alert.is_active,
-                'is_expired': alert.is_expired(),
-                'visibility_type': alert.visibility.type.value
-            }
-            formatted_alerts.append(formatted_alert)
-        
-        print(f"✅ User {user_id} has {len(formatted_alerts)} alerts")
+        formatted_alerts = [
+            self._format_alert(alert_data['alert'], alert_data['preference'])
+            for alert_data in alerts_with_prefs
+        ]
+        
+        logger.debug("✅ User %s has %s alerts", user_id, len(formatted_alerts))
         return formatted_alerts
     
+    def get_alerts_page(self, user_id: str, cursor: Optional[str] = None,
+                        page_size: Optional[int] = None) -> Dict[str, Any]:
+        """Get one page of a user's alerts, newest first
+
+        Pass the returned 'next_cursor' back to read the following page; it
+        is None on the last page. page_size defaults to DEFAULT_PAGE_SIZE and
+        is capped at MAX_PAGE_SIZE. Raises ValueError for a malformed cursor.
+        """
+        page_size = clamp_page_size(page_size)
+        before = decode_cursor(cursor) if cursor else None
+        logger.debug("👤 User %s fetching a page of %s alerts...", user_id, page_size)
+        
+        # One extra alert tells whether another page follows
+        alerts_with_prefs = self.notification_service.get_user_alerts_with_preferences(
+            user_id, before, page_size + 1)
+        page = alerts_with_prefs[:page_size]
+        
+        formatted_alerts = [
+            self._format_alert(alert_data['alert'], alert_data['preference'])
+            for alert_data in page
+        ]
+        next_cursor = None
+        if len(alerts_with_prefs) > page_size:
+            next_cursor = encode_cursor(alert_key(page[-1]['alert']))
+        
+        logger.debug("✅ User %s page has %s alerts", user_id, len(formatted_alerts))
+        return {'alerts': formatted_alerts, 'next_cursor': next_cursor}
+    
+    def _format_alert(self, alert: Alert, preference) -> Dict[str, Any]:
+        return {
+            'alert': alert,  # Keep the alert object for internal use
+            'preference': preference,  # Keep preference object
+            'alert_id': alert.alert_id,
+            'title': alert.title,
+            'message': alert.message,
+            'severity': alert.severity.value,
+            'created_at': alert.created_at,
+            'status': preference.status.value,
+            'is_snoozed': preference.is_snoozed(),
+            'is_active': alert.is_active,
+            'is_expired': alert.is_expired(),
+            'visibility_type': alert.visibility.type.value
+        }
+    
     def mark_alert_read(self, user_id: str, alert_id: str):
         """Mark an alert as read for a user"""
-        print(f"📖 User {user_id} marking alert {alert_id} as READ")
+        logger.debug("📖 User %s marking alert %s as READ", user_id, alert_id)
         
         # Verify the alert exists and is visible to user
-        user_alerts = self.alert_service.get_alerts_for_user(user_id)
-        alert_ids = [alert.alert_id for alert in user_alerts]
-        
-        if alert_id not in alert_ids:
-            print(f"❌ Alert {alert_id} not found or not visible to user {user_id}")
+        if not self.alert_service.can_user_see(user_id, alert_id):
+            logger.warning("❌ Alert %s not found or not visible to user %s", alert_id, user_id)
             return False
         
         self.notification_service.mark_as_read(user_id, alert_id)
@@ -57,14 +87,11 @@ class UserAPI:
     
     def mark_alert_unread(self, user_id: str, alert_id: str):
         """Mark an alert as unread for a user"""
-        print(f"📖 User {user_id} marking alert {alert_id} as UNREAD")
+        logger.debug("📖 User %s marking alert %s as UNREAD", user_id, alert_id)
         
         # Verify the alert exists and is visible to user
-        user_alerts = self.alert_service.get_alerts_for_user(user_id)
-        alert_ids = [alert.alert_id for alert in user_alerts]
-        
-        if alert_id not in alert_ids:
-            print(f"❌ Alert {alert_id} not found or not visible to user {user_id}")
+        if not self.alert_service.can_user_see(user_id, alert_id):
+            logger.warning("❌ Alert %s not found or not visible to user %s", alert_id, user_id)
             return False
         
         self.notification_service.mark_as_unread(user_id, alert_id)
@@ -72,14 +99,11 @@ class UserAPI:
     
     def snooze_alert(self, user_id: str, alert_id: str):
         """Snooze an alert for a user until tomorrow"""
-        print(f"⏰ User {user_id} snoozing alert {alert_id}")
+        logger.debug("⏰ User %s snoozing alert %s", user_id, alert_id)
         
         # Verify the alert exists and is visible to user
-        user_alerts = self.alert_service.get_alerts_for_user(user_id)
-        alert_ids = [alert.alert_id for alert in user_alerts]
-        
-        if alert_id not in alert_ids:
-            print(f"❌ Alert {alert_id} not found or not visible to user {user_id}")
+        if not self.alert_service.can_user_see(user_id, alert_id):
+            logger.warning("❌ Alert %s not found or not visible to user %s", alert_id, user_id)
             return False
         
         self.notification_service.snooze_alert(user_id, alert_id)
@@ -87,54 +111,51 @@ class UserAPI:
     
     def get_snoozed_alerts(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all snoozed alerts for a user"""
-        print(f"👤 User {user_id} fetching snoozed alerts...")
+        logger.debug("👤 User %s fetching snoozed alerts...", user_id)
         
         all_alerts = self.get_alerts(user_id)
         snoozed_alerts = [alert for alert in all_alerts if alert['is_snoozed']]
         
-        print(f"✅ User {user_id} has {len(snoozed_alerts)} snoozed alerts")
+        logger.debug("✅ User %s has %s snoozed alerts", user_id, len(snoozed_alerts))
         return snoozed_alerts
     
     def get_alert_detail(self, user_id: str, alert_id: str) -> Dict[str, Any]:
         """Get detailed information about a specific alert"""
-        print(f"👤 User {user_id} fetching alert detail: {alert_id}")
+        logger.debug("👤 User %s fetching alert detail: %s", user_id, alert_id)
         
         user_alerts = self.get_alerts(user_id)
         alert_detail = next((alert for alert in user_alerts if alert['alert_id'] == alert_id), None)
         
         if alert_detail:
-            print(f"✅ Alert detail retrieved")
+            logger.debug("✅ Alert detail retrieved")
         else:
-            print(f"❌ Alert {alert_id} not found for user {user_id}")
+            logger.warning("❌ Alert %s not found for user %s", alert_id, user_id)
         
         return alert_detail
     
     def get_user_dashboard(self, user_id: str) -> Dict[str, Any]:
-        """Get user dashboard data"""
-        print(f"📊 Generating dashboard for user {user_id}")
+        """Get user dashboard data
+
+        Counts come from the user's incrementally maintained inbox, so the
+        cost does not grow with the number of alerts. The critical and
+        snoozed lists hold the newest InboxIndex.LIST_SIZE entries.
+        """
+        logger.debug("📊 Generating dashboard for user %s", user_id)
         
-        all_alerts = self.get_alerts(user_id)
-        snoozed_alerts = self.get_snoozed_alerts(user_id)
+        inbox = self.notification_service.get_user_dashboard(user_id)
         
-        # Categorize alerts
-        critical_alerts = [a for a in all_alerts if a['severity'] == 'critical' and not a['is_snoozed']]
-        warning_alerts = [a for a in all_alerts if a['severity'] == 'warning' and not a['is_snoozed']]
-        info_alerts = [a for a in all_alerts if a['severity'] == 'info' and not a['is_snoozed']]
-        unread_alerts = [a for a in all_alerts if a['status'] == 'unread' and not a['is_snoozed']]
+        def format_alerts(alerts: List[Alert]) -> List[Dict[str, Any]]:
+            return [
+                self._format_alert(alert, self.notification_service.get_or_create_preference(user_id, alert.alert_id))
+                for alert in alerts
+            ]
         
         dashboard = {
-            'summary': {
-                'total_alerts': len(all_alerts),
-                'unread_alerts': len(unread_alerts),
-                'snoozed_alerts': len(snoozed_alerts),
-                'critical_alerts': len(critical_alerts),
-                'warning_alerts': len(warning_alerts),
-                'info_alerts': len(info_alerts)
-            },
-            'recent_alerts': all_alerts[:5],  # Last 5 alerts
-            'critical_alerts': critical_alerts,
-            'snoozed_alerts': snoozed_alerts
+            'summary': inbox['summary'],
+            'recent_alerts': format_alerts(inbox['recent_alerts']),  # Last 5 alerts
+            'critical_alerts': format_alerts(inbox['critical_alerts']),
+            'snoozed_alerts': format_alerts(inbox['snoozed_alerts'])
         }
         
-        print(f"✅ Dashboard generated for user {user_id}")
-        return dashboard
\ No newline at end of file
+        logger.debug("✅ Dashboard generated for user %s", user_id)
+        return dashboard
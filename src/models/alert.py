@@ -77,7 +77,8 @@ class Alert:
         message: Optional[str] = None,
         severity: Optional[Severity] = None,
         expiry_time: Optional[datetime] = None,
-        reminders_enabled: Optional[bool] = None
+        reminders_enabled: Optional[bool] = None,
+        reminder_frequency: Optional[int] = None
     ):
         if title is not None:
             self.title = title
@@ -89,6 +90,8 @@ class Alert:
             self.expiry_time = expiry_time
         if reminders_enabled is not None:
             self.reminders_enabled = reminders_enabled
+        if reminder_frequency is not None:
+            self.reminder_frequency = reminder_frequency
     
     def __repr__(self):
         return f"Alert(id={self.alert_id}, title={self.title}, severity={self.severity.value})"
@@ -52,13 +52,14 @@ class UserAlertPreference:
         return f"UserAlertPreference(user={self.user_id}, alert={self.alert_id}, status={self.status.value})"
 
 class NotificationDelivery:
-    def __init__(self, delivery_id: str, user_id: str, alert_id: str, delivery_type: str):
+    def __init__(self, delivery_id: str, user_id: str, alert_id: str, delivery_type: str,
+                 delivered_at: Optional[datetime] = None, delivery_status: str = "sent"):
         self.delivery_id = delivery_id
         self.user_id = user_id
         self.alert_id = alert_id
         self.delivery_type = delivery_type
-        self.delivered_at = datetime.now()
-        self.delivery_status = "sent"
+        self.delivered_at = delivered_at or datetime.now()
+        self.delivery_status = delivery_status
     
     def __repr__(self):
         return f"NotificationDelivery(user={self.user_id}, alert={self.alert_id}, type={self.delivery_type})"
\ No newline at end of file
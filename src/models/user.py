@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Set
+from typing import Optional, Set
 from enum import Enum
 
 class UserRole(Enum):
@@ -7,11 +7,13 @@ class UserRole(Enum):
     USER = "user"
 
 class User:
-    def __init__(self, user_id: str, name: str, email: str, role: UserRole = UserRole.USER):
+    def __init__(self, user_id: str, name: str, email: str, role: UserRole = UserRole.USER,
+                 phone: Optional[str] = None):
         self.user_id = user_id
         self.name = name
         self.email = email
         self.role = role
+        self.phone = phone
         self.teams: Set[str] = set()
         self.created_at = datetime.now()
     
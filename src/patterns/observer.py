@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class AlertObserver(ABC):
     """Observer interface for alert lifecycle events"""
@@ -18,6 +22,19 @@ class AlertObserver(ABC):
     def on_alert_archived(self, alert):
         """Called when an alert is archived"""
         pass
+    
+    def on_alert_expired(self, alert):
+        """Called when an active alert passes its expiry time"""
+        pass
+    
+    def on_alerts_created(self, alerts):
+        """Called once for a batch of new alerts; override to handle the batch in one pass"""
+        for alert in alerts:
+            self.on_alert_created(alert)
+    
+    def on_membership_changed(self, user_ids):
+        """Called when users are registered or join or leave teams, changing which alerts they see"""
+        pass
 
 class AlertObservable:
     """Observable class for alert lifecycle events"""
@@ -29,40 +46,74 @@ class AlertObservable:
         """Add an observer to the list"""
         if observer not in self._observers:
             self._observers.append(observer)
-            print(f"✅ Added observer: {observer.__class__.__name__}")
+            logger.debug("✅ Added observer: %s", observer.__class__.__name__)
     
     def remove_observer(self, observer: AlertObserver):
         """Remove an observer from the list"""
         if observer in self._observers:
             self._observers.remove(observer)
-            print(f"✅ Removed observer: {observer.__class__.__name__}")
+            logger.debug("✅ Removed observer: %s", observer.__class__.__name__)
+    
+    def find_observer(self, observer_type: type) -> Optional[AlertObserver]:
+        """The first registered observer of a type, so callers can share it instead of adding another"""
+        for observer in self._observers:
+            if isinstance(observer, observer_type):
+                return observer
+        return None
     
     def notify_alert_created(self, alert):
         """Notify all observers about alert creation"""
-        print(f"🔔 Notifying {len(self._observers)} observers about alert creation: {alert.title}")
+        logger.debug("🔔 Notifying %d observers about alert creation: %s", len(self._observers), alert.title)
         for observer in self._observers:
             try:
                 observer.on_alert_created(alert)
             except Exception as e:
-                print(f"❌ Error notifying observer {observer.__class__.__name__}: {e}")
+                logger.error("❌ Error notifying observer %s: %s", observer.__class__.__name__, e)
+    
+    def notify_alerts_created(self, alerts):
+        """Notify all observers about a batch of new alerts with one event"""
+        logger.debug("🔔 Notifying %d observers about %d new alerts", len(self._observers), len(alerts))
+        for observer in self._observers:
+            try:
+                observer.on_alerts_created(alerts)
+            except Exception as e:
+                logger.error("❌ Error notifying observer %s: %s", observer.__class__.__name__, e)
     
     def notify_alert_updated(self, alert):
         """Notify all observers about alert update"""
-        print(f"🔔 Notifying {len(self._observers)} observers about alert update: {alert.title}")
+        logger.debug("🔔 Notifying %d observers about alert update: %s", len(self._observers), alert.title)
         for observer in self._observers:
             try:
                 observer.on_alert_updated(alert)
             except Exception as e:
-                print(f"❌ Error notifying observer {observer.__class__.__name__}: {e}")
+                logger.error("❌ Error notifying observer %s: %s", observer.__class__.__name__, e)
     
     def notify_alert_archived(self, alert):
         """Notify all observers about alert archiving"""
-        print(f"🔔 Notifying {len(self._observers)} observers about alert archiving: {alert.title}")
+        logger.debug("🔔 Notifying %d observers about alert archiving: %s", len(self._observers), alert.title)
         for observer in self._observers:
             try:
                 observer.on_alert_archived(alert)
             except Exception as e:
-                print(f"❌ Error notifying observer {observer.__class__.__name__}: {e}")
+                logger.error("❌ Error notifying observer %s: %s", observer.__class__.__name__, e)
+    
+    def notify_alert_expired(self, alert):
+        """Notify all observers about alert expiry"""
+        logger.debug("🔔 Notifying %d observers about alert expiry: %s", len(self._observers), alert.title)
+        for observer in self._observers:
+            try:
+                observer.on_alert_expired(alert)
+            except Exception as e:
+                logger.error("❌ Error notifying observer %s: %s", observer.__class__.__name__, e)
+    
+    def notify_membership_changed(self, user_ids):
+        """Notify all observers that these users' registration or team membership changed"""
+        logger.debug("🔔 Notifying %d observers about membership changes for %d users", len(self._observers), len(user_ids))
+        for observer in self._observers:
+            try:
+                observer.on_membership_changed(user_ids)
+            except Exception as e:
+                logger.error("❌ Error notifying observer %s: %s", observer.__class__.__name__, e)
     
     def get_observer_count(self) -> int:
         """Get the number of registered observers"""
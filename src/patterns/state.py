@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class NotificationState(ABC):
     """State interface for notification status"""
     
@@ -36,16 +40,16 @@ class UnreadState(NotificationState):
         preference.status = "read"
         preference.read_at = datetime.now()
         preference._state = ReadState()
-        print(f"✅ Marked alert {preference.alert_id} as READ")
+        logger.debug("✅ Marked alert %s as READ", preference.alert_id)
     
     def mark_unread(self, preference):
         # Already unread, do nothing
-        print("ℹ️  Alert is already UNREAD")
+        logger.debug("ℹ️  Alert is already UNREAD")
     
     def snooze(self, preference):
         preference.snooze_until_tomorrow()
         preference._state = SnoozedState()
-        print(f"⏰ Snoozed alert {preference.alert_id} until tomorrow")
+        logger.debug("⏰ Snoozed alert %s until tomorrow", preference.alert_id)
     
     def get_status(self) -> str:
         return "unread"
@@ -61,17 +65,17 @@ class ReadState(NotificationState):
     
     def mark_read(self, preference):
         # Already read, do nothing
-        print("ℹ️  Alert is already READ")
+        logger.debug("ℹ️  Alert is already READ")
     
     def mark_unread(self, preference):
         preference.status = "unread"
         preference.read_at = None
         preference._state = UnreadState()
-        print(f"✅ Marked alert {preference.alert_id} as UNREAD")
+        logger.debug("✅ Marked alert %s as UNREAD", preference.alert_id)
     
     def snooze(self, preference):
         # Cannot snooze a read notification
-        print("❌ Cannot snooze a READ alert")
+        logger.warning("❌ Cannot snooze a READ alert")
     
     def get_status(self) -> str:
         return "read"
@@ -90,19 +94,19 @@ class SnoozedState(NotificationState):
         preference.read_at = datetime.now()
         preference.snoozed_until = None
         preference._state = ReadState()
-        print(f"✅ Marked snoozed alert {preference.alert_id} as READ")
+        logger.debug("✅ Marked snoozed alert %s as READ", preference.alert_id)
     
     def mark_unread(self, preference):
         preference.status = "unread"
         preference.read_at = None
         preference.snoozed_until = None
         preference._state = UnreadState()
-        print(f"✅ Marked snoozed alert {preference.alert_id} as UNREAD")
+        logger.debug("✅ Marked snoozed alert %s as UNREAD", preference.alert_id)
     
     def snooze(self, preference):
         # Resnooze until tomorrow
         preference.snooze_until_tomorrow()
-        print(f"⏰ Resnoozed alert {preference.alert_id} until tomorrow")
+        logger.debug("⏰ Resnoozed alert %s until tomorrow", preference.alert_id)
     
     def get_status(self) -> str:
         return "snoozed"
@@ -0,0 +1,146 @@
+import threading
+import time
+from datetime import date, datetime, time as day_start, timedelta
+from typing import List, Optional, Tuple
+
+from utils.logger import get_logger
+from utils.settings import load_settings
+
+logger = get_logger(__name__)
+
+CREATED = "created"
+DELIVERED = "delivered"
+READ = "read"
+SNOOZED = "snoozed"
+_KINDS = [CREATED, DELIVERED, READ, SNOOZED]
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+
+MINUTE = "minute"
+HOUR = "hour"
+DAY = "day"
+
+class _BucketRing:
+    """Fixed number of time buckets reused in rotation
+
+    Slot ``bucket % slots`` holds one bucket's counts per event kind, and
+    keys records which bucket that is, so a slot still holding an older
+    bucket reads as empty and is reset when a newer one arrives.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.keys = [-1] * slots
+        self.counts = [[0] * len(_KINDS) for _ in range(slots)]
+
+    def add(self, bucket: int, kind: int, count: int):
+        slot = bucket % self.slots
+        held = self.keys[slot]
+        if held != bucket:
+            if held > bucket:
+                return  # older than this ring retains
+            self.keys[slot] = bucket
+            self.counts[slot] = [0] * len(_KINDS)
+        self.counts[slot][kind] += count
+
+    def read(self, kind: int, first: int, last: int) -> List[Tuple[int, int]]:
+        """(bucket, count) for the retained buckets in first..last"""
+        keys, counts, slots = self.keys, self.counts, self.slots
+        result = []
+        for bucket in range(max(first, last - slots + 1), last + 1):
+            slot = bucket % slots
+            result.append((bucket, counts[slot][kind] if keys[slot] == bucket else 0))
+        return result
+
+class ActivitySeries:
+    """Per-minute, per-hour and per-day counts of alert activity
+
+    Each event (alert created, notification delivered, alert read or
+    snoozed) is added to its minute, hour and day bucket as it is recorded,
+    so the coarser series are rolled up at write time. Every resolution is a
+    fixed ring: minutes cover the last day, hours the last 30 days and days
+    DATA_RETENTION_DAYS, so memory does not grow with event volume and a
+    query reads at most one ring's worth of buckets. Hours and minutes are
+    aligned to the epoch, days to local midnight.
+    """
+
+    def __init__(self, retention_days: Optional[int] = None):
+        settings = load_settings()
+        self.retention_days = max(1, retention_days or (settings.DATA_RETENTION_DAYS if settings else 365))
+        self._rings = {
+            MINUTE: _BucketRing(24 * 60),
+            HOUR: _BucketRing(24 * min(30, self.retention_days)),
+            DAY: _BucketRing(self.retention_days),
+        }
+        # Local midnight-to-midnight range of the last day bucket computed
+        self._day_range = (0.0, 0.0)
+        self._day = 0
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, timestamp: Optional[float] = None, count: int = 1):
+        """Add count events of this kind at timestamp (default now)"""
+        if count <= 0:
+            return
+        code = _KIND_CODES[kind]
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._rings[MINUTE].add(int(timestamp // 60), code, count)
+            self._rings[HOUR].add(int(timestamp // 3600), code, count)
+            self._rings[DAY].add(self._day_bucket(timestamp), code, count)
+
+    def record_many(self, kind: str, timestamps: List[float]):
+        """Add one event of this kind at each timestamp"""
+        code = _KIND_CODES[kind]
+        minutes, hours, days = self._rings[MINUTE], self._rings[HOUR], self._rings[DAY]
+        with self._lock:
+            for timestamp in timestamps:
+                minutes.add(int(timestamp // 60), code, 1)
+                hours.add(int(timestamp // 3600), code, 1)
+                days.add(self._day_bucket(timestamp), code, 1)
+
+    def _day_bucket(self, timestamp: float) -> int:
+        # Events arrive in bursts on the same day, so the local date is only worked out on a change
+        start, end = self._day_range
+        if not start <= timestamp < end:
+            day = datetime.fromtimestamp(timestamp).date()
+            self._day_range = (datetime.combine(day, day_start.min).timestamp(),
+                               datetime.combine(day + timedelta(days=1), day_start.min).timestamp())
+            self._day = day.toordinal()
+        return self._day
+
+    def series(
+        self,
+        kind: str,
+        resolution: str,
+        start: datetime,
+        end: Optional[datetime] = None
+    ) -> List[Tuple[datetime, int]]:
+        """(bucket start, count) for the buckets from the one holding start to the one holding end
+
+        end defaults to now. Buckets older than the resolution's ring are
+        left out, so the result never exceeds one ring.
+        """
+        end = end or datetime.now()
+        first, last = self._bucket(resolution, start), self._bucket(resolution, end)
+        with self._lock:
+            buckets = self._rings[resolution].read(_KIND_CODES[kind], first, last)
+        return [(self._bucket_start(resolution, bucket), count) for bucket, count in buckets]
+
+    def count(self, kind: str, resolution: str, start: datetime, end: Optional[datetime] = None) -> int:
+        """Total of the same buckets series returns"""
+        first, last = self._bucket(resolution, start), self._bucket(resolution, end or datetime.now())
+        with self._lock:
+            return sum(count for _, count in self._rings[resolution].read(_KIND_CODES[kind], first, last))
+
+    @staticmethod
+    def _bucket(resolution: str, moment: datetime) -> int:
+        if resolution == DAY:
+            return moment.toordinal()
+        seconds = 60 if resolution == MINUTE else 3600
+        return int(moment.timestamp() // seconds)
+
+    @staticmethod
+    def _bucket_start(resolution: str, bucket: int) -> datetime:
+        if resolution == DAY:
+            return datetime.combine(date.fromordinal(bucket), day_start.min)
+        seconds = 60 if resolution == MINUTE else 3600
+        return datetime.fromtimestamp(bucket * seconds)
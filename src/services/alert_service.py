@@ -1,17 +1,55 @@
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
+import heapq
+import itertools
+import threading
 import uuid
 
 from models.alert import Alert, AlertVisibility, VisibilityType, Severity, DeliveryType
 from models.user import User
+from models.team import Team
 from patterns.observer import AlertObservable
+from storage.base_storage import StorageBackend
+from utils.interner import IdRegistry
+from utils.keyset import AlertKey, KeysetIndex, alert_key
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def _timestamp(moment: Optional[datetime]) -> Optional[float]:
+    return moment.timestamp() if moment is not None else None
 
 class AlertService(AlertObservable):
-    def __init__(self):
+    def __init__(self, ids: Optional[IdRegistry] = None, storage: Optional[StorageBackend] = None):
         super().__init__()
+        # With a storage backend, changes are written through; without one everything stays in memory
+        self.storage = storage
+        # Internal indexes hold interned integer ids; strings stay at the API boundary
+        self.ids = ids or IdRegistry()
         self._alerts: Dict[str, Alert] = {}
+        self._alerts_by_index: List[Optional[Alert]] = []  # alert index -> Alert
         self._users: Dict[str, User] = {}
-        self._teams: Dict[str, Set[str]] = {}  # team_id -> set of user_ids
+        self._teams: Dict[str, Team] = {}  # team_id -> Team (member_ids)
+        self._user_teams: Dict[str, Set[str]] = {}  # user_id -> team_ids, shared with User.teams
+        
+        # Visibility index: target index -> indexes of the active alerts aimed at it
+        self._org_alert_ids: Set[int] = set()
+        self._team_alert_ids: Dict[int, Set[int]] = {}  # team index -> alert indexes
+        self._user_alert_ids: Dict[int, Set[int]] = {}  # user index -> alert indexes
+        
+        # The same buckets as (created_at, alert_id) keys in sorted order, for keyset pagination
+        self._org_alert_keys = KeysetIndex()
+        self._team_alert_keys: Dict[int, KeysetIndex] = {}
+        self._user_alert_keys: Dict[int, KeysetIndex] = {}
+        self._all_alert_keys = KeysetIndex()  # every alert, whatever its state
+        self._severity_alert_keys: Dict[Severity, KeysetIndex] = {severity: KeysetIndex() for severity in Severity}
+        
+        # Lifecycle sets of alert indexes, kept current by expire_due_alerts
+        self._active_alert_ids: Set[int] = set()
+        self._expired_alert_ids: Set[int] = set()
+        self._archived_alert_ids: Set[int] = set()
+        self._expiry_heap: List[Tuple[float, int]] = []  # (expiry timestamp, alert index)
+        self._lock = threading.RLock()
     
     def create_alert(
         self,
@@ -27,33 +65,126 @@ class AlertService(AlertObservable):
         expiry_time: Optional[datetime] = None
     ) -> Alert:
         
-        alert_id = str(uuid.uuid4())
-        visibility = AlertVisibility(type=visibility_type, target_ids=target_ids)
-        
-        alert = Alert(
-            alert_id=alert_id,
+        alert = self._build_alert(
             title=title,
             message=message,
             severity=severity,
             created_by=created_by,
-            visibility=visibility,
+            visibility_type=visibility_type,
+            target_ids=target_ids,
             delivery_type=delivery_type,
             reminder_frequency=reminder_frequency,
             start_time=start_time,
             expiry_time=expiry_time
         )
         
-        self._alerts[alert_id] = alert
+        with self._lock:
+            self._add_alert(alert)
+        self._persist_alert(alert)
         self.notify_alert_created(alert)
         return alert
     
+    def create_alerts_bulk(self, alert_specs: List[dict]) -> List[Alert]:
+        """Create many alerts from create_alert keyword dicts
+
+        Indexes are updated under one lock, the batch is persisted in one
+        call and observers get a single on_alerts_created event.
+        """
+        alerts = [self._build_alert(**spec) for spec in alert_specs]
+        with self._lock:
+            for alert in alerts:
+                self._add_alert(alert)
+        if self.storage and alerts:
+            self.storage.save_alerts(alerts)
+        self.notify_alerts_created(alerts)
+        return alerts
+    
+    @staticmethod
+    def _build_alert(
+        title: str,
+        message: str,
+        severity: Severity,
+        created_by: str,
+        visibility_type: VisibilityType,
+        target_ids: Set[str],
+        delivery_type: DeliveryType = DeliveryType.IN_APP,
+        reminder_frequency: int = 120,
+        start_time: Optional[datetime] = None,
+        expiry_time: Optional[datetime] = None
+    ) -> Alert:
+        return Alert(
+            alert_id=str(uuid.uuid4()),
+            title=title,
+            message=message,
+            severity=severity,
+            created_by=created_by,
+            visibility=AlertVisibility(type=visibility_type, target_ids=target_ids),
+            delivery_type=delivery_type,
+            reminder_frequency=reminder_frequency,
+            start_time=start_time,
+            expiry_time=expiry_time
+        )
+    
+    def _add_alert(self, alert: Alert):
+        self._store_alert(alert)
+        self._track_expiry(alert)
+        self._classify_alert(alert)
+    
+    def _persist_alert(self, alert: Alert):
+        if self.storage:
+            self.storage.save_alert(alert)
+    
+    def _persist_team(self, team_id: str):
+        if self.storage:
+            self.storage.save_team(self._teams[team_id])
+    
+    def load_from_storage(self) -> int:
+        """Rebuild users, teams, alerts and their indexes from the storage backend
+
+        Nothing is written back and observers are not notified, not even of
+        membership; returns the number of alerts loaded.
+        """
+        if not self.storage:
+            return 0
+        
+        self._register_users(list(self.storage.load_users()))
+        teams = list(self.storage.load_teams())
+        self._replace_teams({team.team_id: team.member_ids for team in teams},
+                            {team.team_id: team.name for team in teams})
+        alerts = self.storage.load_alerts()
+        with self._lock:
+            for alert in alerts:
+                self._add_alert(alert)
+        logger.info("✅ Loaded %d alerts from storage", len(alerts))
+        return len(alerts)
+    
+    def _store_alert(self, alert: Alert):
+        index = self.ids.alerts.intern(alert.alert_id)
+        if index >= len(self._alerts_by_index):
+            self._alerts_by_index.extend([None] * (index + 1 - len(self._alerts_by_index)))
+        self._alerts_by_index[index] = alert
+        self._alerts[alert.alert_id] = alert
+        key = alert_key(alert)
+        self._all_alert_keys.add(key)
+        self._severity_alert_keys[alert.severity].add(key)
+    
     def get_alert(self, alert_id: str) -> Optional[Alert]:
         return self._alerts.get(alert_id)
     
     def update_alert(self, alert_id: str, **kwargs) -> Optional[Alert]:
         alert = self._alerts.get(alert_id)
         if alert:
-            alert.update(**kwargs)
+            with self._lock:
+                severity = alert.severity
+                alert.update(**kwargs)
+                if alert.severity != severity:
+                    key = alert_key(alert)
+                    self._severity_alert_keys[severity].discard(key)
+                    self._severity_alert_keys[alert.severity].add(key)
+                if kwargs.get('expiry_time') is not None:
+                    self._track_expiry(alert)
+                self._classify_alert(alert)
+            self._persist_alert(alert)
             self.notify_alert_updated(alert)
             return alert
         return None
@@ -61,7 +192,10 @@ class AlertService(AlertObservable):
     def archive_alert(self, alert_id: str) -> bool:
         alert = self._alerts.get(alert_id)
         if alert:
-            alert.archive()
+            with self._lock:
+                alert.archive()
+                self._classify_alert(alert)
+            self._persist_alert(alert)
             self.notify_alert_archived(alert)
             return True
         return False
@@ -71,63 +205,403 @@ class AlertService(AlertObservable):
         if not user:
             return []
         
-        user_teams = self.get_user_teams(user_id)
-        user_alerts = []
+        self.expire_due_alerts()
+        
+        # The index only holds active, unexpired alerts, so every candidate is visible
+        with self._lock:
+            user_teams = self.get_user_teams(user_id)
+            alert_indexes = self._get_candidate_alert_ids(user_id, user_teams)
+            return self._alerts_in_creation_order(alert_indexes)
+    
+    def can_user_see(self, user_id: str, alert_id: str, include_inactive: bool = False) -> bool:
+        """Check a single alert's visibility from its targets and the user's teams
+
+        Costs a few set lookups whatever the size of the user's inbox, so
+        per-click state changes don't have to build get_alerts_for_user.
+        With include_inactive, archived and expired alerts count as visible
+        to the users they were aimed at.
+        """
+        alert = self._alerts.get(alert_id)
+        if not alert or user_id not in self._users:
+            return False
+        if not include_inactive and (self.ids.alerts.lookup(alert_id) not in self._active_alert_ids
+                                     or alert.is_expired()):
+            return False
+        
+        visibility = alert.visibility
+        if visibility.type == VisibilityType.ORGANIZATION:
+            return True
+        if visibility.type == VisibilityType.TEAM:
+            return not self._user_teams.get(user_id, set()).isdisjoint(visibility.target_ids)
+        if visibility.type == VisibilityType.USER:
+            return user_id in visibility.target_ids
+        return False
+    
+    def get_alerts_page_for_user(
+        self,
+        user_id: str,
+        before: Optional[AlertKey] = None,
+        limit: Optional[int] = None
+    ) -> List[Alert]:
+        """Visible alerts newest first by (created_at, alert_id), starting below the before key
+
+        Merges the sorted org, team and user buckets, so a page costs a
+        bisect per bucket plus the page itself, not the whole inbox.
+        """
+        if user_id not in self._users:
+            return []
         
-        for alert in self._alerts.values():
-            if alert.is_visible_to_user(user, user_teams):
-                user_alerts.append(alert)
+        self.expire_due_alerts()
         
-        return user_alerts
+        with self._lock:
+            buckets = [self._org_alert_keys]
+            for team_id in self.get_user_teams(user_id):
+                buckets.append(self._team_alert_keys.get(self.ids.teams.lookup(team_id)))
+            buckets.append(self._user_alert_keys.get(self.ids.users.lookup(user_id)))
+            
+            merged = heapq.merge(*(keys.newest_first(before) for keys in buckets if keys), reverse=True)
+            # An alert aimed at several of the user's teams comes out once per team, back to back
+            unique = (key for key, _ in itertools.groupby(merged))
+            return [self._alerts[alert_id] for _, alert_id in itertools.islice(unique, limit)]
+    
+    def list_alerts_page(
+        self,
+        before: Optional[AlertKey] = None,
+        limit: Optional[int] = None,
+        severity: Optional[Severity] = None,
+        status: Optional[str] = None
+    ) -> List[Alert]:
+        """All alerts newest first by (created_at, alert_id), starting below the before key
+
+        Filters are applied while walking the global index, so a sparse
+        filter reads past the alerts it skips.
+        """
+        status_ids = {
+            "active": self._active_alert_ids,
+            "expired": self._expired_alert_ids,
+            "archived": self._archived_alert_ids
+        }.get(status)
+        if status_ids is not None:
+            self.expire_due_alerts()
+        
+        with self._lock:
+            alerts = (self._alerts[alert_id] for _, alert_id in self._all_alert_keys.newest_first(before))
+            if severity:
+                alerts = (a for a in alerts if a.severity == severity)
+            if status_ids is not None:
+                lookup = self.ids.alerts.lookup
+                alerts = (a for a in alerts if lookup(a.alert_id) in status_ids)
+            return list(itertools.islice(alerts, limit))
+    
+    def alerts_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Alert]:
+        """Alerts created in [start, end), oldest first, whatever their state; None leaves a side open"""
+        with self._lock:
+            keys = self._all_alert_keys.between(_timestamp(start), _timestamp(end))
+            return [self._alerts[alert_id] for _, alert_id in keys]
+    
+    def count_alerts_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        severity: Optional[Severity] = None
+    ) -> int:
+        """Count alerts created in [start, end) with two bisects, without building a list"""
+        keys = self._severity_alert_keys[severity] if severity else self._all_alert_keys
+        with self._lock:
+            return keys.count_between(_timestamp(start), _timestamp(end))
+    
+    def _alerts_in_creation_order(self, alert_indexes: Set[int]) -> List[Alert]:
+        # Alert indexes are handed out as alerts are created, so sorting them sorts by creation
+        alerts_by_index = self._alerts_by_index
+        return [alerts_by_index[index] for index in sorted(alert_indexes)]
+    
+    def _get_candidate_alert_ids(self, user_id: str, user_teams: Set[str]) -> Set[int]:
+        """Collect indexes of alerts targeted at the org, the user's teams or the user"""
+        candidates = set(self._org_alert_ids)
+        for team_id in user_teams:
+            team_index = self.ids.teams.lookup(team_id)
+            candidates.update(self._team_alert_ids.get(team_index, ()))
+        candidates.update(self._user_alert_ids.get(self.ids.users.lookup(user_id), ()))
+        return candidates
+    
+    def _get_index_buckets(self, alert: Alert) -> List[Tuple[Set[int], KeysetIndex]]:
+        """Get the visibility index buckets an alert belongs to, with their sorted keys"""
+        visibility = alert.visibility
+        if visibility.type == VisibilityType.ORGANIZATION:
+            return [(self._org_alert_ids, self._org_alert_keys)]
+        if visibility.type == VisibilityType.TEAM:
+            indexes = [self.ids.teams.intern(t) for t in visibility.target_ids]
+            return [(self._team_alert_ids.setdefault(i, set()), self._team_alert_keys.setdefault(i, KeysetIndex()))
+                    for i in indexes]
+        if visibility.type == VisibilityType.USER:
+            indexes = [self.ids.users.intern(u) for u in visibility.target_ids]
+            return [(self._user_alert_ids.setdefault(i, set()), self._user_alert_keys.setdefault(i, KeysetIndex()))
+                    for i in indexes]
+        return []
+    
+    def _index_alert(self, alert: Alert, alert_index: int):
+        """Add an alert to the visibility index"""
+        for bucket, keys in self._get_index_buckets(alert):
+            if alert_index not in bucket:
+                bucket.add(alert_index)
+                keys.add(alert_key(alert))
+    
+    def _unindex_alert(self, alert: Alert, alert_index: int):
+        """Remove an alert from the visibility index"""
+        for bucket, keys in self._get_index_buckets(alert):
+            if alert_index in bucket:
+                bucket.discard(alert_index)
+                keys.discard(alert_key(alert))
+    
+    def _classify_alert(self, alert: Alert, now: Optional[datetime] = None):
+        """Place an alert in the lifecycle sets and visibility index matching its state"""
+        alert_index = self.ids.alerts.lookup(alert.alert_id)
+        expired = alert.expiry_time is not None and (now or datetime.now()) > alert.expiry_time
+        
+        if alert.is_active:
+            self._archived_alert_ids.discard(alert_index)
+        else:
+            self._archived_alert_ids.add(alert_index)
+        
+        if expired:
+            self._expired_alert_ids.add(alert_index)
+        else:
+            self._expired_alert_ids.discard(alert_index)
+        
+        if alert.is_active and not expired:
+            self._active_alert_ids.add(alert_index)
+            self._index_alert(alert, alert_index)
+        else:
+            self._active_alert_ids.discard(alert_index)
+            self._unindex_alert(alert, alert_index)
+    
+    def _track_expiry(self, alert: Alert):
+        """Queue an alert on the expiry heap; superseded entries are skipped when popped"""
+        if alert.expiry_time:
+            heapq.heappush(self._expiry_heap, (alert.expiry_time.timestamp(), self.ids.alerts.lookup(alert.alert_id)))
+    
+    def expire_due_alerts(self, now: Optional[datetime] = None) -> List[Alert]:
+        """Move alerts whose expiry_time has passed out of the active set"""
+        now = now or datetime.now()
+        now_ts = now.timestamp()
+        expired_alerts = []
+        
+        with self._lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] < now_ts:
+                expiry_ts, alert_index = heapq.heappop(heap)
+                alert = self._alerts_by_index[alert_index]
+                if not alert or not alert.expiry_time or alert.expiry_time.timestamp() != expiry_ts:
+                    continue
+                
+                was_active = alert_index in self._active_alert_ids
+                self._classify_alert(alert, now)
+                if was_active and alert_index not in self._active_alert_ids:
+                    expired_alerts.append(alert)
+        
+        for alert in expired_alerts:
+            self.notify_alert_expired(alert)
+        return expired_alerts
+    
+    def get_alert_audience(self, alert: Alert, include_inactive: bool = False) -> List[User]:
+        """Resolve the users an alert is aimed at straight from its visibility targets
+
+        Archived and expired alerts have no audience unless include_inactive
+        is set, which gives who could see the alert while it was active.
+        """
+        if not include_inactive and (not alert.is_active or alert.is_expired()):
+            return []
+        
+        visibility = alert.visibility
+        if visibility.type == VisibilityType.ORGANIZATION:
+            return list(self._users.values())
+        
+        if visibility.type == VisibilityType.TEAM:
+            user_ids = set()
+            for team_id in visibility.target_ids:
+                user_ids.update(self.get_team_members(team_id))
+        elif visibility.type == VisibilityType.USER:
+            user_ids = visibility.target_ids
+        else:
+            return []
+        
+        # Targets may name users that are not registered
+        return [self._users[user_id] for user_id in user_ids if user_id in self._users]
+    
+    def get_alert_audiences(self, alerts: List[Alert]) -> List[List[User]]:
+        """Audiences for a batch of alerts; organisation-wide alerts share one user list"""
+        everyone = None
+        audiences = []
+        for alert in alerts:
+            if alert.visibility.type == VisibilityType.ORGANIZATION and alert.is_active and not alert.is_expired():
+                if everyone is None:
+                    everyone = list(self._users.values())
+                audiences.append(everyone)
+            else:
+                audiences.append(self.get_alert_audience(alert))
+        return audiences
     
     def list_all_alerts(
         self,
         severity: Optional[Severity] = None,
         status: Optional[str] = None
     ) -> List[Alert]:
-        filtered_alerts = list(self._alerts.values())
+        status_ids = {
+            "active": self._active_alert_ids,
+            "expired": self._expired_alert_ids,
+            "archived": self._archived_alert_ids
+        }
+        
+        if status in status_ids:
+            self.expire_due_alerts()
+            with self._lock:
+                filtered_alerts = self._alerts_in_creation_order(status_ids[status])
+        else:
+            filtered_alerts = list(self._alerts.values())
         
         if severity:
             filtered_alerts = [a for a in filtered_alerts if a.severity == severity]
         
-        if status == "active":
-            filtered_alerts = [a for a in filtered_alerts if a.is_active and not a.is_expired()]
-        elif status == "expired":
-            filtered_alerts = [a for a in filtered_alerts if a.is_expired()]
-        elif status == "archived":
-            filtered_alerts = [a for a in filtered_alerts if not a.is_active]
-        
         return filtered_alerts
     
+    def get_status_counts(self) -> Dict[str, int]:
+        """Get active, expired and archived alert counts from the lifecycle sets"""
+        self.expire_due_alerts()
+        return {
+            "active": len(self._active_alert_ids),
+            "expired": len(self._expired_alert_ids),
+            "archived": len(self._archived_alert_ids)
+        }
+    
     def add_user(self, user: User):
-        self._users[user.user_id] = user
+        self.add_users_bulk([user])
+    
+    def add_users_bulk(self, users: List[User]):
+        """Register many users, creating the teams listed in their User.teams
+
+        Each touched team is persisted once for the whole batch.
+        """
+        touched_teams = self._register_users(users)
+        if self.storage:
+            if users:
+                self.storage.save_users(users)
+            if touched_teams:
+                self.storage.save_teams([self._teams[team_id] for team_id in touched_teams])
+        if users:
+            self.notify_membership_changed([user.user_id for user in users])
+    
+    def _register_users(self, users: List[User]) -> Set[str]:
+        """Index users and their listed teams, returning the teams that gained members"""
+        touched_teams = set()
+        with self._lock:
+            for user in users:
+                self.ids.users.intern(user.user_id)
+                self._users[user.user_id] = user
+                
+                # User.teams becomes a view of the reverse index
+                pending_teams = user.teams
+                user.teams = self._user_teams.setdefault(user.user_id, set())
+                for team_id in pending_teams - user.teams:
+                    if team_id not in self._teams:
+                        self.ids.teams.intern(team_id)
+                        self._teams[team_id] = Team(team_id, team_id)
+                    self._add_member(team_id, user.user_id)
+                    touched_teams.add(team_id)
+        return touched_teams
     
     def get_user(self, user_id: str) -> Optional[User]:
         return self._users.get(user_id)
     
-    def add_team(self, team_id: str, user_ids: Set[str]):
-        self._teams[team_id] = user_ids
+    def add_team(self, team_id: str, user_ids: Set[str], name: Optional[str] = None):
+        self.add_teams_bulk({team_id: user_ids}, {team_id: name} if name else None)
+    
+    def add_teams_bulk(self, teams: Dict[str, Set[str]], names: Optional[Dict[str, str]] = None):
+        """Create or replace many teams with their membership, persisting them in one call"""
+        changed_users = self._replace_teams(teams, names or {})
+        if self.storage and teams:
+            self.storage.save_teams([self._teams[team_id] for team_id in teams])
+        if changed_users:
+            self.notify_membership_changed(list(changed_users))
+    
+    def _replace_teams(self, teams: Dict[str, Set[str]], names: Dict[str, str]) -> Set[str]:
+        """Set teams' membership in the index, returning the users whose teams changed"""
+        changed_users = set()
+        with self._lock:
+            for team_id, user_ids in teams.items():
+                team = self._teams.get(team_id)
+                name = names.get(team_id)
+                if team:
+                    changed_users.update(team.member_ids.symmetric_difference(user_ids))
+                    # Replace membership, keeping the reverse index consistent
+                    for user_id in list(team.member_ids):
+                        self._remove_member(team_id, user_id)
+                    if name:
+                        team.name = name
+                else:
+                    self.ids.teams.intern(team_id)
+                    self._teams[team_id] = Team(team_id, name or team_id)
+                    changed_users.update(user_ids)
+                
+                for user_id in user_ids:
+                    self._add_member(team_id, user_id)
+        return changed_users
+    
+    def get_team(self, team_id: str) -> Optional[Team]:
+        return self._teams.get(team_id)
+    
+    def add_member(self, team_id: str, user_id: str) -> bool:
+        """Add a user to a team, updating both sides of the membership index"""
+        with self._lock:
+            if not self._add_member(team_id, user_id):
+                return False
+        self._persist_team(team_id)
+        self.notify_membership_changed([user_id])
+        return True
+    
+    def _add_member(self, team_id: str, user_id: str) -> bool:
+        team = self._teams.get(team_id)
+        if not team:
+            return False
+        
+        team.add_member(user_id)
+        self._user_teams.setdefault(user_id, set()).add(team_id)
+        return True
+    
+    def remove_member(self, team_id: str, user_id: str) -> bool:
+        """Remove a user from a team, updating both sides of the membership index"""
+        with self._lock:
+            if not self._remove_member(team_id, user_id):
+                return False
+        self._persist_team(team_id)
+        self.notify_membership_changed([user_id])
+        return True
+    
+    def _remove_member(self, team_id: str, user_id: str) -> bool:
+        team = self._teams.get(team_id)
+        if not team or user_id not in team.member_ids:
+            return False
+        
+        team.remove_member(user_id)
+        self._user_teams.get(user_id, set()).discard(team_id)
+        return True
     
     def get_user_teams(self, user_id: str) -> Set[str]:
-        teams = set()
-        for team_id, members in self._teams.items():
-            if user_id in members:
-                teams.add(team_id)
-        return teams
+        return set(self._user_teams.get(user_id, ()))
     
     def get_team_members(self, team_id: str) -> Set[str]:
-        return self._teams.get(team_id, set())
+        team = self._teams.get(team_id)
+        return team.member_ids if team else set()
     
     def get_all_users(self) -> List[User]:
         return list(self._users.values())
     
     def get_all_teams(self) -> Dict[str, Set[str]]:
-        return self._teams.copy()
+        return {team_id: team.member_ids for team_id, team in self._teams.items()}
     
     def get_stats(self) -> Dict[str, int]:
         return {
             "total_alerts": len(self._alerts),
             "total_users": len(self._users),
             "total_teams": len(self._teams),
-            "active_alerts": len([a for a in self._alerts.values() if a.is_active and not a.is_expired()])
-        }
\ No newline at end of file
+            "active_alerts": self.get_status_counts()["active"]
+        }
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import List
+import asyncio
 from models.alert import Alert
 from models.user import User
 
@@ -8,16 +10,26 @@ class DeliveryChannel(ABC):
         """Send notification to user"""
         pass
     
+    def send_batch(self, users: List[User], alert: Alert) -> List['DeliveryResult']:
+        """Send notification to many users, returning one result per recipient in order"""
+        return [DeliveryResult(self.send(user, alert), user_id=user.user_id) for user in users]
+    
+    async def send_batch_async(self, users: List[User], alert: Alert) -> List['DeliveryResult']:
+        """Send a batch from an event loop; blocking channels run in the default executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.send_batch, users, alert)
+    
     @abstractmethod
     def get_channel_type(self) -> str:
         """Get the type of delivery channel"""
         pass
 
 class DeliveryResult:
-    def __init__(self, success: bool, message: str = "", delivery_id: str = ""):
+    def __init__(self, success: bool, message: str = "", delivery_id: str = "", user_id: str = ""):
         self.success = success
         self.message = message
         self.delivery_id = delivery_id
+        self.user_id = user_id
     
     def __bool__(self):
         return self.success
@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from typing import Any, Tuple
+import queue
+import threading
+
+class ConnectionPool:
+    """Persistent connections opened lazily up to a fixed size
+
+    Subclasses implement _connect, and _close_connection when closing takes
+    more than close(). Idle connections are reused most recent first; once
+    size connections are open, borrowers wait for one to be released.
+    """
+
+    def __init__(self, size: int = 4):
+        self.size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> Any:
+        raise NotImplementedError
+
+    def _close_connection(self, connection: Any, graceful: bool):
+        connection.close()
+
+    def borrow(self) -> Tuple[Any, bool]:
+        """Take a connection, returning it and whether it was reused from the idle queue"""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if not can_open:
+            return self._idle.get(), True
+        try:
+            return self._connect(), False
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def release(self, connection: Any, broken: bool = False):
+        """Give a borrowed connection back, or close it if it broke"""
+        if not broken:
+            self._idle.put(connection)
+            return
+        with self._lock:
+            self._opened -= 1
+        try:
+            self._close_connection(connection, graceful=False)
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it is discarded instead of returned if it breaks"""
+        connection, _ = self.borrow()
+        try:
+            yield connection
+        except Exception:
+            self.release(connection, broken=True)
+            raise
+        else:
+            self.release(connection)
+
+    def close(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._close_connection(connection, graceful=True)
+            except Exception:
+                pass
+            with self._lock:
+                self._opened -= 1
+
+    def get_open_count(self) -> int:
+        return self._opened
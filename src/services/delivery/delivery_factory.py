@@ -1,15 +1,22 @@
 from services.delivery.base_delivery import DeliveryChannel
 from services.delivery.inapp_delivery import InAppDeliveryChannel
+from services.delivery.email_delivery import EmailDeliveryChannel
+from services.delivery.sms_delivery import SmsDeliveryChannel
 from models.alert import DeliveryType
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class DeliveryFactory:
     _channels = {}
+    _instances = {}  # (delivery_type, config) -> shared channel instance
     
     @classmethod
     def register_channel(cls, delivery_type: DeliveryType, channel_class):
         """Register a new delivery channel"""
         cls._channels[delivery_type] = channel_class
-        print(f"✅ Registered delivery channel: {delivery_type.value} -> {channel_class.__name__}")
+        cls._instances = {key: channel for key, channel in cls._instances.items() if key[0] != delivery_type}
+        logger.debug("✅ Registered delivery channel: %s -> %s", delivery_type.value, channel_class.__name__)
     
     @classmethod
     def create_channel(cls, delivery_type: DeliveryType, **kwargs) -> DeliveryChannel:
@@ -20,6 +27,26 @@ class DeliveryFactory:
         channel_class = cls._channels[delivery_type]
         return channel_class(**kwargs)
     
+    @classmethod
+    def get_channel(cls, delivery_type: DeliveryType, **kwargs) -> DeliveryChannel:
+        """Get a long-lived channel instance, shared per delivery type and configuration"""
+        key = (delivery_type, tuple(sorted(kwargs.items())))
+        try:
+            channel = cls._instances.get(key)
+        except TypeError:
+            # Unhashable configuration cannot be cached
+            return cls.create_channel(delivery_type, **kwargs)
+        
+        if channel is None:
+            channel = cls.create_channel(delivery_type, **kwargs)
+            cls._instances[key] = channel
+        return channel
+    
+    @classmethod
+    def clear_channel_cache(cls):
+        """Drop all cached channel instances"""
+        cls._instances = {}
+    
     @classmethod
     def get_supported_channels(cls):
         """Get list of supported delivery channels"""
@@ -31,4 +58,6 @@ class DeliveryFactory:
         return delivery_type in cls._channels
 
 # Initialize with default channels
-DeliveryFactory.register_channel(DeliveryType.IN_APP, InAppDeliveryChannel)
\ No newline at end of file
+DeliveryFactory.register_channel(DeliveryType.IN_APP, InAppDeliveryChannel)
+DeliveryFactory.register_channel(DeliveryType.EMAIL, EmailDeliveryChannel)
+DeliveryFactory.register_channel(DeliveryType.SMS, SmsDeliveryChannel)
@@ -0,0 +1,195 @@
+from services.delivery.base_delivery import DeliveryChannel, DeliveryResult
+from services.delivery.connection_pool import ConnectionPool
+from models.alert import Alert
+from models.user import User
+from utils.logger import get_logger
+from utils.settings import load_settings
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from email import policy
+from typing import Dict, List, Optional, Tuple
+import smtplib
+import threading
+
+logger = get_logger(__name__)
+
+class SMTPConnectionPool(ConnectionPool):
+    """Pool of persistent SMTP connections, opened lazily up to a fixed size"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        size: int = 4,
+        timeout: float = 10,
+        use_tls: bool = False,
+        username: Optional[str] = None,
+        password: Optional[str] = None
+    ):
+        super().__init__(size)
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.use_tls = use_tls
+        self.username = username
+        self.password = password
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        connection.ehlo()
+        if self.use_tls:
+            connection.starttls()
+            connection.ehlo()
+        if self.username:
+            connection.login(self.username, self.password or "")
+        return connection
+
+    def _close_connection(self, connection: smtplib.SMTP, graceful: bool):
+        if graceful:
+            try:
+                connection.quit()
+                return
+            except Exception:
+                pass
+        connection.close()
+
+class EmailDeliveryChannel(DeliveryChannel):
+    """Email delivery over a pool of persistent SMTP connections
+
+    The message is rendered once per alert; each recipient only gets its own
+    To header prepended to the shared bytes. A batch is spread across the
+    pool so every connection sends many messages back to back.
+    """
+
+    TEMPLATE_CACHE_SIZE = 256
+
+    def __init__(
+        self,
+        delivery_logger=None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        sender: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        timeout: float = 10
+    ):
+        settings = load_settings()
+        self.delivery_logger = delivery_logger
+        self.sender = sender or (settings.EMAIL_SENDER if settings else "alerts@localhost")
+        self.pool = SMTPConnectionPool(
+            host or (settings.SMTP_HOST if settings else "localhost"),
+            port or (settings.SMTP_PORT if settings else 25),
+            size=pool_size or (settings.SMTP_POOL_SIZE if settings else 4),
+            timeout=timeout,
+            use_tls=settings.SMTP_USE_TLS if settings else False,
+            username=settings.SMTP_USERNAME if settings else None,
+            password=settings.SMTP_PASSWORD if settings else None
+        )
+        self._templates: Dict[Tuple, bytes] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def send(self, user: User, alert: Alert) -> bool:
+        return self.send_batch([user], alert)[0].success
+
+    def send_batch(self, users: List[User], alert: Alert) -> List[DeliveryResult]:
+        body = self._render(alert)
+        workers = min(self.pool.size, len(users))
+        if workers <= 1:
+            return self._send_chunk(users, alert, body)
+
+        # Interleave recipients so each connection gets an even share
+        chunks = [users[i::workers] for i in range(workers)]
+        futures = [self._get_executor().submit(self._send_chunk, chunk, alert, body) for chunk in chunks]
+        results_by_user = {}
+        for chunk, future in zip(chunks, futures):
+            try:
+                chunk_results = future.result()
+            except Exception as e:
+                # A failed chunk only fails its own recipients
+                logger.error("❌ Email chunk of %d recipients failed: %s", len(chunk), e)
+                chunk_results = [DeliveryResult(False, str(e), user_id=user.user_id) for user in chunk]
+            for result in chunk_results:
+                results_by_user[result.user_id] = result
+        return [results_by_user[user.user_id] for user in users]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="smtp")
+            return self._executor
+
+    def _render(self, alert: Alert) -> bytes:
+        """Render the shared message bytes for an alert, without a To header"""
+        key = (alert.alert_id, alert.title, alert.message, alert.severity)
+        body = self._templates.get(key)
+        if body is None:
+            message = EmailMessage(policy=policy.SMTP)
+            message["From"] = self.sender
+            message["Subject"] = f"[{alert.severity.value.upper()}] {alert.title}"
+            message["X-Alert-Id"] = alert.alert_id
+            message.set_content(alert.message)
+            body = message.as_bytes()
+
+            if len(self._templates) >= self.TEMPLATE_CACHE_SIZE:
+                self._templates.pop(next(iter(self._templates)))
+            self._templates[key] = body
+        return body
+
+    def _send_chunk(self, users: List[User], alert: Alert, body: bytes) -> List[DeliveryResult]:
+        """Send to users in order; an unexpected error fails only the recipients not yet sent"""
+        results = []
+        try:
+            self._send_pending(users, alert, body, results)
+        except Exception as e:
+            logger.error("❌ Email sending stopped after %d of %d recipients: %s", len(results), len(users), e)
+            results.extend(DeliveryResult(False, str(e), user_id=user.user_id) for user in users[len(results):])
+        return results
+
+    def _send_pending(self, users: List[User], alert: Alert, body: bytes, results: List[DeliveryResult]):
+        # Recipients before users[len(results)] are done
+        retried = False
+
+        while len(results) < len(users):
+            try:
+                with self.pool.connection() as connection:
+                    while len(results) < len(users):
+                        results.append(self._send_one(connection, users[len(results)], alert, body))
+                        retried = False
+            except (smtplib.SMTPException, OSError) as e:
+                # The connection broke; retry the interrupted recipient once on a fresh one
+                if retried:
+                    logger.error("❌ SMTP connection failed: %s", e)
+                    results.extend(DeliveryResult(False, str(e), user_id=user.user_id)
+                                   for user in users[len(results):])
+                    break
+                retried = True
+
+    def _send_one(self, connection: smtplib.SMTP, user: User, alert: Alert, body: bytes) -> DeliveryResult:
+        try:
+            connection.sendmail(self.sender, [user.email], b"To: " + user.email.encode() + b"\r\n" + body)
+        except smtplib.SMTPServerDisconnected:
+            raise
+        except smtplib.SMTPException as e:
+            # The server answered, so the connection is still usable; only this recipient failed
+            connection.rset()
+            logger.warning("⚠️ Email to %s rejected: %s", user.email, e)
+            return DeliveryResult(False, str(e), user_id=user.user_id)
+
+        if self.delivery_logger:
+            self.delivery_logger.log_delivery({
+                'user_id': user.user_id,
+                'alert_id': alert.alert_id,
+                'channel': self.get_channel_type(),
+                'timestamp': 'now'
+            })
+        return DeliveryResult(True, user_id=user.user_id)
+
+    def close(self):
+        """Close pooled connections and worker threads"""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.pool.close()
+
+    def get_channel_type(self) -> str:
+        return "email"
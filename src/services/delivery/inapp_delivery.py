@@ -1,24 +1,45 @@
 from services.delivery.base_delivery import DeliveryChannel, DeliveryResult
 from models.alert import Alert
 from models.user import User
+from typing import List
+from utils.logger import get_logger
+import logging
 import uuid
 
+logger = get_logger(__name__)
+
 class InAppDeliveryChannel(DeliveryChannel):
     def __init__(self, delivery_logger=None):
         self.delivery_logger = delivery_logger
     
     def send(self, user: User, alert: Alert) -> bool:
+        return self._deliver(user, alert, str(uuid.uuid4()))
+    
+    def send_batch(self, users: List[User], alert: Alert) -> List[DeliveryResult]:
+        # One id per batch; recipients are numbered within it
+        batch_id = uuid.uuid4().hex
+        results = []
+        for index, user in enumerate(users):
+            delivery_id = f"{batch_id}-{index}"
+            results.append(DeliveryResult(self._deliver(user, alert, delivery_id), delivery_id=delivery_id, user_id=user.user_id))
+        return results
+    
+    def _deliver(self, user: User, alert: Alert, delivery_id: str) -> bool:
         try:
             # Simulate in-app delivery
-            delivery_id = str(uuid.uuid4())
-            
-            print(f"📱 IN-APP NOTIFICATION [{delivery_id}]")
-            print(f"   To: {user.name} ({user.email})")
-            print(f"   Title: {alert.title}")
-            print(f"   Message: {alert.message}")
-            print(f"   Severity: {alert.severity.value.upper()}")
-            print(f"   Type: {alert.delivery_type.value}")
-            print("   " + "-" * 40)
+            # Formatting the notification block is only paid for at DEBUG
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "📱 IN-APP NOTIFICATION [%s]\n"
+                    "   To: %s (%s)\n"
+                    "   Title: %s\n"
+                    "   Message: %s\n"
+                    "   Severity: %s\n"
+                    "   Type: %s\n"
+                    "   %s",
+                    delivery_id, user.name, user.email, alert.title, alert.message,
+                    alert.severity.value.upper(), alert.delivery_type.value, "-" * 40
+                )
             
             # Log delivery if logger is available
             if self.delivery_logger:
@@ -32,7 +53,7 @@ class InAppDeliveryChannel(DeliveryChannel):
             
             return True
         except Exception as e:
-            print(f"❌ Failed to deliver in-app notification: {e}")
+            logger.error("❌ Failed to deliver in-app notification: %s", e)
             return False
     
     def get_channel_type(self) -> str:
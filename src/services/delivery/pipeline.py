@@ -0,0 +1,192 @@
+import asyncio
+import threading
+from typing import Callable, Dict, List, Optional
+
+from services.delivery.base_delivery import DeliveryChannel, DeliveryResult
+from models.alert import Alert
+from models.user import User
+from utils.logger import get_logger
+from utils.settings import load_settings
+
+logger = get_logger(__name__)
+
+ResultCallback = Callable[[Alert, List[DeliveryResult]], None]
+
+class _DeliveryJob:
+    def __init__(self, channel: DeliveryChannel, alert: Alert, users: List[User],
+                 on_results: Optional[ResultCallback], attempt: int = 1):
+        self.channel = channel
+        self.alert = alert
+        self.users = users
+        self.on_results = on_results
+        self.attempt = attempt
+
+class _TaskJob:
+    def __init__(self, func: Callable, args: tuple):
+        self.func = func
+        self.args = args
+
+class DeliveryPipeline:
+    """Asyncio delivery pipeline drained by a pool of workers on a background loop
+
+    Callers enqueue work and return immediately. Each channel type gets a
+    semaphore that bounds how many of its batches are in flight, and
+    recipients that fail are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        per_channel_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_delay: Optional[float] = None
+    ):
+        settings = load_settings()
+        self.workers = workers or (settings.DELIVERY_WORKERS if settings else 4)
+        self.per_channel_concurrency = per_channel_concurrency or (
+            settings.DELIVERY_CONCURRENCY_PER_CHANNEL if settings else 8)
+        self.batch_size = batch_size or (settings.BATCH_PROCESSING_SIZE if settings else 100)
+        self.max_retries = max_retries if max_retries is not None else (
+            settings.MAX_RETRY_ATTEMPTS if settings else 3)
+        self.retry_delay = retry_delay if retry_delay is not None else (
+            settings.RETRY_DELAY_SECONDS if settings else 30)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._ready = threading.Event()
+        self._lock = threading.Lock()  # serialises start and stop
+
+        # Outstanding jobs, including retries waiting out their backoff; stats share its lock
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._stats = {'submitted': 0, 'delivered': 0, 'failed': 0, 'retried': 0}
+
+    def start(self):
+        """Start the event loop thread and its workers"""
+        with self._lock:
+            if self.is_running():
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run_loop, name="delivery-pipeline", daemon=True)
+            self._thread.start()
+            self._ready.wait()
+        logger.info("✅ Delivery pipeline started with %d workers", self.workers)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Wait for queued work to finish, then stop the workers"""
+        if not self.is_running():
+            return
+        self.wait_until_idle(timeout)
+        with self._lock:
+            if not self.is_running():
+                return
+            for _ in range(self.workers):
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("✅ Delivery pipeline stopped")
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, channel: DeliveryChannel, users: List[User], alert: Alert,
+               on_results: Optional[ResultCallback] = None):
+        """Queue an alert for delivery to users, split into batches"""
+        self.start()
+        for start in range(0, len(users), self.batch_size):
+            batch = users[start:start + self.batch_size]
+            self._count('submitted', len(batch))
+            self._enqueue(_DeliveryJob(channel, alert, batch, on_results))
+
+    def submit_task(self, func: Callable, *args):
+        """Queue a blocking callable, such as an audience fan-out, to run off the caller's thread"""
+        self.start()
+        self._enqueue(_TaskJob(func, args))
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued job and retry has finished"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._idle:
+            return {**self._stats, 'pending': self._pending}
+
+    def _count(self, stat: str, amount: int):
+        with self._idle:
+            self._stats[stat] += amount
+
+    def _enqueue(self, job):
+        with self._idle:
+            self._pending += 1
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+
+    def _finish_job(self):
+        with self._idle:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        workers = [self._loop.create_task(self._worker()) for _ in range(self.workers)]
+        self._ready.set()
+        self._loop.run_until_complete(asyncio.gather(*workers))
+        self._loop.close()
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                return
+            try:
+                if isinstance(job, _TaskJob):
+                    await self._loop.run_in_executor(None, job.func, *job.args)
+                else:
+                    await self._deliver(job)
+            except Exception as e:
+                logger.error("❌ Delivery pipeline job failed: %s", e)
+            finally:
+                self._finish_job()
+
+    async def _deliver(self, job: _DeliveryJob):
+        channel_type = job.channel.get_channel_type()
+        semaphore = self._semaphores.get(channel_type)
+        if semaphore is None:
+            semaphore = self._semaphores[channel_type] = asyncio.Semaphore(self.per_channel_concurrency)
+
+        async with semaphore:
+            try:
+                results = await job.channel.send_batch_async(job.users, job.alert)
+            except Exception as e:
+                logger.error("❌ Failed to deliver batch via %s: %s", channel_type, e)
+                results = [DeliveryResult(False, str(e), user_id=user.user_id) for user in job.users]
+
+        for user, result in zip(job.users, results):
+            result.user_id = result.user_id or user.user_id
+
+        failed_users = [user for user, result in zip(job.users, results) if not result]
+        retry = failed_users and job.attempt <= self.max_retries
+
+        reported = [result for result in results if result] if retry else results
+        self._count('delivered', len(results) - len(failed_users))
+        if not retry:
+            self._count('failed', len(failed_users))
+
+        if retry:
+            delay = self.retry_delay * (2 ** (job.attempt - 1))
+            self._count('retried', len(failed_users))
+            logger.warning("⚠️ Retrying %d %s deliveries in %ss (attempt %d)",
+                           len(failed_users), channel_type, delay, job.attempt + 1)
+            retry_job = _DeliveryJob(job.channel, job.alert, failed_users, job.on_results, job.attempt + 1)
+            with self._idle:
+                self._pending += 1
+            self._loop.call_later(delay, self._queue.put_nowait, retry_job)
+
+        if job.on_results and reported:
+            job.on_results(job.alert, reported)
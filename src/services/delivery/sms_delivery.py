@@ -0,0 +1,202 @@
+from services.delivery.base_delivery import DeliveryChannel, DeliveryResult
+from services.delivery.connection_pool import ConnectionPool
+from models.alert import Alert
+from models.user import User
+from utils.logger import get_logger
+from utils.settings import load_settings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import http.client
+import json
+import threading
+import time
+
+logger = get_logger(__name__)
+
+SMS_MAX_LENGTH = 160
+
+class TokenBucket:
+    """Blocking rate limiter allowing `rate` units per second with a one-second burst"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, count: int = 1):
+        """Take count units, sleeping until the bucket has paid them back"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve up front so concurrent callers queue up behind each other
+            self._tokens -= count
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+class HTTPConnectionPool(ConnectionPool):
+    """Pool of keep-alive HTTP connections to a single host"""
+
+    def __init__(self, url: str, size: int = 4, timeout: float = 10):
+        super().__init__(size)
+        parts = urlsplit(url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or "/"
+        self.timeout = timeout
+
+    def _connect(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def request(self, body: bytes, headers: Dict[str, str]) -> Tuple[int, bytes]:
+        """POST a body, retrying only when it provably never reached the gateway
+
+        Sending an SMS is not idempotent, so the one retry is for a reused
+        keep-alive connection the gateway had already closed: it hangs up
+        without a single response byte. Any other failure, including a reset
+        after the body went out, is raised rather than risking a resend.
+        """
+        for attempt in (1, 2):
+            connection, reused = self.borrow()
+            try:
+                connection.request("POST", self.path, body=body, headers=headers)
+                response = connection.getresponse()
+                status, data = response.status, response.read()
+            except http.client.RemoteDisconnected:
+                self.release(connection, broken=True)
+                if reused and attempt == 1:
+                    continue
+                raise
+            except Exception:
+                self.release(connection, broken=True)
+                raise
+            self.release(connection)
+            return status, data
+
+class SmsDeliveryChannel(DeliveryChannel):
+    """SMS delivery through an HTTP gateway with a bulk JSON API
+
+    Recipients are grouped into bulk requests of up to bulk_size numbers and
+    posted over keep-alive connections. A token bucket holds the channel to
+    rate_limit messages per second across all of its connections.
+
+    The gateway takes ``{"from", "text", "to": [numbers]}`` and answers with
+    ``{"results": [{"to", "status", "id"}]}``, one entry per number.
+    """
+
+    def __init__(
+        self,
+        delivery_logger=None,
+        gateway_url: Optional[str] = None,
+        api_token: Optional[str] = None,
+        sender_id: Optional[str] = None,
+        bulk_size: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        pool_size: Optional[int] = None,
+        timeout: float = 10
+    ):
+        settings = load_settings()
+        self.delivery_logger = delivery_logger
+        self.api_token = api_token or (settings.SMS_GATEWAY_TOKEN if settings else None)
+        self.sender_id = sender_id or (settings.SMS_SENDER_ID if settings else "ALERTS")
+        self.bulk_size = bulk_size or (settings.SMS_BULK_SIZE if settings else 100)
+        rate_limit = rate_limit if rate_limit is not None else (settings.SMS_RATE_LIMIT if settings else 0)
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.pool = HTTPConnectionPool(
+            gateway_url or (settings.SMS_GATEWAY_URL if settings else "http://localhost:8080/messages"),
+            size=pool_size or (settings.SMS_POOL_SIZE if settings else 4),
+            timeout=timeout
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def send(self, user: User, alert: Alert) -> bool:
+        return self.send_batch([user], alert)[0].success
+
+    def send_batch(self, users: List[User], alert: Alert) -> List[DeliveryResult]:
+        results: Dict[str, DeliveryResult] = {}
+        reachable = []
+        for user in users:
+            if user.phone:
+                reachable.append(user)
+            else:
+                results[user.user_id] = DeliveryResult(False, "No phone number", user_id=user.user_id)
+
+        text = self._render(alert)
+        chunks = [reachable[i:i + self.bulk_size] for i in range(0, len(reachable), self.bulk_size)]
+        if len(chunks) == 1:
+            chunk_results = [self._send_chunk(chunks[0], alert, text)]
+        else:
+            executor = self._get_executor()
+            chunk_results = list(executor.map(lambda chunk: self._send_chunk(chunk, alert, text), chunks))
+
+        for batch in chunk_results:
+            for result in batch:
+                results[result.user_id] = result
+        return [results[user.user_id] for user in users]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="sms")
+            return self._executor
+
+    def _render(self, alert: Alert) -> str:
+        text = f"[{alert.severity.value.upper()}] {alert.title}: {alert.message}"
+        return text if len(text) <= SMS_MAX_LENGTH else text[:SMS_MAX_LENGTH - 1] + "…"
+
+    def _send_chunk(self, users: List[User], alert: Alert, text: str) -> List[DeliveryResult]:
+        if self.rate_limiter:
+            self.rate_limiter.acquire(len(users))
+
+        payload = json.dumps({
+            'from': self.sender_id,
+            'text': text,
+            'to': [user.phone for user in users]
+        }).encode()
+        headers = {'Content-Type': 'application/json'}
+        if self.api_token:
+            headers['Authorization'] = f"Bearer {self.api_token}"
+
+        try:
+            status, body = self.pool.request(payload, headers)
+            if status != 200:
+                raise http.client.HTTPException(f"gateway returned HTTP {status}")
+            statuses = {item['to']: item for item in json.loads(body)['results']}
+        except Exception as e:
+            logger.error("❌ SMS gateway request for %d recipients failed: %s", len(users), e)
+            return [DeliveryResult(False, str(e), user_id=user.user_id) for user in users]
+
+        results = []
+        for user in users:
+            item = statuses.get(user.phone, {})
+            if item.get('status') == 'accepted':
+                results.append(DeliveryResult(True, delivery_id=item.get('id', ''), user_id=user.user_id))
+                if self.delivery_logger:
+                    self.delivery_logger.log_delivery({
+                        'user_id': user.user_id,
+                        'alert_id': alert.alert_id,
+                        'channel': self.get_channel_type(),
+                        'timestamp': 'now'
+                    })
+            else:
+                reason = item.get('error', 'rejected by gateway')
+                logger.warning("⚠️ SMS to %s rejected: %s", user.phone, reason)
+                results.append(DeliveryResult(False, reason, user_id=user.user_id))
+        return results
+
+    def close(self):
+        """Close pooled connections and worker threads"""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.pool.close()
+
+    def get_channel_type(self) -> str:
+        return "sms"
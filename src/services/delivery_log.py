@@ -0,0 +1,184 @@
+import mmap
+import struct
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from models.alert import DeliveryType
+from models.notification import NotificationDelivery
+from utils.interner import IdInterner
+from utils.logger import get_logger
+from utils.settings import load_settings
+
+logger = get_logger(__name__)
+
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+# user index, alert index, epoch seconds, channel code, status code
+_RECORD = struct.Struct("<IIdBB")
+_CHANNELS = [delivery_type.value for delivery_type in DeliveryType]
+_STATUSES = [STATUS_SENT, STATUS_FAILED]
+
+class DeliveryLog:
+    """Append-only delivery log stored as fixed-width binary records
+
+    Each delivery is one 18-byte record of interned user and alert ids, a
+    channel code, a status code and an epoch timestamp. The newest records
+    live in memory as a ring of fixed-size segments. Once that ring holds
+    more than ``capacity`` records, the oldest segment is appended to a spill
+    file that is memory-mapped for reads. Aggregate counters are kept as
+    records arrive, so stats never scan the log.
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        segment_size: Optional[int] = None,
+        spill_path: Optional[str] = None,
+        user_ids: Optional[IdInterner] = None,
+        alert_ids: Optional[IdInterner] = None
+    ):
+        settings = load_settings()
+        self.segment_size = segment_size or (settings.DELIVERY_LOG_SEGMENT_SIZE if settings else 65536)
+        capacity = capacity or (settings.DELIVERY_LOG_CAPACITY if settings else 1000000)
+        self.max_segments = max(1, capacity // self.segment_size)
+        self.spill_path = spill_path or (settings.DELIVERY_LOG_SPILL_PATH if settings else None)
+        self.user_ids = user_ids if user_ids is not None else IdInterner()
+        self.alert_ids = alert_ids if alert_ids is not None else IdInterner()
+
+        self._segments: Deque[bytearray] = deque()  # full in-memory segments, oldest first
+        self._current = bytearray(self.segment_size * _RECORD.size)
+        self._current_count = 0
+        self._spare: Optional[bytearray] = None
+
+        self._spill_file = None
+        self._spill_map: Optional[mmap.mmap] = None
+        self._spilled = 0
+
+        self._counts: Dict[Tuple[int, int], int] = {}  # (channel code, status code) -> records
+        self._lock = threading.Lock()
+
+    def append(self, user_id: str, alert_id: str, channel: str, status: str = STATUS_SENT,
+               timestamp: Optional[float] = None):
+        """Record one delivery attempt"""
+        channel_code = _CHANNELS.index(channel)
+        status_code = _STATUSES.index(status)
+        user_index = self.user_ids.intern(user_id)
+        alert_index = self.alert_ids.intern(alert_id)
+
+        with self._lock:
+            _RECORD.pack_into(self._current, self._current_count * _RECORD.size, user_index,
+                              alert_index, timestamp or time.time(), channel_code, status_code)
+            self._current_count += 1
+            key = (channel_code, status_code)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+            if self._current_count == self.segment_size:
+                self._segments.append(self._current)
+                if len(self._segments) >= self.max_segments:
+                    self._spill(self._segments.popleft())
+                self._current = self._spare or bytearray(len(self._current))
+                self._spare = None
+                self._current_count = 0
+
+    def _spill(self, segment: bytearray):
+        """Move a full segment out of memory and into the spill file"""
+        if self._spill_file is None:
+            if self.spill_path:
+                self._spill_file = open(self.spill_path, "w+b")
+            else:
+                self._spill_file = tempfile.TemporaryFile(prefix="delivery-log-")
+        self._spill_file.write(segment)
+        self._spill_file.flush()
+        self._spilled += self.segment_size
+        self._spare = segment  # reuse the buffer for the next segment
+        logger.debug("💾 Spilled %d delivery records (%d on disk)", self.segment_size, self._spilled)
+
+    def _spilled_view(self) -> memoryview:
+        if not self._spilled:
+            return memoryview(b"")
+        size = self._spilled * _RECORD.size
+        if self._spill_map is None or len(self._spill_map) != size:
+            # Readers may still hold views of the old map; it closes once they let go
+            self._spill_map = mmap.mmap(self._spill_file.fileno(), size, access=mmap.ACCESS_READ)
+        return memoryview(self._spill_map)
+
+    def _iter_records(self) -> Iterator[Tuple[int, int, float, int, int]]:
+        """Yield every record, oldest first"""
+        with self._lock:
+            chunks = [self._spilled_view()]
+            chunks.extend(bytes(segment) for segment in self._segments)
+            chunks.append(bytes(self._current[:self._current_count * _RECORD.size]))
+
+        for chunk in chunks:
+            yield from _RECORD.iter_unpack(chunk)
+
+    def _history(self, column: int, index: Optional[int], limit: Optional[int]) -> List[NotificationDelivery]:
+        if index is None:
+            return []
+
+        matches = []
+        for position, record in enumerate(self._iter_records()):
+            if record[column] == index:
+                matches.append((position, record))
+
+        if limit is not None:
+            matches = matches[-limit:] if limit else []
+        return [self._to_delivery(position, record) for position, record in reversed(matches)]
+
+    def _to_delivery(self, position: int, record: Tuple[int, int, float, int, int]) -> NotificationDelivery:
+        user_index, alert_index, timestamp, channel_code, status_code = record
+        return NotificationDelivery(
+            delivery_id=str(position),
+            user_id=self.user_ids.resolve(user_index),
+            alert_id=self.alert_ids.resolve(alert_index),
+            delivery_type=_CHANNELS[channel_code],
+            delivered_at=datetime.fromtimestamp(timestamp),
+            delivery_status=_STATUSES[status_code]
+        )
+
+    def get_user_history(self, user_id: str, limit: Optional[int] = None) -> List[NotificationDelivery]:
+        """Get a user's deliveries, newest first"""
+        return self._history(0, self.user_ids.lookup(user_id), limit)
+
+    def get_alert_history(self, alert_id: str, limit: Optional[int] = None) -> List[NotificationDelivery]:
+        """Get an alert's deliveries, newest first"""
+        return self._history(1, self.alert_ids.lookup(alert_id), limit)
+
+    def count(self, status: Optional[str] = None, channel: Optional[str] = None) -> int:
+        """Count records, optionally filtered by status and channel"""
+        return sum(
+            count for (channel_code, status_code), count in self._counts.items()
+            if (status is None or _STATUSES[status_code] == status)
+            and (channel is None or _CHANNELS[channel_code] == channel)
+        )
+
+    def get_counts_by_channel(self, status: str = STATUS_SENT) -> Dict[str, int]:
+        counts = {}
+        for (channel_code, status_code), count in self._counts.items():
+            if _STATUSES[status_code] == status:
+                counts[_CHANNELS[channel_code]] = counts.get(_CHANNELS[channel_code], 0) + count
+        return counts
+
+    def get_memory_usage(self) -> int:
+        """Bytes held in memory by record buffers"""
+        buffers = len(self._segments) + 1 + (1 if self._spare is not None else 0)
+        return buffers * len(self._current)
+
+    def get_spilled_count(self) -> int:
+        return self._spilled
+
+    def close(self):
+        """Release the spill file"""
+        with self._lock:
+            self._spill_map = None
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._segments) * self.segment_size + self._current_count
@@ -0,0 +1,62 @@
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from models.alert import Severity
+from utils.quantile_sketch import QuantileSketch
+
+READ_LATENCY = "time_to_read"
+SNOOZE_LATENCY = "time_to_snooze"
+_LATENCIES = [READ_LATENCY, SNOOZE_LATENCY]
+QUANTILES = (0.5, 0.95, 0.99)
+
+class EngagementMetrics:
+    """Time-to-read and time-to-snooze distributions per severity and per team
+
+    Each read or snooze transition adds the seconds since the user's
+    first delivery of the alert to one QuantileSketch for the alert's
+    severity and one per team the user belongs to. Overall figures merge
+    the severity sketches. Memory is a bounded sketch per severity and
+    team, whatever the number of preferences.
+    """
+
+    def __init__(self):
+        self._by_severity: Dict[str, Dict[Severity, QuantileSketch]] = {
+            latency: {severity: QuantileSketch() for severity in Severity} for latency in _LATENCIES
+        }
+        self._by_team: Dict[str, Dict[str, QuantileSketch]] = {latency: {} for latency in _LATENCIES}
+        self._lock = threading.Lock()
+
+    def record(self, latency: str, seconds: float, severity: Severity, team_ids: Iterable[str]):
+        """Add one observation of a latency kind (READ_LATENCY or SNOOZE_LATENCY)"""
+        with self._lock:
+            self._by_severity[latency][severity].add(seconds)
+            by_team = self._by_team[latency]
+            for team_id in team_ids:
+                sketch = by_team.get(team_id)
+                if sketch is None:
+                    sketch = by_team[team_id] = QuantileSketch()
+                sketch.add(seconds)
+
+    def record_transition(self, latency: str, delivered_at: Optional[datetime], severity: Severity,
+                          team_ids: Iterable[str], now: Optional[datetime] = None):
+        if delivered_at is not None:
+            seconds = ((now or datetime.now()) - delivered_at).total_seconds()
+            self.record(latency, seconds, severity, team_ids)
+
+    def get_summary(self, latency: str) -> Dict[str, object]:
+        """p50/p95/p99 seconds and counts, overall, per severity and per team"""
+        with self._lock:
+            overall = QuantileSketch()
+            for sketch in self._by_severity[latency].values():
+                overall.merge(sketch)
+            return {
+                'overall': _summarize(overall),
+                'by_severity': {severity.value: _summarize(sketch)
+                                for severity, sketch in self._by_severity[latency].items()},
+                'by_team': {team_id: _summarize(sketch) for team_id, sketch in self._by_team[latency].items()}
+            }
+
+def _summarize(sketch: QuantileSketch) -> Dict[str, object]:
+    p50, p95, p99 = sketch.quantiles(QUANTILES)
+    return {'count': sketch.count, 'p50': p50, 'p95': p95, 'p99': p99}
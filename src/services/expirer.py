@@ -0,0 +1,29 @@
+from typing import Optional
+
+from services.scheduler import Scheduler
+
+class AlertExpirer:
+    """Background task that expires alerts as their expiry time passes"""
+
+    TASK_ID = "alert_expirer"
+
+    def __init__(self, alert_service, scheduler: Optional[Scheduler] = None, interval: int = 60):
+        self.alert_service = alert_service
+        self.scheduler = scheduler or Scheduler()
+        self.interval = interval
+
+    def run_once(self) -> int:
+        """Expire every alert that is past due, returning how many were expired"""
+        return len(self.alert_service.expire_due_alerts())
+
+    def start(self):
+        """Start expiring alerts every interval seconds"""
+        self.scheduler.start_periodic_task(self.TASK_ID, self.interval, self.run_once)
+
+    def stop(self):
+        """Stop the background expirer"""
+        self.scheduler.stop_task(self.TASK_ID)
+
+    def is_running(self) -> bool:
+        """Check if the background expirer is running"""
+        return self.scheduler.is_task_running(self.TASK_ID)
@@ -0,0 +1,341 @@
+import bisect
+import heapq
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models.alert import Alert, Severity, VisibilityType
+from models.notification import NotificationStatus
+from models.user import User
+from services.preference_store import PreferenceStore, PreferenceView, UNREAD, READ, SNOOZED
+
+# Inbox states are the preference statuses plus a snooze that has run out,
+# which the dashboard counts as neither unread nor snoozed
+LAPSED = 3
+_STATE_COUNT = 4
+_STATUS_CODES = {NotificationStatus.UNREAD: UNREAD, NotificationStatus.READ: READ, NotificationStatus.SNOOZED: SNOOZED}
+_SEVERITIES = [Severity.INFO, Severity.WARNING, Severity.CRITICAL]
+_SEVERITY_CODES = {severity: code for code, severity in enumerate(_SEVERITIES)}
+_CRITICAL = _SEVERITY_CODES[Severity.CRITICAL]
+
+# Per-alert flags: initial fan-out has been counted; the alert has left (or never entered) every inbox
+_COUNTED, _REMOVED = 1, 2
+
+class UserInbox:
+    """Counters and short ordered lists for the alerts one user can see
+
+    counts[state][severity] covers every visible alert. recent and critical
+    hold the newest alert indexes in ascending (creation) order, always a
+    newest-first prefix of their set; critical leaves out live snoozes.
+    snoozed maps the live snoozes to their end times, with a heap to lapse
+    them. watermark is one past the newest alert counted when the inbox was
+    built, so fan-out for older alerts is not counted twice.
+    """
+
+    __slots__ = ('counts', 'recent', 'critical', 'snoozed', 'snooze_heap', 'watermark', 'stale')
+
+    def __init__(self, watermark: int):
+        self.counts = [[0] * len(_SEVERITIES) for _ in range(_STATE_COUNT)]
+        self.recent: List[int] = []
+        self.critical: List[int] = []
+        self.snoozed: Dict[int, float] = {}
+        self.snooze_heap: List[tuple] = []  # (snoozed_until, alert index, severity code)
+        self.watermark = watermark
+        self.stale = False
+
+    def total(self) -> int:
+        return sum(map(sum, self.counts))
+
+    def critical_unsnoozed(self) -> int:
+        return sum(self.counts[state][_CRITICAL] for state in (UNREAD, READ, LAPSED))
+
+class InboxIndex:
+    """Per-user dashboard counters kept current from alert and preference events
+
+    A user's inbox is built from one visibility scan the first time their
+    dashboard is read. After that deliveries, reads, unreads, snoozes,
+    expiries and archives adjust it in O(1) per affected user, so reading a
+    dashboard costs the same whatever the inbox size. Rarer events that can
+    change many counts at once (alert updates, membership changes, bulk
+    loads) drop the affected inboxes, which are rebuilt on their next read.
+
+    The recent and critical lists keep twice the number shown so a removal
+    rarely empties them; when one runs short of what the counters say
+    exists, the inbox is marked stale and rebuilt on the next read.
+    """
+
+    RECENT_SIZE = 5
+    LIST_SIZE = 20
+
+    def __init__(self, alert_service, preferences: PreferenceStore):
+        self.alert_service = alert_service
+        self._preferences = preferences
+        self._inboxes: Dict[int, UserInbox] = {}  # user index -> inbox
+        self._flags = np.zeros(0, np.int8)  # alert index -> _COUNTED | _REMOVED
+        self._lock = threading.RLock()
+
+    # Reading
+
+    def get_dashboard(self, user_id: str, now: Optional[datetime] = None) -> Dict[str, object]:
+        """Summary counts plus the recent, critical and snoozed alerts, newest first"""
+        user_index = self._preferences.user_ids.lookup(user_id)
+        if user_index is None or not self.alert_service.get_user(user_id):
+            return self._dashboard(UserInbox(0))
+
+        now_ts = (now or datetime.now()).timestamp()
+        with self._lock:
+            inbox = self._inboxes.get(user_index)
+            if inbox is not None:
+                self._lapse_snoozes(inbox, now_ts)
+            if inbox is None or inbox.stale:
+                inbox = self._build(user_id, user_index, now_ts)
+            return self._dashboard(inbox)
+
+    def _dashboard(self, inbox: UserInbox) -> Dict[str, object]:
+        counts = inbox.counts
+        unsnoozed = [sum(counts[state][code] for state in (UNREAD, READ, LAPSED)) for code in range(len(_SEVERITIES))]
+        resolve = self._resolve_alerts
+        return {
+            'summary': {
+                'total_alerts': inbox.total(),
+                'unread_alerts': sum(counts[UNREAD]),
+                'snoozed_alerts': sum(counts[SNOOZED]),
+                'critical_alerts': unsnoozed[_CRITICAL],
+                'warning_alerts': unsnoozed[_SEVERITY_CODES[Severity.WARNING]],
+                'info_alerts': unsnoozed[_SEVERITY_CODES[Severity.INFO]]
+            },
+            'recent_alerts': resolve(inbox.recent[:-self.RECENT_SIZE - 1:-1]),
+            'critical_alerts': resolve(inbox.critical[:-self.LIST_SIZE - 1:-1]),
+            'snoozed_alerts': resolve(heapq.nlargest(self.LIST_SIZE, inbox.snoozed))
+        }
+
+    def _resolve_alerts(self, alert_indexes: List[int]) -> List[Alert]:
+        resolve, get_alert = self._preferences.alert_ids.resolve, self.alert_service.get_alert
+        return [get_alert(resolve(alert_index)) for alert_index in alert_indexes]
+
+    def _build(self, user_id: str, user_index: int, now_ts: float) -> UserInbox:
+        """Count a user's inbox from scratch with one visibility scan"""
+        alerts = self.alert_service.get_alerts_for_user(user_id)  # creation order
+        lookup = self._preferences.alert_ids.lookup
+        alert_indexes = np.fromiter((lookup(alert.alert_id) for alert in alerts), np.int64, len(alerts))
+        severities = np.fromiter((_SEVERITY_CODES[alert.severity] for alert in alerts), np.int64, len(alerts))
+        status, snoozed_until = self._preferences.lookup_states(user_index, alert_indexes)
+
+        states = status.astype(np.int64)
+        with np.errstate(invalid='ignore'):
+            live = (states == SNOOZED) & (snoozed_until > now_ts)
+        states[(states == SNOOZED) & ~live] = LAPSED
+
+        inbox = UserInbox(int(alert_indexes[-1]) + 1 if len(alerts) else 0)
+        counts = np.bincount(states * len(_SEVERITIES) + severities, minlength=_STATE_COUNT * len(_SEVERITIES))
+        inbox.counts = counts.reshape(_STATE_COUNT, len(_SEVERITIES)).tolist()
+        inbox.recent = alert_indexes[-2 * self.RECENT_SIZE:].tolist()
+        inbox.critical = alert_indexes[(severities == _CRITICAL) & ~live][-2 * self.LIST_SIZE:].tolist()
+        for alert_index, until, severity in zip(alert_indexes[live].tolist(), snoozed_until[live].tolist(),
+                                                severities[live].tolist()):
+            inbox.snoozed[alert_index] = until
+            inbox.snooze_heap.append((until, alert_index, severity))
+        heapq.heapify(inbox.snooze_heap)
+
+        self._inboxes[user_index] = inbox
+        return inbox
+
+    # Events
+
+    def add_alert(self, alert: Alert, audience: List[User]):
+        """Count a newly delivered alert into the built inboxes of its audience"""
+        alert_index = self._preferences.alert_ids.lookup(alert.alert_id)
+        with self._lock:
+            if alert_index is None or self._flag(alert_index) & _REMOVED:
+                return
+            if not alert.is_active or alert.is_expired():
+                # Never visible, so no inbox counts it now or when built; an update can bring it back
+                self._set_flag(alert_index, _REMOVED)
+                return
+            self._set_flag(alert_index, _COUNTED)
+            if not self._inboxes:
+                return
+
+            lookup = self._preferences.user_ids.lookup
+            targets = []
+            for user in audience:
+                user_index = lookup(user.user_id)
+                inbox = self._inboxes.get(user_index)
+                # Inboxes built after the alert already counted it
+                if inbox is not None and alert_index >= inbox.watermark:
+                    targets.append((user_index, inbox))
+            if not targets:
+                return
+
+            now_ts = datetime.now().timestamp()
+            severity = _SEVERITY_CODES[alert.severity]
+            status, snoozed_until = self._preferences.lookup_states([index for index, _ in targets], alert_index)
+            for (_, inbox), code, until in zip(targets, status.tolist(), snoozed_until.tolist()):
+                state = LAPSED if code == SNOOZED and not until > now_ts else code
+                self._add(inbox, alert_index, severity, state, until)
+
+    def remove_alert(self, alert: Alert):
+        """Take an archived or expired alert out of every inbox that counted it"""
+        alert_index = self._preferences.alert_ids.lookup(alert.alert_id)
+        with self._lock:
+            if alert_index is None or self._flag(alert_index) & _REMOVED:
+                return
+            counted = self._flag(alert_index) & _COUNTED
+            self._set_flag(alert_index, _REMOVED)
+            if not self._inboxes:
+                return
+
+            if alert.visibility.type == VisibilityType.ORGANIZATION:
+                candidates = list(self._inboxes.items())
+            else:
+                audience = self.alert_service.get_alert_audience(alert, include_inactive=True)
+                user_indexes = map(self._preferences.user_ids.lookup, (user.user_id for user in audience))
+                candidates = [(user_index, self._inboxes.get(user_index)) for user_index in user_indexes]
+            targets = [(user_index, inbox) for user_index, inbox in candidates
+                       if inbox is not None and (counted or alert_index < inbox.watermark)]
+            if not targets:
+                return
+
+            severity = _SEVERITY_CODES[alert.severity]
+            status, _ = self._preferences.lookup_states([index for index, _ in targets], alert_index)
+            for (_, inbox), code in zip(targets, status.tolist()):
+                self._remove(inbox, alert_index, severity, self._state(inbox, alert_index, code))
+
+    def update_alert(self, alert: Alert):
+        """Drop the inboxes an updated alert appears in; its severity or lifecycle may have changed"""
+        alert_index = self._preferences.alert_ids.lookup(alert.alert_id)
+        with self._lock:
+            if alert_index is None:
+                return
+            visible = alert.is_active and not alert.is_expired()
+            self._set_flag(alert_index, _COUNTED if visible else _REMOVED, clear=True)
+            if alert.visibility.type == VisibilityType.ORGANIZATION:
+                self._inboxes.clear()
+            else:
+                self.invalidate(user.user_id for user in self.alert_service.get_alert_audience(alert, include_inactive=True))
+
+    def update_state(self, preference: PreferenceView, previous: NotificationStatus):
+        """Move a preference between states after a read, unread or snooze"""
+        with self._lock:
+            inbox = self._inboxes.get(preference.user_index)
+            if inbox is None:
+                return
+            alert_index = preference.alert_index
+            flags = self._flag(alert_index)
+            if not (flags & _COUNTED or alert_index < inbox.watermark) or flags & _REMOVED:
+                return
+            # Lifecycle is left to the flags: an alert past its expiry stays counted until its expired event
+            alert = self.alert_service.get_alert(preference.alert_id)
+            if not alert or not self.alert_service.can_user_see(preference.user_id, preference.alert_id,
+                                                                include_inactive=True):
+                return
+
+            now_ts = datetime.now().timestamp()
+            self._lapse_snoozes(inbox, now_ts)
+            old = self._state(inbox, alert_index, _STATUS_CODES[previous])
+            new = _STATUS_CODES[preference.status]
+            until = preference.snoozed_until.timestamp() if preference.snoozed_until else np.nan
+            if new == SNOOZED and not until > now_ts:
+                new = LAPSED
+
+            severity = _SEVERITY_CODES[alert.severity]
+            if old == SNOOZED:
+                del inbox.snoozed[alert_index]
+            if new == SNOOZED:
+                inbox.snoozed[alert_index] = until
+                heapq.heappush(inbox.snooze_heap, (until, alert_index, severity))
+            self._move(inbox, alert_index, severity, old, new)
+
+    def invalidate(self, user_ids):
+        """Forget users' inboxes so they are rebuilt on their next read"""
+        lookup = self._preferences.user_ids.lookup
+        with self._lock:
+            for user_id in user_ids:
+                self._inboxes.pop(lookup(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._inboxes.clear()
+
+    def __len__(self) -> int:
+        return len(self._inboxes)
+
+    # Bookkeeping
+
+    def _flag(self, alert_index: int) -> int:
+        return int(self._flags[alert_index]) if alert_index < len(self._flags) else 0
+
+    def _set_flag(self, alert_index: int, flag: int, clear: bool = False):
+        if alert_index >= len(self._flags):
+            grown = np.zeros(max(alert_index + 1, 2 * len(self._flags)), np.int8)
+            grown[:len(self._flags)] = self._flags
+            self._flags = grown
+        self._flags[alert_index] = flag if clear else self._flags[alert_index] | flag
+
+    @staticmethod
+    def _state(inbox: UserInbox, alert_index: int, status_code: int) -> int:
+        """A preference's state as this inbox counts it; lapsed snoozes have left inbox.snoozed"""
+        if status_code == SNOOZED and alert_index not in inbox.snoozed:
+            return LAPSED
+        return status_code
+
+    def _lapse_snoozes(self, inbox: UserInbox, now_ts: float):
+        heap = inbox.snooze_heap
+        while heap and heap[0][0] <= now_ts:
+            until, alert_index, severity = heapq.heappop(heap)
+            if inbox.snoozed.get(alert_index) == until:  # otherwise superseded
+                del inbox.snoozed[alert_index]
+                self._move(inbox, alert_index, severity, SNOOZED, LAPSED)
+
+    def _add(self, inbox: UserInbox, alert_index: int, severity: int, state: int, until: float):
+        total, critical = inbox.total(), inbox.critical_unsnoozed()
+        inbox.counts[state][severity] += 1
+        _insert(inbox.recent, alert_index, 2 * self.RECENT_SIZE, len(inbox.recent) >= total)
+        if severity == _CRITICAL and state != SNOOZED:
+            _insert(inbox.critical, alert_index, 2 * self.LIST_SIZE, len(inbox.critical) >= critical)
+        if state == SNOOZED:
+            inbox.snoozed[alert_index] = until
+            heapq.heappush(inbox.snooze_heap, (until, alert_index, severity))
+
+    def _remove(self, inbox: UserInbox, alert_index: int, severity: int, state: int):
+        inbox.counts[state][severity] -= 1
+        inbox.snoozed.pop(alert_index, None)
+        if _discard(inbox.recent, alert_index) and len(inbox.recent) < min(self.RECENT_SIZE, inbox.total()):
+            inbox.stale = True
+        if _discard(inbox.critical, alert_index) and len(inbox.critical) < min(self.LIST_SIZE, inbox.critical_unsnoozed()):
+            inbox.stale = True
+
+    def _move(self, inbox: UserInbox, alert_index: int, severity: int, old: int, new: int):
+        if old == new:
+            return
+        critical = inbox.critical_unsnoozed()
+        inbox.counts[old][severity] -= 1
+        inbox.counts[new][severity] += 1
+        if severity != _CRITICAL or (old == SNOOZED) == (new == SNOOZED):
+            return
+        if new == SNOOZED:
+            if _discard(inbox.critical, alert_index) and len(inbox.critical) < min(self.LIST_SIZE, critical - 1):
+                inbox.stale = True
+        else:
+            _insert(inbox.critical, alert_index, 2 * self.LIST_SIZE, len(inbox.critical) >= critical)
+
+def _insert(ordered: List[int], alert_index: int, capacity: int, complete: bool):
+    """Insert into a newest-first prefix list, keeping it a prefix
+
+    An alert older than everything held only belongs when the list already
+    holds the whole set (complete); otherwise newer alerts are missing
+    between them.
+    """
+    if complete or (ordered and alert_index > ordered[0]):
+        bisect.insort(ordered, alert_index)
+        if len(ordered) > capacity:
+            del ordered[0]
+
+def _discard(ordered: List[int], alert_index: int) -> bool:
+    position = bisect.bisect_left(ordered, alert_index)
+    if position < len(ordered) and ordered[position] == alert_index:
+        del ordered[position]
+        return True
+    return False
@@ -0,0 +1,117 @@
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from models.alert import Alert, Severity, VisibilityType
+from patterns.observer import AlertObserver
+from utils.logger import get_logger
+from utils.space_saving import SpaceSaving
+
+logger = get_logger(__name__)
+
+_SEVERITIES = list(Severity)
+_SEVERITY_CODES = {severity: code for code, severity in enumerate(_SEVERITIES)}
+_UNSEEN = -1
+
+class MetricsAggregator(AlertObserver):
+    """Running alert counts for the admin and analytics APIs
+
+    Counts by severity and visibility are adjusted in O(1) per alert event,
+    so reading them never walks the alert dict. The busiest creators and
+    most targeted teams are Space-Saving counters over TOP_K_CAPACITY
+    entries: exact until that many distinct ids appear, then bounded in
+    memory with a per-entry overcount bound. Status counts come from
+    AlertService's lifecycle sets, which it already keeps current.
+    Alerts restored with load_from_storage raise no events, so call
+    rebuild() after loading if the aggregator was created first.
+    """
+
+    TOP_K_CAPACITY = 100
+
+    def __init__(self, alert_service):
+        self.alert_service = alert_service
+        self._lock = threading.Lock()
+        self.rebuild()
+        alert_service.add_observer(self)
+
+    def rebuild(self):
+        """Recount from the alerts the service holds now, in one pass"""
+        with self._lock:
+            self._total = 0
+            self._severity_counts = [0] * len(_SEVERITIES)
+            self._visibility_counts: Dict[VisibilityType, int] = {vt: 0 for vt in VisibilityType}
+            self._creators = SpaceSaving(self.TOP_K_CAPACITY)
+            self._targeted_teams = SpaceSaving(self.TOP_K_CAPACITY)
+            # Last severity counted per alert index, so updates can move the count
+            self._severities = np.full(max(16, len(self.alert_service.ids.alerts)), _UNSEEN, np.int8)
+            for alert in self.alert_service.list_all_alerts():
+                self._count(alert)
+        logger.debug("📊 Metrics rebuilt over %d alerts", self._total)
+
+    def on_alert_created(self, alert: Alert):
+        with self._lock:
+            self._count(alert)
+
+    def on_alerts_created(self, alerts: List[Alert]):
+        with self._lock:
+            for alert in alerts:
+                self._count(alert)
+
+    def on_alert_updated(self, alert: Alert):
+        alert_index = self.alert_service.ids.alerts.lookup(alert.alert_id)
+        with self._lock:
+            if alert_index is None or alert_index >= len(self._severities):
+                return
+            previous = int(self._severities[alert_index])
+            current = _SEVERITY_CODES[alert.severity]
+            if previous != _UNSEEN and previous != current:
+                self._severity_counts[previous] -= 1
+                self._severity_counts[current] += 1
+                self._severities[alert_index] = current
+
+    def on_alert_archived(self, alert: Alert):
+        pass  # status counts are read from the service's lifecycle sets
+
+    def _count(self, alert: Alert):
+        alert_index = self.alert_service.ids.alerts.lookup(alert.alert_id)
+        if alert_index is None:
+            return
+        if alert_index >= len(self._severities):
+            grown = np.full(max(alert_index + 1, 2 * len(self._severities)), _UNSEEN, np.int8)
+            grown[:len(self._severities)] = self._severities
+            self._severities = grown
+        elif self._severities[alert_index] != _UNSEEN:
+            return  # already counted, e.g. by rebuild racing the event
+
+        code = _SEVERITY_CODES[alert.severity]
+        self._severities[alert_index] = code
+        self._total += 1
+        self._severity_counts[code] += 1
+        self._visibility_counts[alert.visibility.type] += 1
+        self._creators.add(alert.created_by)
+        if alert.visibility.type == VisibilityType.TEAM:
+            for team_id in alert.visibility.target_ids:
+                self._targeted_teams.add(team_id)
+
+    def total_alerts(self) -> int:
+        return self._total
+
+    def get_status_counts(self) -> Dict[str, int]:
+        return self.alert_service.get_status_counts()
+
+    def get_severity_counts(self) -> Dict[str, int]:
+        return {severity.value: self._severity_counts[code] for code, severity in enumerate(_SEVERITIES)}
+
+    def get_visibility_counts(self) -> Dict[str, int]:
+        return {vt.value: count for vt, count in self._visibility_counts.items()}
+
+    def get_top_creators(self, limit: int = 5) -> List[Tuple[str, int, int]]:
+        """(creator, alert count, possible overcount) for the busiest creators, most alerts first"""
+        with self._lock:
+            return self._creators.top(limit)
+
+    def get_top_teams(self, limit: int = 5) -> List[Tuple[str, int, int]]:
+        """(team, team-targeted alert count, possible overcount) for the most targeted teams"""
+        with self._lock:
+            return self._targeted_teams.top(limit)
@@ -1,128 +1,327 @@
-from typing import Dict, List, Optional
-from datetime import datetime
-import uuid
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import threading
+
+import numpy as np
 
 from models.alert import Alert
 from models.user import User
-from models.notification import UserAlertPreference, NotificationStatus, NotificationDelivery
+from models.notification import NotificationStatus, NotificationDelivery
+from services.activity_series import ActivitySeries, CREATED, DELIVERED, READ, SNOOZED
+from services.delivery.base_delivery import DeliveryResult
 from services.delivery.delivery_factory import DeliveryFactory
+from services.delivery.pipeline import DeliveryPipeline
+from services.delivery_log import DeliveryLog, STATUS_SENT, STATUS_FAILED
+from services.engagement_metrics import EngagementMetrics, READ_LATENCY, SNOOZE_LATENCY
+from services.inbox_index import InboxIndex
+from services.preference_store import PreferenceStore, PreferenceView
+from services.reminder_queue import ReminderQueue
 from patterns.observer import AlertObserver
+from storage.base_storage import StorageBackend, PreferenceRecord, DeliveryRecord
+from utils.keyset import AlertKey
+from utils.space_saving import SpaceSaving
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class NotificationService(AlertObserver):
-    def __init__(self, alert_service, delivery_logger=None):
+    def __init__(self, alert_service, delivery_logger=None, pipeline: Optional[DeliveryPipeline] = None,
+                 storage: Optional[StorageBackend] = None):
         self.alert_service = alert_service
         self.alert_service.add_observer(self)
-        self._user_preferences: Dict[str, Dict[str, UserAlertPreference]] = {}  # user_id -> {alert_id -> preference}
-        self._delivery_log: List[NotificationDelivery] = []
+        # Preferences, reminders and the delivery log are keyed by the alert service's interned ids
+        ids = alert_service.ids
+        self._preferences = PreferenceStore(ids.users, ids.alerts)
+        self._reminders = ReminderQueue()
+        self._delivery_log = DeliveryLog(user_ids=ids.users, alert_ids=ids.alerts)
+        self._inboxes = InboxIndex(alert_service, self._preferences)
         self.delivery_logger = delivery_logger
+        # With a pipeline, fan-out and sends happen off the caller's thread
+        self.pipeline = pipeline
+        # Preference changes and deliveries are written through in batches when a backend is set
+        self.storage = storage or alert_service.storage
+        # Minute/hour/day counts of creations, deliveries, reads and snoozes for trends
+        self._activity = ActivitySeries()
+        # Alerts created before this are counted from their created_at on load_from_storage
+        self._started_at = datetime.now()
+        self._engagement = EngagementMetrics()
+        self._top_recipients = SpaceSaving(100)  # users receiving the most deliveries
+        self._lock = threading.RLock()
+        # Reminder frequency in seconds per alert that can still remind, kept current by alert events
+        self._frequencies: Dict[str, float] = {}
+        self._rebuild_frequencies()
     
     def on_alert_created(self, alert: Alert):
-        print(f"📢 Notification: New alert created - '{alert.title}'")
-        self._create_preferences_for_alert(alert)
-        self._deliver_initial_notifications(alert)
+        logger.info("📢 Notification: New alert created - '%s'", alert.title)
+        self._track_frequency(alert)
+        self._activity.record(CREATED, alert.created_at.timestamp())
+        if self.pipeline:
+            self.pipeline.submit_task(self._fan_out, alert)
+        else:
+            self._fan_out(alert)
+    
+    def on_alerts_created(self, alerts: List[Alert]):
+        logger.info("📢 Notification: %d new alerts created", len(alerts))
+        for alert in alerts:
+            self._track_frequency(alert)
+        self._activity.record_many(CREATED, [alert.created_at.timestamp() for alert in alerts])
+        if self.pipeline:
+            self.pipeline.submit_task(self._fan_out_many, alerts)
+        else:
+            self._fan_out_many(alerts)
+    
+    def _fan_out_many(self, alerts: List[Alert]):
+        """Fan out a batch: every audience resolved and every preference created in one pass"""
+        audiences = self.alert_service.get_alert_audiences(alerts)
+        user_ids, alert_ids = [], []
+        for alert, audience in zip(alerts, audiences):
+            user_ids.extend(user.user_id for user in audience)
+            alert_ids.extend([alert.alert_id] * len(audience))
+        rows, created = self._preferences.get_or_create_pairs(user_ids, alert_ids)
+        self._persist_preferences(rows[created])
+        
+        for alert, audience in zip(alerts, audiences):
+            self._inboxes.add_alert(alert, audience)
+            self._deliver_initial_notifications(alert, audience)
+    
+    def _fan_out(self, alert: Alert):
+        # Resolve the audience once and share it between both passes
+        audience = self._get_eligible_users_for_alert(alert)
+        self._create_preferences_for_alert(alert, audience)
+        self._inboxes.add_alert(alert, audience)
+        self._deliver_initial_notifications(alert, audience)
     
     def on_alert_updated(self, alert: Alert):
-        print(f"📢 Notification: Alert updated - '{alert.title}'")
+        logger.info("📢 Notification: Alert updated - '%s'", alert.title)
+        self._track_frequency(alert)
+        self._inboxes.update_alert(alert)
         # Re-deliver to relevant users if needed
         if alert.is_active and not alert.is_expired():
             self._deliver_to_eligible_users(alert)
+            # Frequency or reminders_enabled may have changed
+            self._reschedule_alert_reminders(alert)
     
     def on_alert_archived(self, alert: Alert):
-        print(f"📢 Notification: Alert archived - '{alert.title}'")
+        logger.info("📢 Notification: Alert archived - '%s'", alert.title)
+        self._track_frequency(alert)
+        self._inboxes.remove_alert(alert)
+        self._cancel_alert_reminders(alert)
     
-    def _create_preferences_for_alert(self, alert: Alert):
-        # Create preferences for all eligible users
-        eligible_users = self._get_eligible_users_for_alert(alert)
-        for user in eligible_users:
-            self.get_or_create_preference(user.user_id, alert.alert_id)
+    def on_alert_expired(self, alert: Alert):
+        logger.info("📢 Notification: Alert expired - '%s'", alert.title)
+        self._track_frequency(alert)
+        self._inboxes.remove_alert(alert)
+        self._cancel_alert_reminders(alert)
+    
+    def on_membership_changed(self, user_ids: List[str]):
+        # Which alerts these users see may have changed; their dashboards are recounted on next read
+        self._inboxes.invalidate(user_ids)
+    
+    def _create_preferences_for_alert(self, alert: Alert, eligible_users: List[User]):
+        # Create preferences for all eligible users in one block; initial delivery schedules their reminders
+        rows, created = self._preferences.get_or_create_rows([user.user_id for user in eligible_users], alert.alert_id)
+        self._persist_preferences(rows[created])
     
     def _get_eligible_users_for_alert(self, alert: Alert) -> List[User]:
-        eligible_users = []
-        all_users = self.alert_service.get_all_users()
-        
-        for user in all_users:
-            user_teams = self.alert_service.get_user_teams(user.user_id)
-            if alert.is_visible_to_user(user, user_teams):
-                eligible_users.append(user)
-        
-        return eligible_users
+        return self.alert_service.get_alert_audience(alert)
     
-    def _deliver_initial_notifications(self, alert: Alert):
-        eligible_users = self._get_eligible_users_for_alert(alert)
-        for user in eligible_users:
-            self.deliver_notification(user, alert, is_initial=True)
+    def _deliver_initial_notifications(self, alert: Alert, eligible_users: List[User]):
+        self.deliver_notifications(eligible_users, alert, is_initial=True)
     
     def _deliver_to_eligible_users(self, alert: Alert):
         eligible_users = self._get_eligible_users_for_alert(alert)
-        for user in eligible_users:
-            self.deliver_notification(user, alert)
+        self.deliver_notifications(eligible_users, alert)
     
-    def get_or_create_preference(self, user_id: str, alert_id: str) -> UserAlertPreference:
-        if user_id not in self._user_preferences:
-            self._user_preferences[user_id] = {}
-        
-        if alert_id not in self._user_preferences[user_id]:
-            self._user_preferences[user_id][alert_id] = UserAlertPreference(user_id, alert_id)
-        
-        return self._user_preferences[user_id][alert_id]
+    def get_or_create_preference(self, user_id: str, alert_id: str) -> PreferenceView:
+        return self._get_or_create_preference(user_id, alert_id)
+    
+    def _get_or_create_preference(self, user_id: str, alert_id: str, schedule: bool = True) -> PreferenceView:
+        with self._lock:
+            preference, created = self._preferences.get_or_create(user_id, alert_id)
+            if created and schedule:
+                self._schedule_reminder(preference)
+            return preference
     
-    def get_user_preference(self, user_id: str, alert_id: str) -> Optional[UserAlertPreference]:
-        user_prefs = self._user_preferences.get(user_id, {})
-        return user_prefs.get(alert_id)
+    def get_user_preference(self, user_id: str, alert_id: str) -> Optional[PreferenceView]:
+        return self._preferences.get(user_id, alert_id)
     
     def mark_as_read(self, user_id: str, alert_id: str):
         preference = self.get_or_create_preference(user_id, alert_id)
-        preference.mark_read()
-        print(f"📖 User {user_id} marked alert '{alert_id}' as read")
+        with self._lock:
+            previous = preference.status
+            preference.mark_read()
+            self._inboxes.update_state(preference, previous)
+        # Like snoozes, only reads of alerts the user can see count towards activity and latency
+        if previous != NotificationStatus.READ and self.alert_service.can_user_see(user_id, alert_id):
+            self._activity.record(READ)
+            self._record_latency(READ_LATENCY, preference, preference.read_at)
+        self._persist_preferences([preference.row])
+        self._reminders.cancel(preference.user_index, preference.alert_index)
+        logger.debug("📖 User %s marked alert '%s' as read", user_id, alert_id)
     
     def mark_as_unread(self, user_id: str, alert_id: str):
         preference = self.get_or_create_preference(user_id, alert_id)
-        preference.mark_unread()
-        print(f"📖 User {user_id} marked alert '{alert_id}' as unread")
+        with self._lock:
+            previous = preference.status
+            preference.mark_unread()
+            self._inboxes.update_state(preference, previous)
+        self._persist_preferences([preference.row])
+        self._schedule_reminder(preference)
+        logger.debug("📖 User %s marked alert '%s' as unread", user_id, alert_id)
     
     def snooze_alert(self, user_id: str, alert_id: str):
         preference = self.get_or_create_preference(user_id, alert_id)
-        preference.snooze_until_tomorrow()
-        print(f"⏰ User {user_id} snoozed alert '{alert_id}' until tomorrow")
+        with self._lock:
+            previous = preference.status
+            # A live snooze already runs until tomorrow, so snoozing again changes nothing
+            was_snoozed = preference.is_snoozed()
+            preference.snooze_until_tomorrow()
+            self._inboxes.update_state(preference, previous)
+        if not was_snoozed and self.alert_service.can_user_see(user_id, alert_id):
+            self._activity.record(SNOOZED)
+            if previous != NotificationStatus.SNOOZED:
+                self._record_latency(SNOOZE_LATENCY, preference)
+        self._persist_preferences([preference.row])
+        self._schedule_reminder(preference)
+        logger.debug("⏰ User %s snoozed alert '%s' until tomorrow", user_id, alert_id)
+    
+    def _record_latency(self, latency: str, preference: PreferenceView, now: Optional[datetime] = None):
+        """Time since the first delivery, or since the alert reached the inbox if none succeeded"""
+        alert = self.alert_service.get_alert(preference.alert_id)
+        if alert:
+            self._engagement.record_transition(
+                latency, preference.first_delivered_at or preference.created_at, alert.severity,
+                self.alert_service.get_user_teams(preference.user_id), now)
     
     def deliver_notification(self, user: User, alert: Alert, is_initial: bool = False) -> bool:
+        return self.deliver_notifications([user], alert, is_initial=is_initial) == 1
+    
+    def deliver_notifications(self, users: List[User], alert: Alert, is_initial: bool = False) -> int:
+        """Deliver an alert to many users through one channel call
+
+        Returns the number sent, or with a pipeline the number queued.
+        """
         if alert.is_expired() or not alert.is_active:
-            return False
+            return 0
         
-        preference = self.get_or_create_preference(user.user_id, alert.alert_id)
+        rows, created = self._preferences.get_or_create_rows([user.user_id for user in users], alert.alert_id)
+        self._persist_preferences(rows[created])
         
         # For initial delivery, always send regardless of reminder timing
-        if not is_initial and not preference.should_remind(alert.reminder_frequency):
-            return False
+        if is_initial:
+            recipients = list(users)
+        else:
+            due = self._preferences.should_remind_mask(rows, alert.reminder_frequency * 60)
+            recipients = [user for user, is_due in zip(users, due.tolist()) if is_due]
+            self._schedule_rows(rows[~due], alert)
+        
+        if not recipients:
+            return 0
+        
+        delivery_channel = DeliveryFactory.get_channel(
+            alert.delivery_type,
+            delivery_logger=self.delivery_logger
+        )
+        
+        if self.pipeline:
+            # Bookkeeping happens in _record_delivery_results once sends finish
+            self.pipeline.submit(delivery_channel, recipients, alert, self._record_delivery_results)
+            return len(recipients)
         
-        # Create delivery channel
         try:
-            delivery_channel = DeliveryFactory.create_channel(
-                alert.delivery_type,
-                delivery_logger=self.delivery_logger
-            )
+            results = delivery_channel.send_batch(recipients, alert)
+        except Exception as e:
+            logger.error("❌ Failed to deliver notification: %s", e)
+            results = [DeliveryResult(False, str(e), user_id=user.user_id) for user in recipients]
+        
+        self._record_delivery_results(alert, results)
+        return sum(1 for result in results if result)
+    
+    def _record_delivery_results(self, alert: Alert, results: List[DeliveryResult]):
+        """Update preferences, reminders and the delivery log for finished sends"""
+        delivery_type = alert.delivery_type.value
+        with self._lock:
+            rows = self._preferences.find_rows([result.user_id for result in results], alert.alert_id)
+            sent = np.array([bool(result) for result in results], bool)
+            known = rows >= 0
+            self._preferences.mark_reminded(rows[known & sent])
+            self._persist_preferences(rows[known & sent])
+            self._activity.record(DELIVERED, count=int(np.count_nonzero(known & sent)))
             
-            success = delivery_channel.send(user, alert)
-            if success:
-                preference.update_reminder_time()
-                self._log_delivery(user.user_id, alert.alert_id, alert.delivery_type.value)
+            deliveries = []
+            for result, is_known in zip(results, known.tolist()):
+                if is_known:
+                    status = STATUS_SENT if result else STATUS_FAILED
+                    self._log_delivery(result.user_id, alert.alert_id, delivery_type, status)
+                    deliveries.append((result.user_id, status))
+                    if result:
+                        self._top_recipients.add(result.user_id)
+            if self.storage and deliveries:
+                now = datetime.now().timestamp()
+                self.storage.append_deliveries([
+                    DeliveryRecord(user_id, alert.alert_id, delivery_type, status, now)
+                    for user_id, status in deliveries
+                ])
             
-            return success
-        except Exception as e:
-            print(f"❌ Failed to deliver notification: {e}")
-            return False
-    
-    def _log_delivery(self, user_id: str, alert_id: str, delivery_type: str):
-        delivery = NotificationDelivery(
-            delivery_id=str(uuid.uuid4()),
-            user_id=user_id,
-            alert_id=alert_id,
-            delivery_type=delivery_type
-        )
-        self._delivery_log.append(delivery)
+            # Failed sends stay due and are retried on the next tick
+            self._schedule_rows(rows[known], alert)
+    
+    def _persist_preferences(self, rows):
+        """Write preference rows to the storage backend as one batch"""
+        if self.storage and len(rows):
+            records = self._preferences.to_records(np.asarray(rows, np.int64))
+            self.storage.save_preferences([PreferenceRecord._make(record) for record in records])
+    
+    def load_from_storage(self) -> int:
+        """Bulk-load preferences from the storage backend and rebuild the reminder queue
+
+        Load the alert service first so reminder frequencies are known and
+        the alerts it restored are counted in the creation series.
+        """
+        if not self.storage:
+            return 0
+        with self._lock:
+            count = self.storage.load_preference_store(self._preferences)
+        # Loaded alerts raise no created events; later ones were already recorded by theirs
+        self._activity.record_many(CREATED, [alert.created_at.timestamp()
+                                             for alert in self.alert_service.alerts_between(end=self._started_at)])
+        self._rebuild_frequencies()
+        self._inboxes.clear()
+        self.rebuild_reminders()
+        logger.info("✅ Loaded %d preferences from storage", count)
+        return count
+    
+    def export_preferences(self) -> Dict[str, object]:
+        """Preference columns plus the id lists their indexes point into, for snapshots"""
+        return {
+            'columns': self._preferences.export_columns(),
+            'user_ids': list(self._preferences.user_ids),
+            'alert_ids': list(self._preferences.alert_ids)
+        }
+    
+    def _log_delivery(self, user_id: str, alert_id: str, delivery_type: str, status: str = STATUS_SENT):
+        self._delivery_log.append(user_id, alert_id, delivery_type, status)
+    
+    def get_user_delivery_history(self, user_id: str, limit: Optional[int] = None) -> List[NotificationDelivery]:
+        """Get deliveries made to a user, newest first"""
+        return self._delivery_log.get_user_history(user_id, limit)
+    
+    def get_alert_delivery_history(self, alert_id: str, limit: Optional[int] = None) -> List[NotificationDelivery]:
+        """Get deliveries made for an alert, newest first"""
+        return self._delivery_log.get_alert_history(alert_id, limit)
     
-    def get_user_alerts_with_preferences(self, user_id: str) -> List[dict]:
-        alerts = self.alert_service.get_alerts_for_user(user_id)
+    def get_user_alerts_with_preferences(
+        self,
+        user_id: str,
+        before: Optional[AlertKey] = None,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """Visible alerts with the user's preferences, newest first by (created_at, alert_id)
+
+        Pass before/limit to read one keyset page; preferences are only
+        looked up for the alerts on it.
+        """
+        alerts = self.alert_service.get_alerts_page_for_user(user_id, before, limit)
         result = []
         
         for alert in alerts:
@@ -135,32 +334,171 @@ class NotificationService(AlertObserver):
                 'last_reminded': preference.last_reminded_at
             })
         
-        # Sort by creation date (newest first)
-        result.sort(key=lambda x: x['alert'].created_at, reverse=True)
         return result
     
+    def get_user_dashboard(self, user_id: str) -> Dict[str, object]:
+        """Dashboard counts and short alert lists from the user's maintained inbox
+
+        Returns 'summary' counts plus 'recent_alerts', 'critical_alerts' and
+        'snoozed_alerts' as Alert lists, newest first and capped at
+        InboxIndex.RECENT_SIZE / LIST_SIZE. Cost does not grow with the inbox.
+        """
+        self.alert_service.expire_due_alerts()
+        return self._inboxes.get_dashboard(user_id)
+    
+    def _next_reminder_time(self, preference: PreferenceView, reminder_frequency: int) -> Optional[datetime]:
+        """Earliest time at which should_remind can become true again"""
+        if preference.status == NotificationStatus.READ:
+            return None
+        
+        due = datetime.now()
+        if preference.last_reminded_at:
+            due = preference.last_reminded_at + timedelta(minutes=reminder_frequency)
+        if preference.is_snoozed():
+            due = max(due, preference.snoozed_until)
+        return due
+    
+    def _schedule_reminder(self, preference: PreferenceView, alert: Optional[Alert] = None):
+        """Put a preference's next reminder on the reminder queue"""
+        alert = alert or self.alert_service.get_alert(preference.alert_id)
+        due = self._next_reminder_time(preference, alert.reminder_frequency) if alert else None
+        
+        if due is None:
+            self._reminders.cancel(preference.user_index, preference.alert_index)
+        else:
+            self._reminders.schedule(preference.user_index, preference.alert_index, due)
+    
+    def _schedule_rows(self, rows: np.ndarray, alert: Alert):
+        """Put the next reminders for many preference rows of one alert on the queue"""
+        if not len(rows):
+            return
+        due_times = self._preferences.next_reminder_times(rows, alert.reminder_frequency * 60)
+        user_indexes = self._preferences.user_indexes(rows)
+        alert_index = self._preferences.alert_ids.lookup(alert.alert_id)
+        scheduled = ~np.isnan(due_times)
+        
+        self._reminders.schedule_many(
+            (user_index, alert_index, due)
+            for user_index, due, is_scheduled in zip(user_indexes, due_times.tolist(), scheduled.tolist())
+            if is_scheduled
+        )
+        self._reminders.cancel_many(
+            (user_index, alert_index)
+            for user_index, is_scheduled in zip(user_indexes, scheduled.tolist())
+            if not is_scheduled
+        )
+    
+    def _reschedule_alert_reminders(self, alert: Alert):
+        """Recompute due times for every preference held on an alert"""
+        self._schedule_rows(self._preferences.rows_for_alert(alert.alert_id), alert)
+    
+    def _cancel_alert_reminders(self, alert: Alert):
+        """Drop pending reminders for an alert that can no longer be delivered"""
+        rows = self._preferences.rows_for_alert(alert.alert_id)
+        alert_index = self._preferences.alert_ids.lookup(alert.alert_id)
+        self._reminders.cancel_many((user_index, alert_index) for user_index in self._preferences.user_indexes(rows))
+    
+    def _track_frequency(self, alert: Alert):
+        """Add, update or drop an alert's entry in the reminder frequency map"""
+        with self._lock:
+            if alert.reminders_enabled and alert.is_active and not alert.is_expired():
+                self._frequencies[alert.alert_id] = alert.reminder_frequency * 60
+            else:
+                self._frequencies.pop(alert.alert_id, None)
+    
+    def _rebuild_frequencies(self):
+        """Refill the frequency map from the alerts the service holds, e.g. after a load"""
+        with self._lock:
+            self._frequencies = {}
+            for alert in self.alert_service.list_all_alerts():
+                self._track_frequency(alert)
+    
+    def _reminder_frequencies(self) -> Dict[str, float]:
+        """Reminder frequency in seconds for every alert that can still send reminders"""
+        # Expiry events drop alerts whose expiry time has passed from the map
+        self.alert_service.expire_due_alerts()
+        with self._lock:
+            return dict(self._frequencies)
+    
+    def get_due_preferences(self) -> List[PreferenceView]:
+        """Preferences that should be reminded now, from one scan of the whole store"""
+        rows = self._preferences.due_rows(self._reminder_frequencies())
+        return [PreferenceView(self._preferences, row) for row in rows.tolist()]
+    
+    def rebuild_reminders(self):
+        """Recompute the whole reminder queue from the preference store"""
+        rows, due_times = self._preferences.next_reminder_times_for(self._reminder_frequencies())
+        scheduled = ~np.isnan(due_times)
+        rows, due_times = rows[scheduled], due_times[scheduled]
+        self._reminders.rebuild(zip(
+            self._preferences.user_indexes(rows),
+            self._preferences.alert_indexes(rows),
+            due_times.tolist()
+        ))
+        logger.info("✅ Rebuilt reminder queue with %d entries", len(rows))
+    
+    def get_next_reminder_time(self, user_id: str, alert_id: str) -> Optional[datetime]:
+        """Get when a preference's next reminder is scheduled, if it is"""
+        user_index = self._preferences.user_ids.lookup(user_id)
+        alert_index = self._preferences.alert_ids.lookup(alert_id)
+        if user_index is None or alert_index is None:
+            return None
+        return self._reminders.get_due_time(user_index, alert_index)
+    
     def process_reminders(self):
-        """Process all pending reminders for all users"""
-        print("⏰ Processing reminders...")
+        """Process pending reminders that are due"""
+        logger.debug("⏰ Processing reminders...")
         reminder_count = 0
         
-        for user_id, alert_prefs in self._user_preferences.items():
-            user = self.alert_service.get_user(user_id)
-            if not user:
+        # Only preferences whose due time has passed are touched; group them per alert
+        due_by_alert: Dict[int, List[User]] = {}
+        resolve_user = self._preferences.user_ids.resolve
+        for user_index, alert_index in self._reminders.pop_due():
+            user = self.alert_service.get_user(resolve_user(user_index))
+            if user:
+                due_by_alert.setdefault(alert_index, []).append(user)
+        
+        for alert_index, users in due_by_alert.items():
+            alert = self.alert_service.get_alert(self._preferences.alert_ids.resolve(alert_index))
+            
+            # Disabled or archived alerts are rescheduled by on_alert_updated
+            if not alert or not (alert.reminders_enabled and alert.is_active) or alert.is_expired():
                 continue
-                
-            for alert_id, preference in alert_prefs.items():
-                alert = self.alert_service.get_alert(alert_id)
-                if alert and alert.reminders_enabled and alert.is_active:
-                    if self.deliver_notification(user, alert):
-                        reminder_count += 1
-        
-        print(f"✅ Sent {reminder_count} reminders")
+            
+            reminder_count += self.deliver_notifications(users, alert)
+        
+        logger.info("✅ Sent %s reminders", reminder_count)
         return reminder_count
     
+    def get_activity_series(
+        self,
+        kind: str,
+        resolution: str,
+        start: datetime,
+        end: Optional[datetime] = None
+    ) -> List[Tuple[datetime, int]]:
+        """Bucketed counts of one activity kind ('created', 'delivered', 'read', 'snoozed')
+
+        resolution is 'minute', 'hour' or 'day'; see ActivitySeries.series.
+        """
+        return self._activity.series(kind, resolution, start, end)
+    
+    def count_activity(self, kind: str, resolution: str, start: datetime, end: Optional[datetime] = None) -> int:
+        return self._activity.count(kind, resolution, start, end)
+    
+    def get_engagement_latencies(self) -> Dict[str, Dict[str, object]]:
+        """Time-to-read and time-to-snooze p50/p95/p99 in seconds, overall, per severity and per team"""
+        return {latency: self._engagement.get_summary(latency) for latency in (READ_LATENCY, SNOOZE_LATENCY)}
+    
+    def get_top_recipients(self, limit: int = 5) -> List[Tuple[str, int, int]]:
+        """(user, deliveries, possible overcount) for the users sent the most notifications"""
+        with self._lock:
+            return self._top_recipients.top(limit)
+    
     def get_delivery_stats(self) -> Dict[str, int]:
         return {
-            "total_deliveries": len(self._delivery_log),
-            "unique_users": len(self._user_preferences),
-            "user_preferences": sum(len(prefs) for prefs in self._user_preferences.values())
+            "total_deliveries": self._delivery_log.count(STATUS_SENT),
+            "failed_deliveries": self._delivery_log.count(STATUS_FAILED),
+            "unique_users": self._preferences.count_users(),
+            "user_preferences": len(self._preferences)
         }
\ No newline at end of file
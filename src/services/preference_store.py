@@ -0,0 +1,511 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.notification import NotificationStatus
+from utils.interner import IdInterner
+
+_STATUSES = [NotificationStatus.UNREAD, NotificationStatus.READ, NotificationStatus.SNOOZED]
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+UNREAD, READ, SNOOZED = range(3)
+
+_COLUMNS = ('_user', '_alert', '_status', '_snoozed_until', '_last_reminded_at', '_read_at', '_created_at',
+            '_first_delivered_at')
+
+def _to_timestamp(value: Optional[datetime]) -> float:
+    return value.timestamp() if value is not None else np.nan
+
+def _to_datetime(value: float) -> Optional[datetime]:
+    return None if np.isnan(value) else datetime.fromtimestamp(value)
+
+class PreferenceStore:
+    """Struct-of-arrays storage for user × alert notification preferences
+
+    Every preference is one row across NumPy columns: interned user and
+    alert ids, a status code, and the snoozed_until, last_reminded_at,
+    read_at, created_at and first_delivered_at times as epoch seconds (NaN
+    when unset). Rows are
+    never removed, so a row number is a stable handle.
+
+    Lookups go through a sorted array of (user << 32 | alert) keys, with
+    recent single inserts held in a small dict until they are merged in.
+    Each alert's rows are also kept as appended chunks, so the rows for one
+    alert are found without scanning the alert column.
+    Callers that want an object get a PreferenceView over a row.
+    """
+
+    INITIAL_CAPACITY = 1024
+    MIN_MERGE_SIZE = 1024
+
+    def __init__(self, user_ids: Optional[IdInterner] = None, alert_ids: Optional[IdInterner] = None,
+                 capacity: int = INITIAL_CAPACITY):
+        self.user_ids = user_ids if user_ids is not None else IdInterner()
+        self.alert_ids = alert_ids if alert_ids is not None else IdInterner()
+        self._size = 0
+        self._user = np.empty(capacity, np.int32)
+        self._alert = np.empty(capacity, np.int32)
+        self._status = np.empty(capacity, np.int8)
+        self._snoozed_until = np.empty(capacity, np.float64)
+        self._last_reminded_at = np.empty(capacity, np.float64)
+        self._read_at = np.empty(capacity, np.float64)
+        self._created_at = np.empty(capacity, np.float64)
+        self._first_delivered_at = np.empty(capacity, np.float64)
+
+        self._index_keys = np.empty(0, np.int64)  # sorted
+        self._index_rows = np.empty(0, np.int64)
+        self._recent: Dict[int, int] = {}  # key -> row, not yet merged into the sorted index
+        self._alert_rows: Dict[int, List[np.ndarray]] = {}  # alert index -> ascending row chunks
+
+        self._user_row_counts = np.zeros(0, np.int32)
+        self._user_count = 0
+        self._lock = threading.RLock()
+
+    # Lookup
+
+    @staticmethod
+    def _keys(user_indexes, alert_index: int) -> np.ndarray:
+        return (np.asarray(user_indexes, np.int64) << 32) | alert_index
+
+    def _find_keys(self, keys: np.ndarray) -> np.ndarray:
+        """Rows for keys, -1 where missing"""
+        rows = np.full(len(keys), -1, np.int64)
+        if len(self._index_keys):
+            positions = np.searchsorted(self._index_keys, keys)
+            positions[positions == len(self._index_keys)] = 0
+            found = self._index_keys[positions] == keys
+            rows[found] = self._index_rows[positions[found]]
+        if self._recent:
+            recent = self._recent
+            for i in np.flatnonzero(rows < 0):
+                rows[i] = recent.get(int(keys[i]), -1)
+        return rows
+
+    def find(self, user_id: str, alert_id: str) -> Optional[int]:
+        """Row for a preference, or None"""
+        user_index = self.user_ids.lookup(user_id)
+        alert_index = self.alert_ids.lookup(alert_id)
+        if user_index is None or alert_index is None:
+            return None
+        with self._lock:
+            row = int(self._find_keys(self._keys([user_index], alert_index))[0])
+        return row if row >= 0 else None
+
+    def find_rows(self, user_ids: Sequence[str], alert_id: str) -> np.ndarray:
+        """Rows for many users on one alert, -1 where there is no preference"""
+        alert_index = self.alert_ids.lookup(alert_id)
+        if alert_index is None:
+            return np.full(len(user_ids), -1, np.int64)
+        user_indexes = [self.user_ids.lookup(user_id) for user_id in user_ids]
+        known = np.array([index is not None for index in user_indexes], bool)
+        keys = self._keys([index if index is not None else 0 for index in user_indexes], alert_index)
+        with self._lock:
+            rows = self._find_keys(keys)
+        rows[~known] = -1
+        return rows
+
+    def lookup_states(self, user_indexes, alert_indexes) -> Tuple[np.ndarray, np.ndarray]:
+        """Status codes and snoozed_until times for (user, alert) index pairs
+
+        Either side may be a single index. Pairs without a preference read as
+        UNREAD and not snoozed, which is how a new preference starts out.
+        """
+        keys = np.atleast_1d((np.asarray(user_indexes, np.int64) << 32) | np.asarray(alert_indexes, np.int64))
+        status = np.full(len(keys), UNREAD, np.int8)
+        snoozed_until = np.full(len(keys), np.nan)
+        with self._lock:
+            rows = self._find_keys(keys)
+            found = rows >= 0
+            status[found] = self._status[rows[found]]
+            snoozed_until[found] = self._snoozed_until[rows[found]]
+        return status, snoozed_until
+
+    def get(self, user_id: str, alert_id: str) -> Optional['PreferenceView']:
+        row = self.find(user_id, alert_id)
+        return PreferenceView(self, row) if row is not None else None
+
+    def get_or_create(self, user_id: str, alert_id: str) -> Tuple['PreferenceView', bool]:
+        """Get a preference view, creating an unread preference if needed"""
+        rows, created = self.get_or_create_rows([user_id], alert_id)
+        return PreferenceView(self, int(rows[0])), bool(created[0])
+
+    def get_or_create_rows(self, user_ids: Sequence[str], alert_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows for many users on one alert, creating missing ones in one block
+
+        Returns the rows and a mask of which ones were created.
+        """
+        alert_index = self.alert_ids.intern(alert_id)
+        user_indexes = np.fromiter((self.user_ids.intern(user_id) for user_id in user_ids),
+                                   np.int64, len(user_ids))
+        return self._get_or_create_indexes(user_indexes, np.full(len(user_indexes), alert_index, np.int64))
+
+    def get_or_create_pairs(self, user_ids: Sequence[str], alert_ids: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows for parallel lists of user and alert ids, created in one block
+
+        Used for a batch of alerts so the lookup index is merged once rather
+        than once per alert. Returns the rows and a created mask.
+        """
+        user_indexes = np.fromiter(map(self.user_ids.intern, user_ids), np.int64, len(user_ids))
+        alert_indexes = np.fromiter(map(self.alert_ids.intern, alert_ids), np.int64, len(alert_ids))
+        return self._get_or_create_indexes(user_indexes, alert_indexes)
+
+    def _get_or_create_indexes(self, user_indexes: np.ndarray, alert_indexes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        keys = (user_indexes << 32) | alert_indexes
+        with self._lock:
+            rows = self._find_keys(keys)
+            missing = np.flatnonzero(rows < 0)
+            if len(missing):
+                # The same pair listed twice must only get one row
+                new_keys, first, inverse = np.unique(keys[missing], return_index=True, return_inverse=True)
+                new_rows = self._append(user_indexes[missing][first], alert_indexes[missing][first])
+                rows[missing] = new_rows[inverse.reshape(-1)]
+                self._add_to_index(new_keys, new_rows)
+            created = np.zeros(len(keys), bool)
+            created[missing] = True
+        return rows, created
+
+    def _append(self, user_indexes: np.ndarray, alert_index) -> np.ndarray:
+        """Append unread rows; alert_index is one index or one per row"""
+        count = len(user_indexes)
+        start, end = self._size, self._size + count
+        if end > len(self._user):
+            self._grow(end)
+
+        self._user[start:end] = user_indexes
+        self._alert[start:end] = alert_index
+        self._status[start:end] = UNREAD
+        self._snoozed_until[start:end] = np.nan
+        self._last_reminded_at[start:end] = np.nan
+        self._read_at[start:end] = np.nan
+        self._created_at[start:end] = datetime.now().timestamp()
+        self._first_delivered_at[start:end] = np.nan
+        self._size = end
+
+        if len(self.user_ids) > len(self._user_row_counts):
+            grown = np.zeros(max(len(self.user_ids), 2 * len(self._user_row_counts)), np.int32)
+            grown[:len(self._user_row_counts)] = self._user_row_counts
+            self._user_row_counts = grown
+        self._user_count += int(np.count_nonzero(self._user_row_counts[user_indexes] == 0))
+        np.add.at(self._user_row_counts, user_indexes, 1)
+
+        rows = np.arange(start, end, dtype=np.int64)
+        self._index_alert_rows(np.broadcast_to(np.asarray(alert_index, np.int64), (count,)), rows)
+        return rows
+
+    def _index_alert_rows(self, alert_indexes: np.ndarray, rows: np.ndarray):
+        """Append rows (ascending) to their alerts' chunk lists, one chunk per alert"""
+        if not len(rows):
+            return
+        order = np.argsort(alert_indexes, kind='stable')
+        sorted_alerts = alert_indexes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_alerts[1:] != sorted_alerts[:-1]])
+        for alert_index, chunk in zip(sorted_alerts[starts].tolist(), np.split(rows[order], starts[1:])):
+            self._alert_rows.setdefault(alert_index, []).append(chunk)
+
+    def _grow(self, needed: int):
+        capacity = max(needed, 2 * len(self._user))
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty(capacity, column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def _add_to_index(self, keys: np.ndarray, rows: np.ndarray):
+        if len(keys) == 1 and len(self._recent) < max(self.MIN_MERGE_SIZE, len(self._index_keys) // 16):
+            self._recent[int(keys[0])] = int(rows[0])
+            return
+
+        if self._recent:
+            keys = np.concatenate([keys, np.fromiter(self._recent.keys(), np.int64, len(self._recent))])
+            rows = np.concatenate([rows, np.fromiter(self._recent.values(), np.int64, len(self._recent))])
+            self._recent = {}
+        order = np.argsort(keys)
+        keys, rows = keys[order], rows[order]
+
+        # Merging sorted keys into the sorted index is a single linear copy
+        positions = np.searchsorted(self._index_keys, keys)
+        self._index_keys = np.insert(self._index_keys, positions, keys)
+        self._index_rows = np.insert(self._index_rows, positions, rows)
+
+    def rows_for_alert(self, alert_id: str) -> np.ndarray:
+        """Rows held on an alert, ascending; treat the array as read-only"""
+        alert_index = self.alert_ids.lookup(alert_id)
+        with self._lock:
+            chunks = self._alert_rows.get(alert_index) if alert_index is not None else None
+            if not chunks:
+                return np.empty(0, np.int64)
+            if len(chunks) > 1:
+                chunks[:] = [np.concatenate(chunks)]
+            return chunks[0]
+
+    def rows_for_user(self, user_id: str) -> np.ndarray:
+        user_index = self.user_ids.lookup(user_id)
+        if user_index is None:
+            return np.empty(0, np.int64)
+        return np.flatnonzero(self._user[:self._size] == user_index)
+
+    def user_indexes(self, rows: np.ndarray) -> List[int]:
+        return self._user[rows].tolist()
+
+    def alert_indexes(self, rows: np.ndarray) -> List[int]:
+        return self._alert[rows].tolist()
+
+    # Vectorized reminder maths
+
+    def next_reminder_times(self, rows: np.ndarray, frequency_seconds, now: Optional[float] = None) -> np.ndarray:
+        """Earliest time each row can be reminded, NaN when it never will
+
+        Vectorized form of should_remind: a row is due once its next time
+        is at or before now.
+        """
+        now = now if now is not None else datetime.now().timestamp()
+        last = self._last_reminded_at[rows]
+        due = np.where(np.isnan(last), now, last + frequency_seconds)
+
+        status = self._status[rows]
+        snoozed_until = self._snoozed_until[rows]
+        snoozed = (status == SNOOZED) & (snoozed_until > now)
+        due = np.where(snoozed, np.fmax(due, snoozed_until), due)
+        return np.where(status == READ, np.nan, due)
+
+    def should_remind_mask(self, rows: np.ndarray, frequency_seconds, now: Optional[float] = None) -> np.ndarray:
+        now = now if now is not None else datetime.now().timestamp()
+        with np.errstate(invalid='ignore'):
+            return self.next_reminder_times(rows, frequency_seconds, now) <= now
+
+    def due_rows(self, frequency_by_alert: Dict[str, float], now: Optional[float] = None) -> np.ndarray:
+        """Rows due for a reminder across the whole store, in one mask
+
+        frequency_by_alert maps alert ids to reminder frequencies in seconds;
+        alerts left out are never due.
+        """
+        rows, frequencies = self._rows_with_frequency(frequency_by_alert)
+        return rows[self.should_remind_mask(rows, frequencies, now)]
+
+    def next_reminder_times_for(self, frequency_by_alert: Dict[str, float],
+                                now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows on the given alerts with their next reminder times"""
+        rows, frequencies = self._rows_with_frequency(frequency_by_alert)
+        return rows, self.next_reminder_times(rows, frequencies, now)
+
+    def _rows_with_frequency(self, frequency_by_alert: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        by_index = np.full(len(self.alert_ids), np.nan)
+        for alert_id, seconds in frequency_by_alert.items():
+            alert_index = self.alert_ids.lookup(alert_id)
+            if alert_index is not None:
+                by_index[alert_index] = seconds
+
+        frequencies = by_index[self._alert[:self._size]]
+        rows = np.flatnonzero(~np.isnan(frequencies))
+        return rows, frequencies[rows]
+
+    def mark_reminded(self, rows: np.ndarray, when: Optional[datetime] = None):
+        """Record a delivery; first_delivered_at is only set on a row's first one"""
+        timestamp = (when or datetime.now()).timestamp()
+        with self._lock:
+            self._last_reminded_at[rows] = timestamp
+            first = self._first_delivered_at[rows]
+            self._first_delivered_at[rows] = np.where(np.isnan(first), timestamp, first)
+
+    # Export and bulk load for persistent storage
+
+    def to_records(self, rows: np.ndarray) -> List[tuple]:
+        """Rows as (user_id, alert_id, status, snoozed_until, last_reminded_at, read_at, created_at,
+        first_delivered_at)
+
+        Times are epoch seconds or None, matching storage.PreferenceRecord.
+        """
+        with self._lock:
+            columns = [getattr(self, name)[rows] for name in _COLUMNS]
+        user_column, alert_column, status_column = (column.tolist() for column in columns[:3])
+        times = [np.where(np.isnan(column), None, column).tolist() for column in columns[3:]]
+        resolve_user, resolve_alert = self.user_ids.resolve, self.alert_ids.resolve
+        return [
+            (resolve_user(user), resolve_alert(alert), _STATUSES[status].value) + tuple(row_times)
+            for user, alert, status, *row_times in zip(user_column, alert_column, status_column, *times)
+        ]
+
+    def load_records(self, records) -> int:
+        """Insert or overwrite preferences from to_records-shaped tuples in one block"""
+        records = list(records)
+        if not records:
+            return 0
+        user_ids, alert_ids, statuses, *times = zip(*records)
+        rows, _ = self.get_or_create_pairs(user_ids, alert_ids)
+
+        with self._lock:
+            codes = {status.value: code for status, code in _STATUS_CODES.items()}
+            self._status[rows] = [codes[status] for status in statuses]
+            for name, values in zip(_COLUMNS[3:], times):
+                getattr(self, name)[rows] = np.array(values, np.float64)  # None becomes NaN
+        return len(records)
+
+    def export_columns(self) -> Dict[str, np.ndarray]:
+        """Copies of every column, keyed by name without the underscore
+
+        user and alert hold interned indexes; pair them with list(user_ids)
+        and list(alert_ids) to make them portable.
+        """
+        with self._lock:
+            return {name.lstrip('_'): getattr(self, name)[:self._size].copy() for name in _COLUMNS}
+
+    def load_columns(self, columns: Dict[str, np.ndarray], user_ids: Sequence[str], alert_ids: Sequence[str]) -> int:
+        """Fill an empty store from export_columns output without touching rows one by one
+
+        user_ids and alert_ids are the id lists the exported indexes point
+        into; they are re-interned, so this store's interners may differ.
+        """
+        user_map = np.fromiter(map(self.user_ids.intern, user_ids), np.int32, len(user_ids))
+        alert_map = np.fromiter(map(self.alert_ids.intern, alert_ids), np.int32, len(alert_ids))
+        size = len(columns['status'])
+
+        with self._lock:
+            if self._size:
+                raise ValueError("Columns can only be loaded into an empty store")
+            if size > len(self._user):
+                self._grow(size)
+            self._user[:size] = user_map[columns['user']]
+            self._alert[:size] = alert_map[columns['alert']]
+            for name in _COLUMNS[2:]:
+                getattr(self, name)[:size] = columns[name.lstrip('_')]
+            self._size = size
+
+            keys = self._keys(self._user[:size], 0) | self._alert[:size]
+            order = np.argsort(keys)
+            self._index_keys = keys[order]
+            self._index_rows = order.astype(np.int64)
+            self._recent = {}
+            self._alert_rows = {}
+            self._index_alert_rows(self._alert[:size].astype(np.int64), np.arange(size, dtype=np.int64))
+
+            self._user_row_counts = np.bincount(self._user[:size], minlength=len(self.user_ids)).astype(np.int32)
+            self._user_count = int(np.count_nonzero(self._user_row_counts))
+        return size
+
+    # Single-row access for views
+
+    def _read(self, column: str, row: int):
+        return getattr(self, column)[row]
+
+    def _write(self, column: str, row: int, value):
+        with self._lock:
+            getattr(self, column)[row] = value
+
+    def count_users(self) -> int:
+        return self._user_count
+
+    def get_memory_usage(self) -> int:
+        """Bytes held by the columns and the lookup index"""
+        columns = sum(getattr(self, name).nbytes for name in _COLUMNS)
+        return columns + self._index_keys.nbytes + self._index_rows.nbytes + self._user_row_counts.nbytes
+
+    def __len__(self) -> int:
+        return self._size
+
+class PreferenceView:
+    """UserAlertPreference-compatible view over one PreferenceStore row"""
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: PreferenceStore, row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def user_index(self) -> int:
+        return int(self._store._read('_user', self._row))
+
+    @property
+    def alert_index(self) -> int:
+        return int(self._store._read('_alert', self._row))
+
+    @property
+    def user_id(self) -> str:
+        return self._store.user_ids.resolve(self.user_index)
+
+    @property
+    def alert_id(self) -> str:
+        return self._store.alert_ids.resolve(self.alert_index)
+
+    @property
+    def status(self) -> NotificationStatus:
+        return _STATUSES[self._store._read('_status', self._row)]
+
+    @status.setter
+    def status(self, value: NotificationStatus):
+        self._store._write('_status', self._row, _STATUS_CODES[value])
+
+    @property
+    def snoozed_until(self) -> Optional[datetime]:
+        return _to_datetime(self._store._read('_snoozed_until', self._row))
+
+    @snoozed_until.setter
+    def snoozed_until(self, value: Optional[datetime]):
+        self._store._write('_snoozed_until', self._row, _to_timestamp(value))
+
+    @property
+    def last_reminded_at(self) -> Optional[datetime]:
+        return _to_datetime(self._store._read('_last_reminded_at', self._row))
+
+    @last_reminded_at.setter
+    def last_reminded_at(self, value: Optional[datetime]):
+        self._store._write('_last_reminded_at', self._row, _to_timestamp(value))
+
+    @property
+    def read_at(self) -> Optional[datetime]:
+        return _to_datetime(self._store._read('_read_at', self._row))
+
+    @read_at.setter
+    def read_at(self, value: Optional[datetime]):
+        self._store._write('_read_at', self._row, _to_timestamp(value))
+
+    @property
+    def created_at(self) -> datetime:
+        return _to_datetime(self._store._read('_created_at', self._row))
+
+    @property
+    def first_delivered_at(self) -> Optional[datetime]:
+        return _to_datetime(self._store._read('_first_delivered_at', self._row))
+
+    @first_delivered_at.setter
+    def first_delivered_at(self, value: Optional[datetime]):
+        self._store._write('_first_delivered_at', self._row, _to_timestamp(value))
+
+    def mark_read(self):
+        self.status = NotificationStatus.READ
+        self.read_at = datetime.now()
+
+    def mark_unread(self):
+        self.status = NotificationStatus.UNREAD
+        self.read_at = None
+
+    def snooze_until_tomorrow(self):
+        tomorrow = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self.status = NotificationStatus.SNOOZED
+        self.snoozed_until = tomorrow
+
+    def is_snoozed(self) -> bool:
+        if self.status != NotificationStatus.SNOOZED or not self.snoozed_until:
+            return False
+        return datetime.now() < self.snoozed_until
+
+    def should_remind(self, reminder_frequency: int) -> bool:
+        rows = np.array([self._row])
+        return bool(self._store.should_remind_mask(rows, reminder_frequency * 60)[0])
+
+    def update_reminder_time(self):
+        self.last_reminded_at = datetime.now()
+
+    def __eq__(self, other):
+        return isinstance(other, PreferenceView) and other._store is self._store and other._row == self._row
+
+    def __hash__(self):
+        return hash((id(self._store), self._row))
+
+    def __repr__(self):
+        return f"UserAlertPreference(user={self.user_id}, alert={self.alert_id}, status={self.status.value})"
@@ -0,0 +1,89 @@
+import heapq
+import itertools
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class ReminderQueue:
+    """Min-heap of reminder due times keyed by interned (user, alert) indexes
+
+    Rescheduling pushes a fresh heap entry and leaves the old one behind;
+    stale entries are recognised by comparing against ``_due`` and skipped
+    when popped, so every operation stays O(log n).
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, int, int]] = []
+        self._due: Dict[Tuple[int, int], float] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def schedule(self, user_index: int, alert_index: int, due_at: datetime):
+        """Schedule (or reschedule) the next reminder for a preference"""
+        due = due_at.timestamp()
+        with self._lock:
+            self._due[(user_index, alert_index)] = due
+            heapq.heappush(self._heap, (due, next(self._counter), user_index, alert_index))
+
+            # Rebuild once stale entries dominate the heap
+            if len(self._heap) > 2 * len(self._due) + 1024:
+                self._compact()
+
+    def schedule_many(self, entries: Iterable[Tuple[int, int, float]]):
+        """Schedule many (user_index, alert_index, due epoch seconds) entries under one lock"""
+        with self._lock:
+            for user_index, alert_index, due in entries:
+                self._due[(user_index, alert_index)] = due
+                heapq.heappush(self._heap, (due, next(self._counter), user_index, alert_index))
+
+            if len(self._heap) > 2 * len(self._due) + 1024:
+                self._compact()
+
+    def cancel(self, user_index: int, alert_index: int):
+        """Stop reminding a preference until it is scheduled again"""
+        with self._lock:
+            self._due.pop((user_index, alert_index), None)
+
+    def cancel_many(self, keys: Iterable[Tuple[int, int]]):
+        """Stop reminding many (user_index, alert_index) preferences"""
+        with self._lock:
+            for key in keys:
+                self._due.pop(key, None)
+
+    def rebuild(self, entries: Iterable[Tuple[int, int, float]]):
+        """Replace every scheduled reminder with (user_index, alert_index, due epoch seconds) entries"""
+        with self._lock:
+            self._due = {(user_index, alert_index): due for user_index, alert_index, due in entries}
+            self._compact()
+
+    def get_due_time(self, user_index: int, alert_index: int) -> Optional[datetime]:
+        """Get the next scheduled reminder time for a preference"""
+        due = self._due.get((user_index, alert_index))
+        return datetime.fromtimestamp(due) if due is not None else None
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[Tuple[int, int]]:
+        """Remove and return every (user_index, alert_index) due at or before now"""
+        now_ts = (now or datetime.now()).timestamp()
+        due = []
+
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now_ts:
+                due_ts, _, user_index, alert_index = heapq.heappop(heap)
+                key = (user_index, alert_index)
+                if self._due.get(key) == due_ts:
+                    del self._due[key]
+                    due.append(key)
+
+        return due
+
+    def _compact(self):
+        """Drop stale heap entries"""
+        self._heap = [
+            (due, next(self._counter), user_index, alert_index)
+            for (user_index, alert_index), due in self._due.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._due)
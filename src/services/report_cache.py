@@ -0,0 +1,173 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from patterns.observer import AlertObserver
+from utils.logger import get_logger
+from utils.quantile_sketch import QuantileSketch
+from utils.settings import load_settings
+
+logger = get_logger(__name__)
+
+# Topics a cached section can depend on; observer events bump every section that depends on theirs
+ALERTS = "alerts"
+MEMBERSHIP = "membership"
+
+class _Flight:
+    """One computation in progress, shared by every caller that asks for it meanwhile"""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+class _Section:
+    __slots__ = ('topics', 'generation', 'value', 'value_generation', 'computed_at', 'flight')
+
+    def __init__(self, topics: Iterable[str]):
+        self.topics = frozenset(topics)
+        self.generation = 0          # bumped by events on the section's topics
+        self.value = None
+        self.value_generation = -1   # generation the cached value was computed at
+        self.computed_at = 0.0
+        self.flight: Optional[_Flight] = None
+
+class ReportCache(AlertObserver):
+    """Cache for analytics sections with TTL, event invalidation and single-flight
+
+    A cached section is fresh while it is younger than ttl seconds and no
+    alert or membership event has bumped its generation since it was
+    computed. Concurrent callers of a stale section share one computation.
+    With stale_while_revalidate, callers get the previous value at once
+    while one background thread recomputes it. Cached values are shared, so
+    callers must not modify them. Events from outside AlertService (reads,
+    deliveries) are only picked up when the TTL runs out.
+    """
+
+    def __init__(self, alert_service=None, ttl: Optional[float] = None,
+                 stale_while_revalidate: Optional[bool] = None):
+        settings = load_settings()
+        self.ttl = ttl if ttl is not None else (settings.REPORT_CACHE_TTL_SECONDS if settings else 5)
+        if stale_while_revalidate is None:
+            stale_while_revalidate = settings.REPORT_CACHE_STALE_WHILE_REVALIDATE if settings else False
+        self.stale_while_revalidate = stale_while_revalidate
+
+        self._sections: Dict[str, _Section] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale_hits = 0
+        self._shared = 0  # callers that waited on another caller's computation
+        self._recompute_seconds = QuantileSketch(min_value=1e-6)
+        if alert_service is not None:
+            alert_service.add_observer(self)
+
+    def get(self, name: str, compute: Callable[[], Any], depends_on: Iterable[str] = (ALERTS,)) -> Any:
+        """Cached value of a section, calling compute when it is missing or stale
+
+        depends_on names the topics (ALERTS, MEMBERSHIP) whose events
+        invalidate the section; it is fixed by the first call for a name.
+        """
+        with self._lock:
+            section = self._sections.get(name)
+            if section is None:
+                section = self._sections[name] = _Section(depends_on)
+
+            has_value = section.value_generation >= 0
+            if (has_value and section.value_generation == section.generation
+                    and time.monotonic() - section.computed_at < self.ttl):
+                self._hits += 1
+                return section.value
+
+            flight = section.flight
+            if has_value and self.stale_while_revalidate:
+                self._stale_hits += 1
+                if flight is None:
+                    section.flight = _Flight()
+                    threading.Thread(target=self._compute, args=(section, compute, section.flight),
+                                     name=f"report-cache-{name}", daemon=True).start()
+                return section.value
+
+            leader = flight is None
+            if leader:
+                self._misses += 1
+                flight = section.flight = _Flight()
+            else:
+                self._shared += 1
+
+        if leader:
+            self._compute(section, compute, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _compute(self, section: _Section, compute: Callable[[], Any], flight: _Flight):
+        with self._lock:
+            generation = section.generation
+        start = time.perf_counter()
+        try:
+            flight.value = compute()
+        except Exception as e:
+            flight.error = e
+            logger.error("❌ Report section computation failed: %s", e)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._recompute_seconds.add(elapsed)
+            if flight.error is None:
+                # An event during the computation leaves the value already stale
+                section.value = flight.value
+                section.value_generation = generation
+                section.computed_at = time.monotonic()
+            section.flight = None
+        flight.done.set()
+
+    def invalidate(self, topic: Optional[str] = None):
+        """Mark the sections depending on a topic stale, or every section if none is given"""
+        with self._lock:
+            for section in self._sections.values():
+                if topic is None or topic in section.topics:
+                    section.generation += 1
+
+    def on_alert_created(self, alert):
+        self.invalidate(ALERTS)
+
+    def on_alerts_created(self, alerts):
+        self.invalidate(ALERTS)
+
+    def on_alert_updated(self, alert):
+        self.invalidate(ALERTS)
+
+    def on_alert_archived(self, alert):
+        self.invalidate(ALERTS)
+
+    def on_alert_expired(self, alert):
+        self.invalidate(ALERTS)
+
+    def on_membership_changed(self, user_ids):
+        self.invalidate(MEMBERSHIP)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit, miss and recompute-time figures; recompute times are in seconds"""
+        with self._lock:
+            p50, p95, p99 = self._recompute_seconds.quantiles((0.5, 0.95, 0.99))
+            lookups = self._hits + self._misses + self._stale_hits + self._shared
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'stale_hits': self._stale_hits,
+                'shared_computations': self._shared,
+                'hit_rate': (self._hits + self._stale_hits) / lookups if lookups else 0.0,
+                'recomputes': self._recompute_seconds.count,
+                'recompute_seconds': {
+                    'total': self._recompute_seconds.total,
+                    'mean': self._recompute_seconds.mean(),
+                    'p50': p50,
+                    'p95': p95,
+                    'p99': p99
+                }
+            }
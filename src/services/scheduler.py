@@ -1,6 +1,9 @@
-import time
 import threading
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class Scheduler:
     def __init__(self):
@@ -11,45 +14,49 @@ class Scheduler:
     def start_periodic_task(self, task_id: str, interval: int, task: Callable, daemon: bool = True):
         """Start a periodic task that runs every interval seconds"""
         if task_id in self._tasks:
-            print(f"⚠️ Task {task_id} is already running")
+            logger.warning("⚠️ Task %s is already running", task_id)
             return
         
+        # Set on stop, so a task waiting out its interval stops at once
+        stopped = threading.Event()
         self._tasks[task_id] = {
             'interval': interval,
             'task': task,
-            'running': True
+            'running': True,
+            'stopped': stopped
         }
         
         def run():
-            while self._tasks.get(task_id, {}).get('running', False):
+            while not stopped.is_set():
                 try:
-                    print(f"🔄 Running scheduled task: {task_id}")
+                    logger.debug("🔄 Running scheduled task: %s", task_id)
                     task()
                 except Exception as e:
-                    print(f"❌ Error in scheduled task {task_id}: {e}")
-                time.sleep(interval)
+                    logger.error("❌ Error in scheduled task %s: %s", task_id, e)
+                stopped.wait(interval)
         
         thread = threading.Thread(target=run, daemon=daemon)
         thread.start()
         
         self._tasks[task_id]['thread'] = thread
-        print(f"✅ Started periodic task: {task_id} (interval: {interval}s)")
+        logger.info("✅ Started periodic task: %s (interval: %ss)", task_id, interval)
     
     def stop_task(self, task_id: str):
         """Stop a specific task"""
         if task_id in self._tasks:
             self._tasks[task_id]['running'] = False
+            self._tasks[task_id]['stopped'].set()
             if 'thread' in self._tasks[task_id]:
                 self._tasks[task_id]['thread'].join(timeout=5)
             del self._tasks[task_id]
-            print(f"✅ Stopped task: {task_id}")
+            logger.info("✅ Stopped task: %s", task_id)
     
     def stop_all(self):
         """Stop all running tasks"""
-        print("🛑 Stopping all scheduled tasks...")
+        logger.info("🛑 Stopping all scheduled tasks...")
         for task_id in list(self._tasks.keys()):
             self.stop_task(task_id)
-        print("✅ All tasks stopped")
+        logger.info("✅ All tasks stopped")
     
     def get_running_tasks(self) -> list:
         """Get list of currently running tasks"""
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from services.scheduler import Scheduler
+from utils.settings import load_settings
+
+class Snapshotter:
+    """Background task that snapshots service state into a JournalStorage
+
+    Each snapshot lets the journal before it be deleted, so a restart only
+    replays what was written since the last run.
+    """
+
+    TASK_ID = "journal_snapshotter"
+
+    def __init__(self, storage, alert_service, notification_service,
+                 scheduler: Optional[Scheduler] = None, interval: Optional[int] = None):
+        settings = load_settings()
+        self.storage = storage
+        self.alert_service = alert_service
+        self.notification_service = notification_service
+        self.scheduler = scheduler or Scheduler()
+        self.interval = interval or (settings.SNAPSHOT_INTERVAL if settings else 300)
+
+    def run_once(self) -> int:
+        """Take a snapshot now, returning the journal sequence number it covers"""
+        return self.storage.snapshot(self.alert_service, self.notification_service)
+
+    def start(self):
+        """Start snapshotting every interval seconds"""
+        self.scheduler.start_periodic_task(self.TASK_ID, self.interval, self.run_once)
+
+    def stop(self):
+        """Stop the background snapshotter"""
+        self.scheduler.stop_task(self.TASK_ID)
+
+    def is_running(self) -> bool:
+        """Check if the background snapshotter is running"""
+        return self.scheduler.is_task_running(self.TASK_ID)
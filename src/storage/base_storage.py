@@ -0,0 +1,165 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional
+
+from models.alert import Alert, AlertVisibility, DeliveryType, Severity, VisibilityType
+from models.team import Team
+from models.user import User, UserRole
+
+class PreferenceRecord(NamedTuple):
+    """One user × alert preference; times are epoch seconds or None"""
+    user_id: str
+    alert_id: str
+    status: str
+    snoozed_until: Optional[float]
+    last_reminded_at: Optional[float]
+    read_at: Optional[float]
+    created_at: float
+    first_delivered_at: Optional[float] = None
+
+class DeliveryRecord(NamedTuple):
+    """One delivery attempt; delivered_at is epoch seconds"""
+    user_id: str
+    alert_id: str
+    channel: str
+    status: str
+    delivered_at: float
+
+class StorageBackend(ABC):
+    """Where alerts, users, teams, preferences and deliveries are kept
+
+    Bulk methods take lists so backends can write each call as one
+    transaction.
+    """
+
+    @classmethod
+    def from_url(cls, database_url: str) -> 'StorageBackend':
+        """Create the backend from a database URL; backends without settings ignore it"""
+        return cls()
+
+    @abstractmethod
+    def save_alerts(self, alerts: List[Alert]):
+        """Insert or replace alerts"""
+        pass
+
+    def save_alert(self, alert: Alert):
+        self.save_alerts([alert])
+
+    @abstractmethod
+    def load_alerts(self) -> List[Alert]:
+        """Load every alert, oldest first"""
+        pass
+
+    @abstractmethod
+    def get_alert_ids_for_target(self, visibility_type: VisibilityType, target_id: Optional[str] = None) -> List[str]:
+        """Ids of alerts aimed at the organisation, a team or a user"""
+        pass
+
+    @abstractmethod
+    def save_users(self, users: List[User]):
+        pass
+
+    def save_user(self, user: User):
+        self.save_users([user])
+
+    @abstractmethod
+    def load_users(self) -> List[User]:
+        pass
+
+    @abstractmethod
+    def save_team(self, team: Team):
+        """Insert or replace a team and its member list"""
+        pass
+
+    def save_teams(self, teams: List[Team]):
+        """Insert or replace many teams; backends override this to use one transaction"""
+        for team in teams:
+            self.save_team(team)
+
+    @abstractmethod
+    def load_teams(self) -> List[Team]:
+        pass
+
+    @abstractmethod
+    def save_preferences(self, records: List[PreferenceRecord]):
+        """Insert or replace preferences"""
+        pass
+
+    @abstractmethod
+    def load_preferences(self) -> Iterable[PreferenceRecord]:
+        pass
+
+    def load_preference_store(self, store) -> int:
+        """Load every preference into an empty PreferenceStore, returning its size
+
+        Backends that keep preferences as columns override this to skip
+        building one record per row.
+        """
+        store.load_records(self.load_preferences())
+        return len(store)
+
+    @abstractmethod
+    def get_preferences_for_user(self, user_id: str, status: Optional[str] = None) -> List[PreferenceRecord]:
+        pass
+
+    @abstractmethod
+    def append_deliveries(self, records: List[DeliveryRecord]):
+        pass
+
+    @abstractmethod
+    def get_deliveries_between(self, start: datetime, end: datetime) -> List[DeliveryRecord]:
+        """Deliveries made in [start, end), oldest first"""
+        pass
+
+    def close(self):
+        """Release any resources held by the backend"""
+        pass
+
+# Enum(value) is slow enough to show up when loading millions of rows
+_SEVERITIES = {member.value: member for member in Severity}
+_VISIBILITY_TYPES = {member.value: member for member in VisibilityType}
+_DELIVERY_TYPES = {member.value: member for member in DeliveryType}
+_ROLES = {member.value: member for member in UserRole}
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+def _datetime(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value) if value is not None else None
+
+def alert_to_row(alert: Alert) -> tuple:
+    """Flatten an alert into a row of plain values"""
+    return (
+        alert.alert_id, alert.title, alert.message, alert.severity.value, alert.created_by,
+        alert.visibility.type.value, alert.delivery_type.value, alert.reminder_frequency,
+        int(alert.reminders_enabled), int(alert.is_active), _timestamp(alert.start_time),
+        _timestamp(alert.expiry_time), _timestamp(alert.created_at)
+    )
+
+def alert_from_row(row: tuple, target_ids: Iterable[str]) -> Alert:
+    """Rebuild an alert from alert_to_row output and its visibility targets"""
+    (alert_id, title, message, severity, created_by, visibility_type, delivery_type,
+     reminder_frequency, reminders_enabled, is_active, start_time, expiry_time, created_at) = row
+    alert = Alert(
+        alert_id=alert_id,
+        title=title,
+        message=message,
+        severity=_SEVERITIES[severity],
+        created_by=created_by,
+        visibility=AlertVisibility(_VISIBILITY_TYPES[visibility_type], set(target_ids)),
+        delivery_type=_DELIVERY_TYPES[delivery_type],
+        reminder_frequency=reminder_frequency,
+        start_time=_datetime(start_time),
+        expiry_time=_datetime(expiry_time)
+    )
+    alert.reminders_enabled = bool(reminders_enabled)
+    alert.is_active = bool(is_active)
+    alert.created_at = _datetime(created_at)
+    return alert
+
+def user_to_row(user: User) -> tuple:
+    return (user.user_id, user.name, user.email, user.role.value, user.phone)
+
+def user_from_row(row: tuple) -> User:
+    user_id, name, email, role, phone = row
+    return User(user_id, name, email, _ROLES[role], phone=phone)
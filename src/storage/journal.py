@@ -0,0 +1,225 @@
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Iterator, List, Optional, Tuple
+
+from utils.logger import get_logger
+from utils.settings import load_settings
+
+logger = get_logger(__name__)
+
+# length, crc32 of the payload, sequence number, record type
+_HEADER = struct.Struct("<IIQB")
+_SEGMENT_PREFIX = "journal-"
+_SEGMENT_SUFFIX = ".log"
+
+class Journal:
+    """Append-only log of mutations with group commit
+
+    append() pickles a record into an in-memory group and returns its
+    sequence number without touching the disk. A background thread writes
+    the group with one write and one fsync once it holds
+    group_commit_records records or its oldest record is group_commit_ms
+    old, so a burst of mutations shares a single fsync. Callers that need a
+    record on disk before they continue call wait(seq) or flush().
+
+    The log is split into segment files named after their first sequence
+    number; rotate() starts a new one so segments covered by a snapshot can
+    be deleted. A torn record at the end of a segment is dropped on open.
+    """
+
+    def __init__(self, directory: str, group_commit_ms: Optional[float] = None,
+                 group_commit_records: Optional[int] = None):
+        settings = load_settings()
+        self.directory = directory
+        self.group_commit_ms = group_commit_ms if group_commit_ms is not None else (
+            settings.JOURNAL_GROUP_COMMIT_MS if settings else 5)
+        self.group_commit_records = group_commit_records or (
+            settings.JOURNAL_GROUP_COMMIT_RECORDS if settings else 1000)
+        os.makedirs(directory, exist_ok=True)
+
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()  # serialises writes to the segment file
+        self._buffer: List[bytes] = []
+        self._buffer_started = 0.0
+        self._closed = False
+        self._fsync_count = 0
+
+        self._last_seq = self._recover_last_segment()
+        self._durable_seq = self._last_seq
+        self._file = self._open_segment(self._last_seq + 1)
+
+        self._flusher = threading.Thread(target=self._run, name="journal-flusher", daemon=True)
+        self._flusher.start()
+
+    # Segments
+
+    def _segment_path(self, first_seq: int) -> str:
+        return os.path.join(self.directory, f"{_SEGMENT_PREFIX}{first_seq:020d}{_SEGMENT_SUFFIX}")
+
+    def segments(self) -> List[Tuple[int, str]]:
+        """(first sequence number, path) of every segment, oldest first"""
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+                first_seq = int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+                segments.append((first_seq, os.path.join(self.directory, name)))
+        segments.sort()
+        return segments
+
+    def _open_segment(self, first_seq: int):
+        segments = self.segments()
+        if segments and segments[-1][0] <= first_seq:
+            # Keep appending to the newest segment rather than leaving a near-empty file per restart
+            return open(segments[-1][1], "ab")
+        return open(self._segment_path(first_seq), "ab")
+
+    def _recover_last_segment(self) -> int:
+        """Find the last sequence number, truncating a torn record off the newest segment"""
+        segments = self.segments()
+        if not segments:
+            return 0
+        first_seq, path = segments[-1]
+        last_seq, valid_length = first_seq - 1, 0
+        with open(path, "rb") as segment:
+            data = segment.read()
+        for seq, _, _, end in _parse(data):
+            last_seq, valid_length = seq, end
+        if valid_length < len(data):
+            logger.warning("⚠️ Dropping %d bytes of torn journal tail in %s", len(data) - valid_length, path)
+            with open(path, "r+b") as segment:
+                segment.truncate(valid_length)
+        return last_seq
+
+    # Appending
+
+    def append(self, record_type: int, payload: Any) -> int:
+        """Queue a record for the next group commit and return its sequence number"""
+        data = pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+        with self._cond:
+            if self._closed:
+                raise ValueError("Journal is closed")
+            self._last_seq += 1
+            seq = self._last_seq
+            if not self._buffer:
+                self._buffer_started = time.monotonic()
+            self._buffer.append(_HEADER.pack(len(data), zlib.crc32(data), seq, record_type) + data)
+            if len(self._buffer) == 1 or len(self._buffer) >= self.group_commit_records:
+                self._cond.notify_all()
+        return seq
+
+    def wait(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """Block until the record with this sequence number is on disk"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._durable_seq >= seq, timeout)
+
+    def flush(self):
+        """Write and fsync everything appended so far"""
+        with self._io_lock:
+            self._write_pending()
+
+    def _write_pending(self):
+        """Write the current group; the caller holds _io_lock"""
+        with self._cond:
+            pending, self._buffer = self._buffer, []
+            last_seq = self._last_seq
+        if pending:
+            self._file.write(b"".join(pending))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._fsync_count += 1
+        with self._cond:
+            self._durable_seq = max(self._durable_seq, last_seq)
+            self._cond.notify_all()
+
+    def _group_ready(self) -> bool:
+        if not self._buffer:
+            return False
+        if self._closed or len(self._buffer) >= self.group_commit_records:
+            return True
+        return time.monotonic() - self._buffer_started >= self.group_commit_ms / 1000
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._group_ready():
+                    if self._closed:
+                        return
+                    timeout = None
+                    if self._buffer:
+                        timeout = max(0.0, self._buffer_started + self.group_commit_ms / 1000 - time.monotonic())
+                    self._cond.wait(timeout)
+            with self._io_lock:
+                self._write_pending()
+
+    # Snapshots and replay
+
+    def rotate(self) -> int:
+        """Close the current segment and start a new one
+
+        Returns the last sequence number in the closed segment; records
+        appended afterwards land in the new segment.
+        """
+        with self._io_lock:
+            self._write_pending()
+            with self._cond:
+                last_seq = self._durable_seq
+            self._file.close()
+            self._file = open(self._segment_path(last_seq + 1), "ab")
+        return last_seq
+
+    def delete_through(self, seq: int) -> int:
+        """Delete segments holding only records up to seq; returns how many were deleted"""
+        segments = self.segments()
+        deleted = 0
+        for (_, path), (next_first_seq, _) in zip(segments, segments[1:]):
+            if next_first_seq - 1 <= seq:
+                os.remove(path)
+                deleted += 1
+        return deleted
+
+    def replay(self, after_seq: int = 0) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (seq, record type, payload) for every record after after_seq, in order"""
+        self.flush()
+        segments = self.segments()
+        for index, (first_seq, path) in enumerate(segments):
+            if index + 1 < len(segments) and segments[index + 1][0] - 1 <= after_seq:
+                continue  # wholly covered by the snapshot
+            with open(path, "rb") as segment:
+                data = segment.read()
+            for seq, record_type, payload, _ in _parse(data):
+                if seq > after_seq:
+                    yield seq, record_type, pickle.loads(payload)
+
+    def get_last_seq(self) -> int:
+        return self._last_seq
+
+    def get_fsync_count(self) -> int:
+        return self._fsync_count
+
+    def close(self):
+        """Commit the pending group, stop the flusher and close the segment"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        with self._io_lock:
+            self._write_pending()
+            self._file.close()
+
+def _parse(data: bytes) -> Iterator[Tuple[int, int, memoryview, int]]:
+    """Yield (seq, type, payload, end offset) for each intact record, stopping at the first torn one"""
+    view = memoryview(data)
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, crc, seq, record_type = _HEADER.unpack_from(data, offset)
+        start, end = offset + _HEADER.size, offset + _HEADER.size + length
+        if end > len(data) or zlib.crc32(view[start:end]) != crc:
+            return
+        yield seq, record_type, view[start:end], end
+        offset = end
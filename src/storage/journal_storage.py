@@ -0,0 +1,253 @@
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from models.alert import Alert, VisibilityType
+from models.team import Team
+from models.user import User
+from services.preference_store import PreferenceStore
+from storage.base_storage import (
+    StorageBackend, PreferenceRecord, DeliveryRecord,
+    alert_to_row, alert_from_row, user_to_row, user_from_row
+)
+from storage.journal import Journal
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Journal record types; every record except deliveries is an idempotent upsert
+ALERTS, USERS, TEAMS, PREFERENCES, DELIVERIES = range(1, 6)
+
+_SNAPSHOT_PREFIX = "snapshot-"
+_SNAPSHOT_SUFFIX = ".npz"
+
+class _RecoveredState(NamedTuple):
+    alerts: Dict[str, Tuple[tuple, Tuple[str, ...]]]  # alert_id -> (row, target_ids)
+    users: Dict[str, tuple]
+    teams: Dict[str, Tuple[str, Tuple[str, ...]]]  # team_id -> (name, member_ids)
+    preferences: Optional[dict]  # snapshot columns and id lists, None without a snapshot
+    tail_preferences: List[tuple]  # preference records journaled after the snapshot
+
+class JournalStorage(StorageBackend):
+    """Durable storage as an append-only journal plus periodic snapshots
+
+    Every write becomes one journal record, group-committed by Journal, so
+    mutations cost a pickle and a buffer append rather than an fsync each.
+    snapshot() writes the services' whole state compactly (preference
+    columns as raw NumPy arrays) and deletes the journal segments it
+    covers, so a restart loads the latest snapshot and replays only the
+    journal tail.
+
+    The query methods answer from the recovered state and scan it; they
+    exist for recovery and tests, not for serving traffic. Delivery history
+    only reaches back to the last snapshot.
+    """
+
+    def __init__(self, directory: str, group_commit_ms: Optional[float] = None,
+                 group_commit_records: Optional[int] = None):
+        self.directory = directory
+        self._journal = Journal(directory, group_commit_ms, group_commit_records)
+        self._recovered: Optional[_RecoveredState] = None
+        self._snapshot_lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, database_url: str) -> 'JournalStorage':
+        """Open storage from a journal:///directory URL"""
+        prefix = "journal:///"
+        if not database_url.startswith(prefix):
+            raise ValueError(f"Unsupported database URL: {database_url}")
+        return cls(database_url[len(prefix):])
+
+    @property
+    def journal(self) -> Journal:
+        return self._journal
+
+    def _append(self, record_type: int, payload) -> int:
+        self._recovered = None
+        return self._journal.append(record_type, payload)
+
+    # Writes
+
+    def save_alerts(self, alerts: List[Alert]):
+        self._append(ALERTS, [(alert_to_row(alert), tuple(alert.visibility.target_ids)) for alert in alerts])
+
+    def save_users(self, users: List[User]):
+        self._append(USERS, [user_to_row(user) for user in users])
+
+    def save_team(self, team: Team):
+        self.save_teams([team])
+
+    def save_teams(self, teams: List[Team]):
+        self._append(TEAMS, [(team.team_id, team.name, tuple(team.member_ids)) for team in teams])
+
+    def save_preferences(self, records: List[PreferenceRecord]):
+        self._append(PREFERENCES, [tuple(record) for record in records])
+
+    def append_deliveries(self, records: List[DeliveryRecord]):
+        self._append(DELIVERIES, [tuple(record) for record in records])
+
+    # Snapshots
+
+    def _snapshot_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{_SNAPSHOT_PREFIX}{seq:020d}{_SNAPSHOT_SUFFIX}")
+
+    def _snapshots(self) -> List[Tuple[int, str]]:
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if name.startswith(_SNAPSHOT_PREFIX) and name.endswith(_SNAPSHOT_SUFFIX):
+                seq = int(name[len(_SNAPSHOT_PREFIX):-len(_SNAPSHOT_SUFFIX)])
+                snapshots.append((seq, os.path.join(self.directory, name)))
+        snapshots.sort()
+        return snapshots
+
+    def snapshot(self, alert_service, notification_service) -> int:
+        """Write the services' state and drop the journal it supersedes
+
+        The journal is rotated first, so every record up to the returned
+        sequence number is already reflected in memory. Records appended
+        while the state is being copied are replayed again on restart,
+        which is harmless because they are upserts.
+        """
+        with self._snapshot_lock:
+            start = time.perf_counter()
+            seq = self._journal.rotate()
+            teams = alert_service.get_all_teams()
+            state = {
+                'alerts': [(alert_to_row(alert), tuple(alert.visibility.target_ids))
+                           for alert in alert_service.list_all_alerts()],
+                'users': [user_to_row(user) for user in alert_service.get_all_users()],
+                'teams': [(team_id, alert_service.get_team(team_id).name, tuple(member_ids))
+                          for team_id, member_ids in teams.items()],
+            }
+            preferences = notification_service.export_preferences()
+            state['user_ids'] = preferences['user_ids']
+            state['alert_ids'] = preferences['alert_ids']
+
+            arrays = dict(preferences['columns'])
+            arrays['state'] = np.frombuffer(pickle.dumps(state, pickle.HIGHEST_PROTOCOL), np.uint8)
+            self._write_atomically(self._snapshot_path(seq), arrays)
+
+            for old_seq, path in self._snapshots():
+                if old_seq < seq:
+                    os.remove(path)
+            deleted = self._journal.delete_through(seq)
+            logger.info("✅ Snapshot at journal seq %d in %.2fs, dropped %d journal segments",
+                        seq, time.perf_counter() - start, deleted)
+            return seq
+
+    def _write_atomically(self, path: str, arrays: Dict[str, np.ndarray]):
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as snapshot_file:
+            np.savez(snapshot_file, **arrays)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary, path)
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    # Recovery
+
+    def _recover(self) -> _RecoveredState:
+        """Latest snapshot plus the journal tail after it, cached until the next write"""
+        recovered = self._recovered
+        if recovered is not None:
+            return recovered
+
+        alerts, users, teams, preferences, snapshot_seq = {}, {}, {}, None, 0
+        snapshots = self._snapshots()
+        if snapshots:
+            snapshot_seq, path = snapshots[-1]
+            with np.load(path) as arrays:
+                state = pickle.loads(arrays['state'].tobytes())
+                preferences = {
+                    'columns': {name: arrays[name] for name in arrays.files if name != 'state'},
+                    'user_ids': state['user_ids'],
+                    'alert_ids': state['alert_ids']
+                }
+            alerts = {row[0]: (row, target_ids) for row, target_ids in state['alerts']}
+            users = {row[0]: row for row in state['users']}
+            teams = {team_id: (name, member_ids) for team_id, name, member_ids in state['teams']}
+
+        tail_preferences = []
+        replayed = 0
+        for _, record_type, payload in self._journal.replay(snapshot_seq):
+            replayed += 1
+            if record_type == ALERTS:
+                alerts.update((row[0], (row, target_ids)) for row, target_ids in payload)
+            elif record_type == USERS:
+                users.update((row[0], row) for row in payload)
+            elif record_type == TEAMS:
+                teams.update((team_id, (name, member_ids)) for team_id, name, member_ids in payload)
+            elif record_type == PREFERENCES:
+                tail_preferences.extend(payload)
+
+        logger.info("✅ Recovered from snapshot seq %d plus %d journal records", snapshot_seq, replayed)
+        recovered = _RecoveredState(alerts, users, teams, preferences, tail_preferences)
+        self._recovered = recovered
+        return recovered
+
+    def load_alerts(self) -> List[Alert]:
+        rows = sorted(self._recover().alerts.values(), key=lambda entry: entry[0][12])
+        return [alert_from_row(row, target_ids) for row, target_ids in rows]
+
+    def get_alert_ids_for_target(self, visibility_type: VisibilityType, target_id: Optional[str] = None) -> List[str]:
+        matches = []
+        for row, target_ids in self._recover().alerts.values():
+            if row[5] == visibility_type.value and (visibility_type == VisibilityType.ORGANIZATION
+                                                    or target_id in target_ids):
+                matches.append(row[0])
+        return matches
+
+    def load_users(self) -> List[User]:
+        return [user_from_row(row) for row in self._recover().users.values()]
+
+    def load_teams(self) -> List[Team]:
+        teams = []
+        for team_id, (name, member_ids) in self._recover().teams.items():
+            team = Team(team_id, name)
+            team.member_ids.update(member_ids)
+            teams.append(team)
+        return teams
+
+    def load_preference_store(self, store: PreferenceStore) -> int:
+        """Load snapshot columns in bulk, then the journaled tail on top"""
+        recovered = self._recover()
+        if recovered.preferences is not None:
+            store.load_columns(**recovered.preferences)
+        store.load_records(recovered.tail_preferences)
+        # Preferences load last at startup; don't keep a second copy of the columns around
+        self._recovered = None
+        return len(store)
+
+    def load_preferences(self) -> Iterable[PreferenceRecord]:
+        store = PreferenceStore()
+        self.load_preference_store(store)
+        return map(PreferenceRecord._make, store.to_records(np.arange(len(store))))
+
+    def get_preferences_for_user(self, user_id: str, status: Optional[str] = None) -> List[PreferenceRecord]:
+        return [record for record in self.load_preferences()
+                if record.user_id == user_id and (status is None or record.status == status)]
+
+    def get_deliveries_between(self, start: datetime, end: datetime) -> List[DeliveryRecord]:
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        deliveries = [
+            DeliveryRecord._make(record)
+            for _, record_type, payload in self._journal.replay()
+            if record_type == DELIVERIES
+            for record in payload
+            if start_ts <= record[4] < end_ts
+        ]
+        deliveries.sort(key=lambda record: record.delivered_at)
+        return deliveries
+
+    def close(self):
+        """Commit the pending group and close the journal"""
+        self._journal.close()
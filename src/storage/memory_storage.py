@@ -0,0 +1,113 @@
+import bisect
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models.alert import Alert, VisibilityType
+from models.team import Team
+from models.user import User
+from storage.base_storage import (
+    StorageBackend, PreferenceRecord, DeliveryRecord,
+    alert_to_row, alert_from_row, user_to_row, user_from_row
+)
+
+class MemoryStorage(StorageBackend):
+    """Dict-backed storage; nothing survives a restart
+
+    Rows are kept as plain tuples so saved objects are snapshots, as they
+    would be in a database, and later changes to them are not visible until
+    saved again.
+    """
+
+    def __init__(self):
+        self._alerts: Dict[str, Tuple[tuple, Tuple[str, ...]]] = {}  # alert_id -> (row, target_ids)
+        self._alert_targets: Dict[Tuple[str, Optional[str]], Set[str]] = {}  # (type, target) -> alert_ids
+        self._users: Dict[str, tuple] = {}
+        self._teams: Dict[str, Tuple[str, Tuple[str, ...]]] = {}  # team_id -> (name, member_ids)
+        self._preferences: Dict[Tuple[str, str], PreferenceRecord] = {}
+        self._preferences_by_user: Dict[str, Set[str]] = {}  # user_id -> alert_ids
+        self._delivery_times: List[float] = []
+        self._deliveries: List[DeliveryRecord] = []
+        self._lock = threading.Lock()
+
+    def save_alerts(self, alerts: List[Alert]):
+        with self._lock:
+            for alert in alerts:
+                previous = self._alerts.get(alert.alert_id)
+                if previous:
+                    for key in self._target_keys(previous[0][5], previous[1]):
+                        self._alert_targets[key].discard(alert.alert_id)
+
+                row = alert_to_row(alert)
+                target_ids = tuple(alert.visibility.target_ids)
+                self._alerts[alert.alert_id] = (row, target_ids)
+                for key in self._target_keys(row[5], target_ids):
+                    self._alert_targets.setdefault(key, set()).add(alert.alert_id)
+
+    @staticmethod
+    def _target_keys(visibility_type: str, target_ids: Iterable[str]) -> List[Tuple[str, Optional[str]]]:
+        if visibility_type == VisibilityType.ORGANIZATION.value:
+            return [(visibility_type, None)]
+        return [(visibility_type, target_id) for target_id in target_ids]
+
+    def load_alerts(self) -> List[Alert]:
+        alerts = [alert_from_row(row, target_ids) for row, target_ids in self._alerts.values()]
+        alerts.sort(key=lambda alert: alert.created_at)
+        return alerts
+
+    def get_alert_ids_for_target(self, visibility_type: VisibilityType, target_id: Optional[str] = None) -> List[str]:
+        if visibility_type == VisibilityType.ORGANIZATION:
+            target_id = None
+        return list(self._alert_targets.get((visibility_type.value, target_id), ()))
+
+    def save_users(self, users: List[User]):
+        with self._lock:
+            for user in users:
+                self._users[user.user_id] = user_to_row(user)
+
+    def load_users(self) -> List[User]:
+        return [user_from_row(row) for row in self._users.values()]
+
+    def save_team(self, team: Team):
+        self.save_teams([team])
+
+    def save_teams(self, teams: List[Team]):
+        with self._lock:
+            for team in teams:
+                self._teams[team.team_id] = (team.name, tuple(team.member_ids))
+
+    def load_teams(self) -> List[Team]:
+        teams = []
+        for team_id, (name, member_ids) in self._teams.items():
+            team = Team(team_id, name)
+            team.member_ids.update(member_ids)
+            teams.append(team)
+        return teams
+
+    def save_preferences(self, records: List[PreferenceRecord]):
+        with self._lock:
+            for record in records:
+                self._preferences[(record.user_id, record.alert_id)] = record
+                self._preferences_by_user.setdefault(record.user_id, set()).add(record.alert_id)
+
+    def load_preferences(self) -> Iterable[PreferenceRecord]:
+        return list(self._preferences.values())
+
+    def get_preferences_for_user(self, user_id: str, status: Optional[str] = None) -> List[PreferenceRecord]:
+        records = [self._preferences[(user_id, alert_id)] for alert_id in self._preferences_by_user.get(user_id, ())]
+        if status is not None:
+            records = [record for record in records if record.status == status]
+        return records
+
+    def append_deliveries(self, records: List[DeliveryRecord]):
+        with self._lock:
+            for record in records:
+                # Deliveries almost always arrive in time order, so this is usually an append
+                position = bisect.bisect_right(self._delivery_times, record.delivered_at)
+                self._delivery_times.insert(position, record.delivered_at)
+                self._deliveries.insert(position, record)
+
+    def get_deliveries_between(self, start: datetime, end: datetime) -> List[DeliveryRecord]:
+        low = bisect.bisect_left(self._delivery_times, start.timestamp())
+        high = bisect.bisect_left(self._delivery_times, end.timestamp())
+        return self._deliveries[low:high]
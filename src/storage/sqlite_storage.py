@@ -0,0 +1,235 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from models.alert import Alert, VisibilityType
+from models.team import Team
+from models.user import User
+from storage.base_storage import (
+    StorageBackend, PreferenceRecord, DeliveryRecord,
+    alert_to_row, alert_from_row, user_to_row, user_from_row
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    alert_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    created_by TEXT NOT NULL,
+    visibility_type TEXT NOT NULL,
+    delivery_type TEXT NOT NULL,
+    reminder_frequency INTEGER NOT NULL,
+    reminders_enabled INTEGER NOT NULL,
+    is_active INTEGER NOT NULL,
+    start_time REAL,
+    expiry_time REAL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS alert_targets (
+    alert_id TEXT NOT NULL,
+    visibility_type TEXT NOT NULL,
+    target_id TEXT NOT NULL,
+    PRIMARY KEY (alert_id, target_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_alert_targets_target ON alert_targets (visibility_type, target_id);
+CREATE INDEX IF NOT EXISTS idx_alerts_visibility ON alerts (visibility_type);
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    role TEXT NOT NULL,
+    phone TEXT
+);
+CREATE TABLE IF NOT EXISTS teams (
+    team_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS team_members (
+    team_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    PRIMARY KEY (team_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS preferences (
+    user_id TEXT NOT NULL,
+    alert_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    snoozed_until REAL,
+    last_reminded_at REAL,
+    read_at REAL,
+    created_at REAL NOT NULL,
+    first_delivered_at REAL,
+    PRIMARY KEY (user_id, alert_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_preferences_user_status ON preferences (user_id, status);
+CREATE TABLE IF NOT EXISTS deliveries (
+    user_id TEXT NOT NULL,
+    alert_id TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    status TEXT NOT NULL,
+    delivered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deliveries_time ON deliveries (delivered_at);
+"""
+
+# Statements are module constants so each connection's statement cache reuses them
+_UPSERT_ALERT = "INSERT OR REPLACE INTO alerts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_DELETE_TARGETS = "DELETE FROM alert_targets WHERE alert_id = ?"
+_INSERT_TARGET = "INSERT OR IGNORE INTO alert_targets VALUES (?, ?, ?)"
+_SELECT_ALERTS = "SELECT * FROM alerts ORDER BY created_at"
+_SELECT_TARGETS = "SELECT alert_id, target_id FROM alert_targets"
+_SELECT_ORG_ALERT_IDS = "SELECT alert_id FROM alerts WHERE visibility_type = ?"
+_SELECT_TARGET_ALERT_IDS = "SELECT alert_id FROM alert_targets WHERE visibility_type = ? AND target_id = ?"
+_UPSERT_USER = "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?)"
+_SELECT_USERS = "SELECT * FROM users"
+_UPSERT_TEAM = "INSERT OR REPLACE INTO teams VALUES (?, ?)"
+_DELETE_MEMBERS = "DELETE FROM team_members WHERE team_id = ?"
+_INSERT_MEMBER = "INSERT INTO team_members VALUES (?, ?)"
+_SELECT_TEAMS = "SELECT team_id, name FROM teams"
+_SELECT_MEMBERS = "SELECT team_id, user_id FROM team_members"
+_UPSERT_PREFERENCE = "INSERT OR REPLACE INTO preferences VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_SELECT_PREFERENCES = "SELECT * FROM preferences"
+_SELECT_USER_PREFERENCES = "SELECT * FROM preferences WHERE user_id = ?"
+_SELECT_USER_PREFERENCES_BY_STATUS = "SELECT * FROM preferences WHERE user_id = ? AND status = ?"
+_INSERT_DELIVERY = "INSERT INTO deliveries VALUES (?, ?, ?, ?, ?)"
+_SELECT_DELIVERIES = "SELECT * FROM deliveries WHERE delivered_at >= ? AND delivered_at < ? ORDER BY delivered_at"
+
+class SQLiteStorage(StorageBackend):
+    """SQLite storage running in WAL mode with one connection per thread
+
+    WAL lets readers proceed while a writer commits, and synchronous=NORMAL
+    only syncs at checkpoints. Every bulk call is one transaction.
+    """
+
+    STATEMENT_CACHE_SIZE = 128
+
+    def __init__(self, path: str):
+        if not path or path == ":memory:" or path.startswith("file::memory:"):
+            # Every thread opens its own connection, and each would get its own empty database
+            raise ValueError("SQLite storage needs a database file; use memory:// for in-memory storage")
+        self.path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._connection().executescript(_SCHEMA)
+        logger.info("✅ SQLite storage ready at %s", path)
+
+    @classmethod
+    def from_url(cls, database_url: str) -> 'SQLiteStorage':
+        """Open storage from a sqlite:///path URL"""
+        prefix = "sqlite:///"
+        if not database_url.startswith(prefix):
+            raise ValueError(f"Unsupported database URL: {database_url}")
+        return cls(database_url[len(prefix):])
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False,
+                                         cached_statements=self.STATEMENT_CACHE_SIZE)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+
+    def save_alerts(self, alerts: List[Alert]):
+        with self._transaction() as connection:
+            connection.executemany(_UPSERT_ALERT, [alert_to_row(alert) for alert in alerts])
+            connection.executemany(_DELETE_TARGETS, [(alert.alert_id,) for alert in alerts])
+            connection.executemany(_INSERT_TARGET, [
+                (alert.alert_id, alert.visibility.type.value, target_id)
+                for alert in alerts if alert.visibility.type != VisibilityType.ORGANIZATION
+                for target_id in alert.visibility.target_ids
+            ])
+
+    def load_alerts(self) -> List[Alert]:
+        connection = self._connection()
+        targets = {}
+        for alert_id, target_id in connection.execute(_SELECT_TARGETS):
+            targets.setdefault(alert_id, []).append(target_id)
+        return [alert_from_row(row, targets.get(row[0], ())) for row in connection.execute(_SELECT_ALERTS)]
+
+    def get_alert_ids_for_target(self, visibility_type: VisibilityType, target_id: Optional[str] = None) -> List[str]:
+        connection = self._connection()
+        if visibility_type == VisibilityType.ORGANIZATION:
+            rows = connection.execute(_SELECT_ORG_ALERT_IDS, (visibility_type.value,))
+        else:
+            rows = connection.execute(_SELECT_TARGET_ALERT_IDS, (visibility_type.value, target_id))
+        return [alert_id for (alert_id,) in rows]
+
+    def save_users(self, users: List[User]):
+        with self._transaction() as connection:
+            connection.executemany(_UPSERT_USER, [user_to_row(user) for user in users])
+
+    def load_users(self) -> List[User]:
+        return [user_from_row(row) for row in self._connection().execute(_SELECT_USERS)]
+
+    def save_team(self, team: Team):
+        self.save_teams([team])
+
+    def save_teams(self, teams: List[Team]):
+        with self._transaction() as connection:
+            connection.executemany(_UPSERT_TEAM, [(team.team_id, team.name) for team in teams])
+            connection.executemany(_DELETE_MEMBERS, [(team.team_id,) for team in teams])
+            connection.executemany(_INSERT_MEMBER, [
+                (team.team_id, user_id) for team in teams for user_id in team.member_ids
+            ])
+
+    def load_teams(self) -> List[Team]:
+        connection = self._connection()
+        teams = {team_id: Team(team_id, name) for team_id, name in connection.execute(_SELECT_TEAMS)}
+        for team_id, user_id in connection.execute(_SELECT_MEMBERS):
+            teams[team_id].add_member(user_id)
+        return list(teams.values())
+
+    def save_preferences(self, records: List[PreferenceRecord]):
+        with self._transaction() as connection:
+            connection.executemany(_UPSERT_PREFERENCE, records)
+
+    def load_preferences(self) -> Iterable[PreferenceRecord]:
+        cursor = self._connection().execute(_SELECT_PREFERENCES)
+        return map(PreferenceRecord._make, cursor)
+
+    def get_preferences_for_user(self, user_id: str, status: Optional[str] = None) -> List[PreferenceRecord]:
+        connection = self._connection()
+        if status is None:
+            rows = connection.execute(_SELECT_USER_PREFERENCES, (user_id,))
+        else:
+            rows = connection.execute(_SELECT_USER_PREFERENCES_BY_STATUS, (user_id, status))
+        return [PreferenceRecord._make(row) for row in rows]
+
+    def append_deliveries(self, records: List[DeliveryRecord]):
+        with self._transaction() as connection:
+            connection.executemany(_INSERT_DELIVERY, records)
+
+    def get_deliveries_between(self, start: datetime, end: datetime) -> List[DeliveryRecord]:
+        rows = self._connection().execute(_SELECT_DELIVERIES, (start.timestamp(), end.timestamp()))
+        return [DeliveryRecord._make(row) for row in rows]
+
+    def close(self):
+        """Close every thread's connection"""
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
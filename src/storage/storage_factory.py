@@ -0,0 +1,41 @@
+from typing import Optional
+
+from storage.base_storage import StorageBackend
+from storage.journal_storage import JournalStorage
+from storage.memory_storage import MemoryStorage
+from storage.sqlite_storage import SQLiteStorage
+from utils.logger import get_logger
+from utils.settings import load_settings
+
+logger = get_logger(__name__)
+
+class StorageFactory:
+    _backends = {}  # URL scheme -> backend class
+
+    @classmethod
+    def register_backend(cls, scheme: str, backend_class):
+        """Register a storage backend for a database URL scheme"""
+        cls._backends[scheme] = backend_class
+        logger.debug("✅ Registered storage backend: %s -> %s", scheme, backend_class.__name__)
+
+    @classmethod
+    def create_storage(cls, database_url: str) -> StorageBackend:
+        """Create a storage backend from a URL such as sqlite:///alerts.db, journal:///data or memory://"""
+        scheme = database_url.split(":", 1)[0]
+        if scheme not in cls._backends:
+            raise ValueError(f"❌ Unsupported database URL: {database_url}")
+
+        return cls._backends[scheme].from_url(database_url)
+
+    @classmethod
+    def from_settings(cls) -> Optional[StorageBackend]:
+        """Storage from Settings.DATABASE_URL, or None when persistence is disabled"""
+        settings = load_settings()
+        if not settings or not settings.ENABLE_PERSISTENCE:
+            return None
+        return cls.create_storage(settings.DATABASE_URL)
+
+# Initialize with default backends
+StorageFactory.register_backend("memory", MemoryStorage)
+StorageFactory.register_backend("sqlite", SQLiteStorage)
+StorageFactory.register_backend("journal", JournalStorage)
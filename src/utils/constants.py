@@ -7,7 +7,7 @@ DEFAULT_REMINDER_FREQUENCY = 120  # 2 hours
 SNOOZE_DURATION_HOURS = 24
 
 # Delivery types
-SUPPORTED_DELIVERY_TYPES = ["in_app"]
+SUPPORTED_DELIVERY_TYPES = ["in_app", "email", "sms"]
 
 # Severity levels
 SEVERITY_LEVELS = ["info", "warning", "critical"]
@@ -32,7 +32,7 @@ DATE_FORMAT = "%Y-%m-%d"
 TIME_FORMAT = "%H:%M:%S"
 
 # Logging
-LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL", "OFF"]
 
 # API settings
 DEFAULT_PAGE_SIZE = 50
@@ -0,0 +1,56 @@
+import threading
+from typing import Dict, List, Optional
+
+class IdInterner:
+    """Maps external string ids to dense integers and back
+
+    Integers are handed out in first-seen order starting at 0, so they can
+    index arrays directly. Ids are never released.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+        self._lock = threading.Lock()
+
+    def intern(self, value: str) -> int:
+        """Get the integer for an id, assigning the next one if it is new"""
+        index = self._ids.get(value)
+        if index is None:
+            with self._lock:
+                index = self._ids.get(value)
+                if index is None:
+                    index = len(self._strings)
+                    self._strings.append(value)
+                    self._ids[value] = index
+        return index
+
+    def lookup(self, value: str) -> Optional[int]:
+        """Get the integer for an id without assigning one"""
+        return self._ids.get(value)
+
+    def resolve(self, index: int) -> str:
+        """Translate an integer back to its external id"""
+        return self._strings[index]
+
+    def __iter__(self):
+        """External ids in integer order"""
+        return iter(list(self._strings))
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._ids
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+class IdRegistry:
+    """The id interners shared by AlertService and NotificationService
+
+    Each kind of id gets its own dense range, so the integers can index
+    per-kind arrays. External string ids only appear at the API boundary.
+    """
+
+    def __init__(self):
+        self.users = IdInterner()
+        self.alerts = IdInterner()
+        self.teams = IdInterner()
@@ -0,0 +1,80 @@
+import bisect
+from typing import Iterator, List, Optional, Tuple
+
+from models.alert import Alert
+from utils.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+# Alerts are paged by (created_at timestamp, alert_id); the id breaks ties
+AlertKey = Tuple[float, str]
+
+def alert_key(alert: Alert) -> AlertKey:
+    return (alert.created_at.timestamp(), alert.alert_id)
+
+def encode_cursor(key: AlertKey) -> str:
+    """Opaque cursor for the page that follows the alert with this key"""
+    return f"{key[0]!r}_{key[1]}"
+
+def decode_cursor(cursor: str) -> AlertKey:
+    timestamp, separator, alert_id = cursor.partition("_")
+    try:
+        if not separator or not alert_id:
+            raise ValueError
+        return (float(timestamp), alert_id)
+    except ValueError:
+        raise ValueError(f"Invalid page cursor: {cursor!r}") from None
+
+def clamp_page_size(page_size: Optional[int]) -> int:
+    """Fall back to DEFAULT_PAGE_SIZE and keep requests within 1..MAX_PAGE_SIZE"""
+    if page_size is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+class KeysetIndex:
+    """Alert keys kept in sorted order for keyset pagination
+
+    Alerts arrive roughly in created_at order, so adding is usually an
+    append. Reading newest first from a cursor is a bisect and a slice walk.
+    """
+
+    def __init__(self):
+        self._keys: List[AlertKey] = []
+
+    def add(self, key: AlertKey):
+        keys = self._keys
+        if not keys or key > keys[-1]:
+            keys.append(key)
+        else:
+            position = bisect.bisect_left(keys, key)
+            if position == len(keys) or keys[position] != key:
+                keys.insert(position, key)
+
+    def discard(self, key: AlertKey):
+        keys = self._keys
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    def newest_first(self, before: Optional[AlertKey] = None) -> Iterator[AlertKey]:
+        """Keys in descending order, starting just below the cursor key if given"""
+        keys = self._keys
+        end = len(keys) if before is None else bisect.bisect_left(keys, before)
+        return (keys[position] for position in range(end - 1, -1, -1))
+
+    def between(self, start: Optional[float] = None, end: Optional[float] = None) -> List[AlertKey]:
+        """Keys created in [start, end) as timestamps, oldest first; None leaves a side open"""
+        low, high = self._bounds(start, end)
+        return self._keys[low:high]
+
+    def count_between(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        low, high = self._bounds(start, end)
+        return max(0, high - low)
+
+    def _bounds(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        # A 1-tuple sorts before every full key with the same timestamp
+        keys = self._keys
+        low = 0 if start is None else bisect.bisect_left(keys, (start,))
+        high = len(keys) if end is None else bisect.bisect_left(keys, (end,))
+        return low, high
+
+    def __len__(self) -> int:
+        return len(self._keys)
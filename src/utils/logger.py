@@ -0,0 +1,106 @@
+"""
+Leveled event logging for the alerting platform
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, TextIO
+
+from utils.settings import load_settings
+
+LOGGER_NAME = "alerting"
+LOG_FORMAT = "%(message)s"
+OFF = logging.CRITICAL + 10
+
+_root = logging.getLogger(LOGGER_NAME)
+_sink: Optional[logging.Handler] = None
+_records: Optional[queue.SimpleQueue] = None
+_listener: Optional[QueueListener] = None
+_configured = False
+
+class _StdoutHandler(logging.StreamHandler):
+    """Stream handler that always writes to the current sys.stdout"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+def _resolve_level(level: str) -> int:
+    level = level.upper()
+    if level == "OFF":
+        return OFF
+    resolved = logging.getLevelName(level)
+    return resolved if isinstance(resolved, int) else logging.INFO
+
+def _start_listener():
+    global _listener
+    _listener = QueueListener(_records, _sink)
+    _listener.start()
+
+def _stop_listener():
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+def configure_logging(
+    level: Optional[str] = None,
+    async_sink: Optional[bool] = None,
+    stream: Optional[TextIO] = None
+):
+    """Configure the platform logger, defaulting to Settings.LOG_LEVEL and LOG_ASYNC
+
+    With an async sink the calling thread only enqueues records and a
+    listener thread writes them out.
+    """
+    global _sink, _records, _configured
+    settings = load_settings()
+
+    if level is None:
+        level = settings.LOG_LEVEL if settings else os.getenv('LOG_LEVEL', 'INFO')
+    if async_sink is None:
+        async_sink = settings.LOG_ASYNC if settings else True
+
+    _stop_listener()
+    for handler in list(_root.handlers):
+        _root.removeHandler(handler)
+
+    _sink = logging.StreamHandler(stream) if stream else _StdoutHandler()
+    _sink.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    if async_sink:
+        _records = queue.SimpleQueue()
+        _root.addHandler(QueueHandler(_records))
+        _start_listener()
+    else:
+        _records = None
+        _root.addHandler(_sink)
+
+    _root.setLevel(_resolve_level(level))
+    _root.propagate = False
+    _configured = True
+
+def flush_logging():
+    """Write out every record queued so far"""
+    if _listener:
+        # Stopping the listener drains the queue
+        _stop_listener()
+        _start_listener()
+    elif _sink:
+        _sink.flush()
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a platform logger, configuring logging on first use"""
+    if not _configured:
+        configure_logging()
+    return _root.getChild(name)
+
+atexit.register(_stop_listener)
@@ -0,0 +1,69 @@
+import math
+from typing import Dict, List, Optional, Sequence
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch with bounded relative error
+
+    Values are counted in logarithmic buckets (DDSketch style): bucket k
+    covers (gamma^(k-1), gamma^k], so any quantile is returned within
+    relative_accuracy of a value actually seen at that rank. Values are
+    clamped to [min_value, max_value], which caps the number of buckets
+    (about 630 at the default 2% accuracy), so memory stays bounded however
+    many values are added. Sketches with the same settings merge exactly by
+    adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.02, min_value: float = 1e-3, max_value: float = 1e8):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.max_value = max_value
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+
+    def _key(self, value: float) -> int:
+        value = min(max(value, self.min_value), self.max_value)
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, count: int = 1):
+        key = self._key(value)
+        self._counts[key] = self._counts.get(key, 0) + count
+        self.count += count
+        self.total += value * count
+
+    def merge(self, other: 'QuantileSketch'):
+        """Add another sketch's values to this one; both must share their settings"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other._counts.items():
+            self._counts[key] = self._counts.get(key, 0) + count
+        self.count += other.count
+        self.total += other.total
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """Estimates for several quantiles (each in [0, 1]) from one walk over the buckets"""
+        if not self.count:
+            return [None] * len(qs)
+
+        keys = sorted(self._counts)
+        ranks = sorted((q * (self.count - 1), position) for position, q in enumerate(qs))
+        results: List[Optional[float]] = [None] * len(qs)
+        seen, index = 0, 0
+        for rank, position in ranks:
+            while seen + self._counts[keys[index]] <= rank:
+                seen += self._counts[keys[index]]
+                index += 1
+            # Midpoint of the bucket, within relative_accuracy of every value in it
+            results[position] = 2 * self.gamma ** keys[index] / (self.gamma + 1)
+        return results
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def __len__(self) -> int:
+        return len(self._counts)
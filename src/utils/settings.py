@@ -0,0 +1,12 @@
+def load_settings():
+    """The application Settings, or None when the config package is not importable
+
+    Modules read their defaults through this at construction time rather than
+    importing config at import time, so they still work from scripts and
+    tests that only put src on the path.
+    """
+    try:
+        from config.settings import get_settings
+    except ImportError:
+        return None
+    return get_settings()
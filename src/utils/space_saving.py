@@ -0,0 +1,55 @@
+import heapq
+from typing import Dict, Hashable, List, Tuple
+
+class SpaceSaving:
+    """Space-Saving heavy-hitter counter over at most ``capacity`` items
+
+    While fewer than capacity distinct items have been seen, counts are
+    exact. After that a new item takes over the smallest counter, inheriting
+    its count as its possible overcount (error). Any item seen more than
+    total / capacity times is guaranteed to be tracked, and every reported
+    count is at most error above the true one. Updates are amortised
+    O(log capacity); memory is fixed at capacity items.
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        # (count, item) per tracked item; counts may lag behind and are refreshed when popped
+        self._heap: List[Tuple[int, Hashable]] = []
+        self.total = 0
+
+    def add(self, item: Hashable, count: int = 1):
+        self.total += count
+        counts = self._counts
+        if item in counts:
+            counts[item] += count
+            return
+
+        if len(counts) < self.capacity:
+            counts[item] = count
+            self._errors[item] = 0
+            heapq.heappush(self._heap, (count, item))
+            return
+
+        heap = self._heap
+        while True:
+            smallest, victim = heap[0]
+            current = counts[victim]
+            if current == smallest:
+                break
+            heapq.heapreplace(heap, (current, victim))
+        del counts[victim]
+        del self._errors[victim]
+        counts[item] = smallest + count
+        self._errors[item] = smallest
+        heapq.heapreplace(heap, (smallest + count, item))
+
+    def top(self, n: int) -> List[Tuple[Hashable, int, int]]:
+        """(item, count, error) for the n largest counts, largest first; the true count is >= count - error"""
+        largest = heapq.nlargest(n, self._counts.items(), key=lambda entry: entry[1])
+        return [(item, count, self._errors[item]) for item, count in largest]
+
+    def __len__(self) -> int:
+        return len(self._counts)
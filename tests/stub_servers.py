@@ -0,0 +1,174 @@
+"""
+Local stand-ins for external delivery gateways, used by tests and benchmarks
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import socketserver
+import threading
+import time
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib: EHLO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+
+        self._reply(b"220 stub ESMTP")
+        recipients = []
+        data = None
+        sent = 0
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+
+            if data is not None:
+                if line in (b".\r\n", b".\n"):
+                    if server.delay:
+                        time.sleep(server.delay)
+                    with server.lock:
+                        server.messages.append((list(recipients), b"".join(data)))
+                    recipients, data = [], None
+                    self._reply(b"250 OK")
+                    sent += 1
+                    if server.messages_per_connection and sent >= server.messages_per_connection:
+                        return  # per-connection message limit reached; hang up
+                else:
+                    data.append(line)
+                continue
+
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self._reply(b"250-stub\r\n250 PIPELINING")
+            elif command == b"RCPT":
+                address = line.split(b":", 1)[1].strip().strip(b"<>").decode()
+                if address in server.rejected:
+                    self._reply(b"550 No such user")
+                else:
+                    recipients.append(address)
+                    self._reply(b"250 OK")
+            elif command == b"DATA":
+                data = []
+                self._reply(b"354 End data with <CR><LF>.<CR><LF>")
+            elif command in (b"MAIL", b"RSET"):
+                recipients = []
+                self._reply(b"250 OK")
+            elif command in (b"HELO", b"NOOP"):
+                self._reply(b"250 OK")
+            elif command == b"QUIT":
+                self._reply(b"221 Bye")
+                return
+            else:
+                self._reply(b"500 Unrecognised command")
+
+    def _reply(self, reply: bytes):
+        self.wfile.write(reply + b"\r\n")
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    """In-process SMTP server that records every accepted message"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.delay = delay  # seconds spent per message, to mimic a remote relay
+        self.rejected = set()
+        self.messages_per_connection = 0  # hang up after this many messages, 0 for no limit
+        self.messages = []
+        self.connections = 0
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+class _GatewayHandler(BaseHTTPRequestHandler):
+    """Bulk SMS API: POST {"from", "text", "to": [numbers]}, one result per number"""
+
+    protocol_version = "HTTP/1.1"  # keep connections alive between requests
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if server.delay:
+            time.sleep(server.delay)
+
+        with server.lock:
+            server.requests.append(payload)
+            failing = server.fail_requests > 0
+            if failing:
+                server.fail_requests -= 1
+
+        if failing:
+            self._respond(503, {'error': 'unavailable'})
+            return
+
+        results = []
+        for number in payload['to']:
+            if number in server.rejected:
+                results.append({'to': number, 'status': 'rejected', 'error': 'invalid number'})
+            else:
+                results.append({'to': number, 'status': 'accepted', 'id': f"msg-{len(server.requests)}-{number}"})
+        self._respond(200, {'results': results})
+
+    def _respond(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubSMSGateway(ThreadingHTTPServer):
+    """In-process bulk SMS gateway that records every request"""
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _GatewayHandler)
+        self.delay = delay  # seconds spent per request, to mimic a remote gateway
+        self.rejected = set()
+        self.fail_requests = 0  # answer this many requests with HTTP 503
+        self.requests = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/messages"
+
+    @property
+    def messages_sent(self) -> int:
+        return sum(len(request['to']) for request in self.requests)
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -1,6 +1,7 @@
 import unittest
 import sys
 import os
+from datetime import datetime
 
 # Add src to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -37,6 +38,16 @@ class TestAdminAPI(unittest.TestCase):
         self.assertEqual(alert.title, "API Test Alert")
         self.assertEqual(alert.severity, Severity.CRITICAL)
     
+    def test_create_alerts_bulk(self):
+        alerts = self.admin_api.create_alerts_bulk([
+            dict(title=f"Bulk {i}", message="Testing API", severity=Severity.INFO, created_by="admin1",
+                 visibility_type=VisibilityType.ORGANIZATION, target_ids=set())
+            for i in range(3)
+        ])
+        
+        self.assertEqual([alert.title for alert in alerts], ["Bulk 0", "Bulk 1", "Bulk 2"])
+        self.assertEqual(len(self.admin_api.list_alerts()), 3)
+    
     def test_list_alerts(self):
         # Create some alerts
         self.admin_api.create_alert(
@@ -66,6 +77,22 @@ class TestAdminAPI(unittest.TestCase):
         self.assertEqual(len(info_alerts), 1)
         self.assertEqual(info_alerts[0].severity, Severity.INFO)
     
+    def test_list_alerts_page(self):
+        for i in range(5):
+            self.admin_api.create_alert(f"Alert {i}", "Message", Severity.INFO, "admin1",
+                                        VisibilityType.ORGANIZATION, set())
+        
+        first = self.admin_api.list_alerts_page(page_size=2)
+        second = self.admin_api.list_alerts_page(cursor=first['next_cursor'], page_size=2)
+        last = self.admin_api.list_alerts_page(cursor=second['next_cursor'], page_size=2)
+        
+        titles = [a.title for page in (first, second, last) for a in page['alerts']]
+        self.assertEqual(sorted(titles), [f"Alert {i}" for i in range(5)])
+        self.assertIsNone(last['next_cursor'])
+        self.assertEqual(len(self.admin_api.list_alerts_page(page_size=0)['alerts']), 1)
+        with self.assertRaises(ValueError):
+            self.admin_api.list_alerts_page(cursor="not-a-cursor")
+    
     def test_alert_metrics(self):
         # Create alerts for metrics
         self.admin_api.create_alert(
@@ -146,6 +173,19 @@ class TestUserAPI(unittest.TestCase):
         self.assertIn('status', alert_data)
         self.assertIn('severity', alert_data)
     
+    def test_get_alerts_page(self):
+        first = self.user_api.get_alerts_page("user1", page_size=1)
+        self.assertEqual(len(first['alerts']), 1)
+        self.assertIsNotNone(first['next_cursor'])
+        
+        second = self.user_api.get_alerts_page("user1", cursor=first['next_cursor'], page_size=1)
+        self.assertIsNone(second['next_cursor'])
+        
+        # Pages line up with the full newest-first listing
+        paged = [a['alert_id'] for a in first['alerts'] + second['alerts']]
+        self.assertEqual(paged, [a['alert_id'] for a in self.user_api.get_alerts("user1")])
+        self.assertEqual(self.user_api.get_alerts_page("user2")['next_cursor'], None)
+    
     def test_user_actions(self):
         user_alerts = self.user_api.get_alerts("user1")
         alert_id = user_alerts[0]['alert_id']
@@ -166,7 +206,17 @@ class TestUserAPI(unittest.TestCase):
         snoozed_alerts = self.user_api.get_snoozed_alerts("user1")
         self.assertEqual(len(snoozed_alerts), 1)
         self.assertEqual(snoozed_alerts[0]['alert_id'], alert_id2)
-    
+
+    def test_user_actions_require_visibility(self):
+        team_alert = next(a for a in self.user_api.get_alerts("user1") if a['visibility_type'] == 'team')
+
+        # User2 is not in engineering, so none of the actions apply
+        self.assertFalse(self.user_api.mark_alert_read("user2", team_alert['alert_id']))
+        self.assertFalse(self.user_api.mark_alert_unread("user2", team_alert['alert_id']))
+        self.assertFalse(self.user_api.snooze_alert("user2", team_alert['alert_id']))
+        self.assertFalse(self.user_api.mark_alert_read("user1", "missing"))
+        self.assertTrue(self.user_api.mark_alert_read("user1", team_alert['alert_id']))
+
     def test_user_dashboard(self):
         dashboard = self.user_api.get_user_dashboard("user1")
         
@@ -179,6 +229,15 @@ class TestUserAPI(unittest.TestCase):
         self.assertIn('total_alerts', summary)
         self.assertIn('unread_alerts', summary)
         self.assertIn('snoozed_alerts', summary)
+        self.assertEqual((summary['total_alerts'], summary['unread_alerts']), (2, 2))
+        
+        # Actions are reflected in the counters and lists
+        team_alert = dashboard['recent_alerts'][0]
+        self.user_api.snooze_alert("user1", team_alert['alert_id'])
+        dashboard = self.user_api.get_user_dashboard("user1")
+        self.assertEqual((dashboard['summary']['unread_alerts'], dashboard['summary']['snoozed_alerts']), (1, 1))
+        self.assertEqual([a['alert_id'] for a in dashboard['snoozed_alerts']], [team_alert['alert_id']])
+        self.assertTrue(dashboard['snoozed_alerts'][0]['is_snoozed'])
 
 class TestAnalyticsAPI(unittest.TestCase):
     
@@ -238,6 +297,26 @@ class TestAnalyticsAPI(unittest.TestCase):
         self.assertIn('severity_trends', analytics)
         self.assertIn('top_alert_creators', analytics)
         self.assertIn('most_active_teams', analytics)
+        self.assertEqual(analytics['top_alert_creators'], [{'user_id': 'admin1', 'alert_count': 2}])
+        self.assertEqual(analytics['most_active_teams'], [{'team_id': 'engineering', 'alert_count': 1}])
+    
+    def test_creation_trend(self):
+        trend = self.analytics_api.get_system_metrics()['alerts']['creation_trend']
+        
+        # One entry per day for the last week, ending today
+        self.assertEqual(len(trend), 7)
+        self.assertEqual(trend[-1], {'date': datetime.now().strftime("%Y-%m-%d"), 'count': 2})
+        self.assertEqual(sum(day['count'] for day in trend), 2)
+    
+    def test_apis_share_one_aggregator_and_cache(self):
+        observers = len(self.alert_service._observers)
+        admin_api = AdminAPI(self.alert_service)
+        analytics_api = AnalyticsAPI(self.alert_service, self.notification_service)
+        
+        self.assertIs(admin_api.metrics, self.analytics_api.metrics)
+        self.assertIs(analytics_api.metrics, self.analytics_api.metrics)
+        self.assertIs(analytics_api.cache, self.analytics_api.cache)
+        self.assertEqual(len(self.alert_service._observers), observers)
     
     def test_user_analytics(self):
         analytics = self.analytics_api.get_user_analytics()
@@ -245,6 +324,27 @@ class TestAnalyticsAPI(unittest.TestCase):
         self.assertIn('user_counts', analytics)
         self.assertIn('engagement', analytics)
         self.assertIn('team_distribution', analytics)
+        
+        # user1 got both alerts, user2 and admin1 only the organisation-wide one
+        self.assertEqual(analytics['top_recipients'][0], {'user_id': 'user1', 'delivery_count': 2})
+        self.assertEqual(len(analytics['top_recipients']), 3)
+    
+    def test_report_sections_are_cached_until_an_alert_event(self):
+        metrics = self.analytics_api.get_system_metrics()
+        self.assertIs(self.analytics_api.get_system_metrics(), metrics)
+        
+        self.alert_service.create_alert(
+            title="Another Alert",
+            message="Another message",
+            severity=Severity.WARNING,
+            created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION,
+            target_ids=set()
+        )
+        self.assertEqual(self.analytics_api.get_system_metrics()['alerts']['total'], 3)
+        
+        stats = self.analytics_api.get_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
     
     def test_generate_report(self):
         report = self.analytics_api.generate_report("weekly")
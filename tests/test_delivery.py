@@ -0,0 +1,248 @@
+import unittest
+import unittest.mock
+import sys
+import os
+import http.client
+import smtplib
+import time
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.delivery.delivery_factory import DeliveryFactory
+from services.delivery.email_delivery import EmailDeliveryChannel
+from services.delivery.sms_delivery import HTTPConnectionPool, SmsDeliveryChannel, TokenBucket
+from models.user import User
+from models.alert import Alert, AlertVisibility, Severity, VisibilityType, DeliveryType
+from tests.stub_servers import StubSMTPServer, StubSMSGateway
+
+class TestEmailDeliveryChannel(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubSMTPServer().start()
+        self.channel = EmailDeliveryChannel(host="127.0.0.1", port=self.server.port,
+                                            sender="alerts@example.com", pool_size=3)
+        self.alert = Alert("alert1", "Disk full", "Volume /data is at 99%", Severity.CRITICAL,
+                           "admin1", AlertVisibility(VisibilityType.ORGANIZATION, set()),
+                           DeliveryType.EMAIL)
+        self.users = [User(f"user{i}", f"User {i}", f"user{i}@example.com") for i in range(30)]
+
+    def tearDown(self):
+        self.channel.close()
+        self.server.stop()
+
+    def test_factory_registers_email(self):
+        """Test that the factory builds an email channel"""
+        self.assertTrue(DeliveryFactory.is_channel_supported(DeliveryType.EMAIL))
+        channel = DeliveryFactory.create_channel(DeliveryType.EMAIL)
+        self.assertEqual(channel.get_channel_type(), "email")
+
+    def test_send_batch_delivers_one_message_per_recipient(self):
+        """Test that a batch reaches every recipient over the pooled connections"""
+        results = self.channel.send_batch(self.users, self.alert)
+
+        self.assertEqual([r.user_id for r in results], [u.user_id for u in self.users])
+        self.assertTrue(all(results))
+        self.assertEqual(len(self.server.messages), 30)
+        self.assertLessEqual(self.server.connections, 3)
+
+        recipients, body = self.server.messages[0]
+        self.assertIn(b"To: " + recipients[0].encode(), body)
+        self.assertIn(b"Subject: [CRITICAL] Disk full", body)
+
+    def test_connections_are_reused_across_batches(self):
+        """Test that later batches reuse the open connections"""
+        self.channel.send_batch(self.users, self.alert)
+        self.channel.send_batch(self.users, self.alert)
+        self.channel.send(self.users[0], self.alert)
+
+        self.assertEqual(len(self.server.messages), 61)
+        self.assertLessEqual(self.server.connections, 3)
+
+    def test_rejected_recipient_does_not_fail_batch(self):
+        """Test that one refused address only fails that recipient"""
+        self.server.rejected.add("user5@example.com")
+
+        results = self.channel.send_batch(self.users, self.alert)
+
+        failed = [r.user_id for r in results if not r]
+        self.assertEqual(failed, ["user5"])
+        self.assertEqual(len(self.server.messages), 29)
+
+    def test_server_hanging_up_every_few_messages(self):
+        """Test that each dropped connection only costs a reconnect, not the rest of the batch"""
+        self.server.messages_per_connection = 5
+        channel = EmailDeliveryChannel(host="127.0.0.1", port=self.server.port,
+                                       sender="alerts@example.com", pool_size=1)
+        self.addCleanup(channel.close)
+
+        results = channel.send_batch(self.users, self.alert)
+
+        self.assertTrue(all(results))
+        self.assertEqual(len(self.server.messages), 30)
+        self.assertEqual(self.server.connections, 6)
+
+    def test_other_smtp_errors_only_fail_that_recipient(self):
+        """Test that any SMTP error reply is a per-recipient failure, not a batch failure"""
+        sendmail = smtplib.SMTP.sendmail
+
+        def flaky_sendmail(connection, sender, recipients, message):
+            if recipients == ["user7@example.com"]:
+                raise smtplib.SMTPResponseException(451, b"Try again later")
+            return sendmail(connection, sender, recipients, message)
+
+        with unittest.mock.patch.object(smtplib.SMTP, "sendmail", flaky_sendmail):
+            results = self.channel.send_batch(self.users, self.alert)
+
+        self.assertEqual([r.user_id for r in results if not r], ["user7"])
+        self.assertEqual(len(self.server.messages), 29)
+
+    def test_unexpected_error_keeps_results_already_sent(self):
+        """Test that a crash mid-chunk only fails the recipients that chunk had not reached"""
+        sendmail = smtplib.SMTP.sendmail
+
+        def crashing_sendmail(connection, sender, recipients, message):
+            if recipients == ["user4@example.com"]:
+                raise RuntimeError("boom")
+            return sendmail(connection, sender, recipients, message)
+
+        with unittest.mock.patch.object(smtplib.SMTP, "sendmail", crashing_sendmail):
+            results = self.channel.send_batch(self.users, self.alert)
+
+        # user4 is second in the chunk users[1::3]; the other two chunks are unaffected
+        failed = [u.user_id for u in self.users[4::3]]
+        self.assertEqual([r.user_id for r in results if not r], sorted(failed, key=lambda u: int(u[4:])))
+        self.assertEqual(len(self.server.messages), 30 - len(failed))
+
+    def test_message_rendered_once_per_alert(self):
+        """Test that the MIME body is built once and reused for every recipient"""
+        with unittest.mock.patch.object(self.channel, "_templates", {}) as templates:
+            self.channel.send_batch(self.users, self.alert)
+            self.assertEqual(len(templates), 1)
+
+        self.alert.update(title="Disk nearly full")
+        self.channel.send(self.users[0], self.alert)
+        _, body = self.server.messages[-1]
+        self.assertIn(b"Subject: [CRITICAL] Disk nearly full", body)
+
+class TestSmsDeliveryChannel(unittest.TestCase):
+
+    def setUp(self):
+        self.gateway = StubSMSGateway().start()
+        self.channel = SmsDeliveryChannel(gateway_url=self.gateway.url, bulk_size=10,
+                                          rate_limit=0, pool_size=2)
+        self.alert = Alert("alert1", "Site down", "Checkout is failing", Severity.CRITICAL,
+                           "admin1", AlertVisibility(VisibilityType.ORGANIZATION, set()),
+                           DeliveryType.SMS)
+        self.users = [User(f"user{i}", f"User {i}", f"user{i}@example.com", phone=f"+1555000{i:04d}")
+                      for i in range(25)]
+
+    def tearDown(self):
+        self.channel.close()
+        self.gateway.stop()
+
+    def test_factory_registers_sms(self):
+        """Test that the factory builds an SMS channel"""
+        self.assertTrue(DeliveryFactory.is_channel_supported(DeliveryType.SMS))
+        channel = DeliveryFactory.create_channel(DeliveryType.SMS)
+        self.assertEqual(channel.get_channel_type(), "sms")
+
+    def test_recipients_batched_into_bulk_requests(self):
+        """Test that recipients share bulk requests over keep-alive connections"""
+        results = self.channel.send_batch(self.users, self.alert)
+        self.channel.send_batch(self.users, self.alert)
+
+        self.assertEqual([r.user_id for r in results], [u.user_id for u in self.users])
+        self.assertTrue(all(results))
+        self.assertEqual(len(self.gateway.requests), 6)
+        self.assertEqual(sorted(len(r['to']) for r in self.gateway.requests[:3]), [5, 10, 10])
+        self.assertLessEqual(self.gateway.connections, 2)
+        self.assertEqual(self.gateway.requests[0]['text'], "[CRITICAL] Site down: Checkout is failing")
+
+    def test_partial_rejection_and_missing_phone(self):
+        """Test that per-number failures only fail those recipients"""
+        self.gateway.rejected.add("+15550000003")
+        no_phone = User("nophone", "No Phone", "nophone@example.com")
+
+        results = self.channel.send_batch(self.users[:5] + [no_phone], self.alert)
+
+        self.assertEqual([r.user_id for r in results if not r], ["user3", "nophone"])
+        self.assertEqual(self.gateway.messages_sent, 5)
+
+    def test_gateway_error_fails_whole_request(self):
+        """Test that an HTTP error fails every recipient in that request"""
+        self.gateway.fail_requests = 1
+
+        results = self.channel.send_batch(self.users[:5], self.alert)
+
+        self.assertFalse(any(results))
+        self.assertTrue(self.channel.send(self.users[0], self.alert))
+
+    def test_rate_limit_caps_send_rate(self):
+        """Test that the token bucket holds sends to the configured rate"""
+        bucket = TokenBucket(rate=100)
+
+        start = time.monotonic()
+        bucket.acquire(100)
+        bucket.acquire(50)
+        elapsed = time.monotonic() - start
+
+        # The first second's worth is the burst; the next 50 wait ~0.5s
+        self.assertGreaterEqual(elapsed, 0.45)
+        self.assertLess(elapsed, 1.5)
+
+class FakeResponse:
+    status = 200
+
+    def read(self):
+        return b"{}"
+
+class FakeConnection:
+    """HTTP connection whose next request raises the error queued for it, if any"""
+
+    def __init__(self, log, errors):
+        self.log = log
+        self.errors = errors
+
+    def request(self, method, path, body=None, headers=None):
+        self.log.append(self)
+        if self.errors:
+            raise self.errors.pop(0)
+
+    def getresponse(self):
+        return FakeResponse()
+
+    def close(self):
+        pass
+
+class TestHTTPConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.requests = []
+        self.errors = []
+        self.pool = HTTPConnectionPool("http://gateway.invalid/messages", size=2)
+        self.pool._connect = lambda: FakeConnection(self.requests, self.errors)
+
+    def test_stale_keep_alive_connection_is_retried_once(self):
+        """Test that a reused connection closed before any response is retried on a new one"""
+        self.pool.request(b"{}", {})
+        self.errors.append(http.client.RemoteDisconnected("closed"))
+
+        self.assertEqual(self.pool.request(b"{}", {}), (200, b"{}"))
+        self.assertEqual(len(self.requests), 3)
+        self.assertIsNot(self.requests[1], self.requests[2])
+
+    def test_other_failures_are_not_resent(self):
+        """Test that a reset, or a hang-up on a fresh connection, is raised without a second POST"""
+        self.errors.append(ConnectionResetError("reset"))
+        with self.assertRaises(ConnectionResetError):
+            self.pool.request(b"{}", {})
+
+        self.errors.append(http.client.RemoteDisconnected("closed"))
+        with self.assertRaises(http.client.RemoteDisconnected):
+            self.pool.request(b"{}", {})
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.pool.get_open_count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,35 @@
 import unittest
+import unittest.mock
 import sys
 import os
+import threading
+import time
 from datetime import datetime, timedelta
+from io import StringIO
+
+import numpy as np
 
 # Add src to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from services.alert_service import AlertService
 from services.notification_service import NotificationService
+from services.delivery.delivery_factory import DeliveryFactory
+from services.delivery.base_delivery import DeliveryChannel
+from services.delivery.pipeline import DeliveryPipeline
+from services.activity_series import ActivitySeries, CREATED, DELIVERED, READ, SNOOZED, MINUTE, HOUR, DAY
+from services.delivery_log import DeliveryLog, STATUS_FAILED
+from services.metrics_aggregator import MetricsAggregator
+from services.preference_store import PreferenceStore
+from services.report_cache import ReportCache, ALERTS, MEMBERSHIP
+from storage.memory_storage import MemoryStorage
 from models.user import User, UserRole
 from models.alert import Severity, VisibilityType, DeliveryType
+from models.notification import UserAlertPreference, NotificationStatus
+from utils.keyset import alert_key
+from utils.logger import configure_logging, flush_logging, get_logger
+from utils.quantile_sketch import QuantileSketch
+from utils.space_saving import SpaceSaving
 
 class TestAlertService(unittest.TestCase):
     
@@ -118,6 +138,229 @@ class TestAlertService(unittest.TestCase):
         active_alerts = self.alert_service.list_all_alerts(status="active")
         self.assertEqual(len(active_alerts), 2)
 
+    def test_visibility_index(self):
+        direct_alert = self.alert_service.create_alert(
+            title="Direct Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.USER,
+            target_ids={"user2"}
+        )
+        team_alert = self.alert_service.create_alert(
+            title="Marketing Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.TEAM,
+            target_ids={"marketing"}
+        )
+        
+        # User1 is neither targeted directly nor in marketing
+        self.assertEqual(self.alert_service.get_alerts_for_user("user1"), [])
+        
+        user2_alerts = self.alert_service.get_alerts_for_user("user2")
+        self.assertEqual([a.alert_id for a in user2_alerts], [direct_alert.alert_id, team_alert.alert_id])
+        
+        # Archived alerts drop out of the index
+        self.alert_service.archive_alert(team_alert.alert_id)
+        ids = self.alert_service.ids
+        self.assertNotIn(ids.alerts.lookup(team_alert.alert_id),
+                         self.alert_service._team_alert_ids[ids.teams.lookup("marketing")])
+        self.assertEqual(len(self.alert_service.get_alerts_for_user("user2")), 1)
+
+    def test_can_user_see(self):
+        org_alert = self.alert_service.create_alert(
+            title="Org Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION,
+            target_ids=set()
+        )
+        team_alert = self.alert_service.create_alert(
+            title="Engineering Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.TEAM,
+            target_ids={"engineering"}
+        )
+        direct_alert = self.alert_service.create_alert(
+            title="Direct Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.USER,
+            target_ids={"user2"},
+            expiry_time=datetime.now() + timedelta(hours=1)
+        )
+
+        # Agrees with get_alerts_for_user for every user and alert
+        for user_id in ("admin1", "user1", "user2", "unknown"):
+            visible = {alert.alert_id for alert in self.alert_service.get_alerts_for_user(user_id)}
+            for alert in (org_alert, team_alert, direct_alert):
+                self.assertEqual(self.alert_service.can_user_see(user_id, alert.alert_id),
+                                 alert.alert_id in visible)
+        self.assertFalse(self.alert_service.can_user_see("user1", "missing"))
+
+        # Membership changes and lifecycle changes are reflected immediately
+        self.alert_service.add_member("engineering", "user2")
+        self.assertTrue(self.alert_service.can_user_see("user2", team_alert.alert_id))
+        self.alert_service.archive_alert(org_alert.alert_id)
+        self.assertFalse(self.alert_service.can_user_see("user1", org_alert.alert_id))
+        self.alert_service.update_alert(direct_alert.alert_id, expiry_time=datetime.now() - timedelta(seconds=1))
+        self.assertFalse(self.alert_service.can_user_see("user2", direct_alert.alert_id))
+
+    def test_keyset_pages(self):
+        self.alert_service.add_team("ops", {"user1"})
+        for i in range(4):
+            self.alert_service.create_alert(f"Org {i}", "m", Severity.INFO, "admin1",
+                                            VisibilityType.ORGANIZATION, set())
+            # Aimed at two of user1's teams, but should appear once
+            self.alert_service.create_alert(f"Teams {i}", "m", Severity.WARNING, "admin1",
+                                            VisibilityType.TEAM, {"engineering", "ops"})
+            self.alert_service.create_alert(f"Other {i}", "m", Severity.INFO, "admin1",
+                                            VisibilityType.USER, {"user2"})
+        archived = self.alert_service.create_alert("Archived", "m", Severity.INFO, "admin1",
+                                                   VisibilityType.USER, {"user1"})
+        self.alert_service.archive_alert(archived.alert_id)
+        
+        def walk(read_page):
+            alerts, before = [], None
+            while True:
+                page = read_page(before)
+                alerts.extend(page)
+                if len(page) < 3:
+                    return alerts
+                before = alert_key(page[-1])
+        
+        newest_first = lambda alerts: sorted(alerts, key=alert_key, reverse=True)
+        user1_pages = walk(lambda before: self.alert_service.get_alerts_page_for_user("user1", before, 3))
+        self.assertEqual(user1_pages, newest_first(self.alert_service.get_alerts_for_user("user1")))
+        self.assertEqual(len(user1_pages), 8)
+        
+        all_pages = walk(lambda before: self.alert_service.list_alerts_page(before, 3))
+        self.assertEqual(all_pages, newest_first(self.alert_service.list_all_alerts()))
+        self.assertEqual(self.alert_service.list_alerts_page(status="archived"), [archived])
+        self.assertEqual(len(self.alert_service.list_alerts_page(severity=Severity.WARNING, status="active")), 4)
+        self.assertEqual(self.alert_service.get_alerts_page_for_user("nobody"), [])
+    
+    def test_alerts_between(self):
+        storage = MemoryStorage()
+        day = datetime(2024, 3, 1)
+        alerts = []
+        for hours, severity in [(-30, Severity.INFO), (1, Severity.CRITICAL), (2, Severity.INFO), (26, Severity.INFO)]:
+            alert = AlertService._build_alert(f"At {hours}h", "m", severity, "admin1",
+                                              VisibilityType.ORGANIZATION, set())
+            alert.created_at = day + timedelta(hours=hours)
+            alerts.append(alert)
+        storage.save_alerts(alerts)
+        alert_service = AlertService(storage=storage)
+        alert_service.load_from_storage()
+        
+        # Half-open windows, oldest first, whatever the alerts' state
+        alert_service.archive_alert(alerts[1].alert_id)
+        ids = lambda found: [alert.alert_id for alert in found]
+        self.assertEqual(ids(alert_service.alerts_between(day, day + timedelta(days=1))), ids(alerts[1:3]))
+        self.assertEqual(ids(alert_service.alerts_between(end=alerts[1].created_at)), ids(alerts[:1]))
+        self.assertEqual(alert_service.count_alerts_between(day), 3)
+        self.assertEqual(alert_service.count_alerts_between(day, severity=Severity.INFO), 2)
+        self.assertEqual(alert_service.count_alerts_between(day + timedelta(days=9)), 0)
+        
+        # Severity changes move the alert between the per-severity indexes
+        alert_service.update_alert(alerts[2].alert_id, severity=Severity.CRITICAL)
+        self.assertEqual(alert_service.count_alerts_between(day, severity=Severity.CRITICAL), 2)
+        self.assertEqual(alert_service.count_alerts_between(severity=Severity.INFO), 2)
+    
+    def test_team_membership_index(self):
+        self.assertEqual(self.alert_service.get_user_teams("user1"), {"engineering"})
+        self.assertEqual(self.user1.teams, {"engineering"})
+        
+        self.assertTrue(self.alert_service.add_member("marketing", "user1"))
+        self.assertEqual(self.alert_service.get_user_teams("user1"), {"engineering", "marketing"})
+        self.assertIn("user1", self.alert_service.get_team("marketing").member_ids)
+        
+        self.assertTrue(self.alert_service.remove_member("engineering", "user1"))
+        self.assertEqual(self.user1.teams, {"marketing"})
+        self.assertNotIn("user1", self.alert_service.get_team_members("engineering"))
+        
+        # Unknown teams and non-members are rejected
+        self.assertFalse(self.alert_service.add_member("unknown", "user1"))
+        self.assertFalse(self.alert_service.remove_member("engineering", "user2"))
+        
+        # Replacing a team's members updates the reverse side too
+        self.alert_service.add_team("marketing", {"user2"})
+        self.assertEqual(self.alert_service.get_user_teams("user1"), set())
+        self.assertEqual(self.alert_service.get_user_teams("user2"), {"marketing"})
+
+    def test_expire_due_alerts(self):
+        expiring = self.alert_service.create_alert(
+            title="Expiring Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION,
+            target_ids=set(),
+            expiry_time=datetime.now() + timedelta(hours=1)
+        )
+        self.alert_service.create_alert(
+            title="Lasting Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION,
+            target_ids=set()
+        )
+        
+        expired_events = []
+        observer = unittest.mock.Mock()
+        observer.on_alert_expired.side_effect = expired_events.append
+        self.alert_service.add_observer(observer)
+        
+        # Nothing is due yet
+        self.assertEqual(self.alert_service.expire_due_alerts(), [])
+        
+        later = datetime.now() + timedelta(hours=2)
+        self.assertEqual(self.alert_service.expire_due_alerts(now=later), [expiring])
+        self.assertEqual(expired_events, [expiring])
+        self.assertEqual(self.alert_service.get_status_counts(), {"active": 1, "expired": 1, "archived": 0})
+        self.assertEqual(self.alert_service.list_all_alerts(status="expired"), [expiring])
+        self.assertEqual(len(self.alert_service.get_alerts_for_user("user1")), 1)
+        
+        # Extending the expiry brings the alert back
+        self.alert_service.update_alert(expiring.alert_id, expiry_time=datetime.now() + timedelta(days=1))
+        self.assertEqual(self.alert_service.get_status_counts()["active"], 2)
+        self.assertEqual(len(self.alert_service.get_alerts_for_user("user1")), 2)
+
+    def test_bulk_onboarding(self):
+        alert_service = AlertService()
+        observer = unittest.mock.Mock()
+        alert_service.add_observer(observer)
+        
+        users = [User(f"u{i}", f"User {i}", f"u{i}@example.com") for i in range(5)]
+        users[0].teams = {"oncall"}
+        alert_service.add_users_bulk(users)
+        alert_service.add_teams_bulk({"eng": {"u1", "u2"}, "ops": {"u3"}}, names={"eng": "Engineering"})
+        
+        self.assertEqual(len(alert_service.get_all_users()), 5)
+        self.assertEqual(alert_service.get_team_members("oncall"), {"u0"})
+        self.assertEqual(alert_service.get_team("eng").name, "Engineering")
+        self.assertEqual(alert_service.get_user_teams("u2"), {"eng"})
+        
+        alerts = alert_service.create_alerts_bulk([
+            dict(title="Team", message="M", severity=Severity.INFO, created_by="u0",
+                 visibility_type=VisibilityType.TEAM, target_ids={"eng"}),
+            dict(title="Org", message="M", severity=Severity.WARNING, created_by="u0",
+                 visibility_type=VisibilityType.ORGANIZATION, target_ids=set())
+        ])
+        
+        # One batched event, no per-alert fan-out
+        observer.on_alerts_created.assert_called_once_with(alerts)
+        observer.on_alert_created.assert_not_called()
+        self.assertEqual([a.title for a in alert_service.get_alerts_for_user("u1")], ["Team", "Org"])
+        self.assertEqual([a.title for a in alert_service.get_alerts_for_user("u4")], ["Org"])
+
 class TestNotificationService(unittest.TestCase):
     
     def setUp(self):
@@ -132,6 +375,109 @@ class TestNotificationService(unittest.TestCase):
         self.alert_service.add_user(self.user2)
         self.alert_service.add_team("engineering", {"user1"})
     
+    def test_bulk_alerts_fan_out_in_one_pass(self):
+        with unittest.mock.patch.object(self.notification_service, '_fan_out',
+                                        wraps=self.notification_service._fan_out) as fan_out:
+            alerts = self.alert_service.create_alerts_bulk([
+                dict(title=f"Alert {i}", message="M", severity=Severity.INFO, created_by="admin1",
+                     visibility_type=VisibilityType.ORGANIZATION, target_ids=set())
+                for i in range(3)
+            ])
+        
+        fan_out.assert_not_called()
+        stats = self.notification_service.get_delivery_stats()
+        self.assertEqual(stats["user_preferences"], 6)
+        self.assertEqual(stats["total_deliveries"], 6)
+        for alert in alerts:
+            self.assertIsNotNone(self.notification_service.get_next_reminder_time("user2", alert.alert_id))
+
+    def test_dashboard_counters_follow_events(self):
+        def create(severity, visibility_type, target_ids):
+            return self.alert_service.create_alert(
+                title="Alert", message="Message", severity=severity, created_by="admin1",
+                visibility_type=visibility_type, target_ids=target_ids
+            )
+
+        def summary(user_id):
+            return self.notification_service.get_user_dashboard(user_id)['summary']
+
+        org_alert = create(Severity.INFO, VisibilityType.ORGANIZATION, set())
+        team_alert = create(Severity.CRITICAL, VisibilityType.TEAM, {"engineering"})
+        self.assertEqual(summary("user1"), {'total_alerts': 2, 'unread_alerts': 2, 'snoozed_alerts': 0,
+                                            'critical_alerts': 1, 'warning_alerts': 0, 'info_alerts': 1})
+
+        # Built inboxes are updated by events rather than rebuilt
+        with unittest.mock.patch.object(self.alert_service, 'get_alerts_for_user') as scan:
+            direct_alert = create(Severity.WARNING, VisibilityType.USER, {"user1"})
+            self.notification_service.mark_as_read("user1", org_alert.alert_id)
+            self.notification_service.snooze_alert("user1", team_alert.alert_id)
+            dashboard = self.notification_service.get_user_dashboard("user1")
+            scan.assert_not_called()
+        self.assertEqual(dashboard['summary'], {'total_alerts': 3, 'unread_alerts': 1, 'snoozed_alerts': 1,
+                                                'critical_alerts': 0, 'warning_alerts': 1, 'info_alerts': 1})
+        self.assertEqual(dashboard['recent_alerts'], [direct_alert, team_alert, org_alert])
+        self.assertEqual(dashboard['critical_alerts'], [])
+        self.assertEqual(dashboard['snoozed_alerts'], [team_alert])
+
+        # Unsnoozing puts the alert back on the critical list; archiving drops it everywhere
+        self.notification_service.mark_as_unread("user1", team_alert.alert_id)
+        self.assertEqual(self.notification_service.get_user_dashboard("user1")['critical_alerts'], [team_alert])
+        self.alert_service.archive_alert(team_alert.alert_id)
+        self.assertEqual(summary("user1")['total_alerts'], 2)
+
+        # Joining a team brings its alerts into the inbox
+        marketing_alert = create(Severity.CRITICAL, VisibilityType.TEAM, {"marketing"})
+        self.alert_service.add_team("marketing", {"user2"})
+        self.assertEqual(summary("user2"), {'total_alerts': 2, 'unread_alerts': 2, 'snoozed_alerts': 0,
+                                            'critical_alerts': 1, 'warning_alerts': 0, 'info_alerts': 1})
+        self.alert_service.add_member("marketing", "user1")
+        dashboard = self.notification_service.get_user_dashboard("user1")
+        self.assertEqual(dashboard['summary']['total_alerts'], 3)
+        self.assertEqual(dashboard['critical_alerts'], [marketing_alert])
+
+    def test_dashboard_snooze_lapses(self):
+        alert = self.alert_service.create_alert(
+            title="Alert", message="Message", severity=Severity.CRITICAL, created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION, target_ids=set()
+        )
+        self.notification_service.get_user_dashboard("user1")
+        self.notification_service.snooze_alert("user1", alert.alert_id)
+        self.assertEqual(self.notification_service.get_user_dashboard("user1")['summary']['snoozed_alerts'], 1)
+
+        # Once the snooze runs out the alert is neither snoozed nor unread, as before
+        after_snooze = datetime.now() + timedelta(days=2)
+        dashboard = self.notification_service._inboxes.get_dashboard("user1", now=after_snooze)
+        self.assertEqual(dashboard['summary']['snoozed_alerts'], 0)
+        self.assertEqual(dashboard['summary']['unread_alerts'], 0)
+        self.assertEqual(dashboard['critical_alerts'], [alert])
+    
+    def test_dashboard_ignores_alerts_that_were_never_visible(self):
+        def summary():
+            return self.notification_service.get_user_dashboard("user1")['summary']
+
+        def create(severity, expiry_time=None):
+            return self.alert_service.create_alert(
+                title="Alert", message="Message", severity=severity, created_by="admin1",
+                visibility_type=VisibilityType.ORGANIZATION, target_ids=set(), expiry_time=expiry_time
+            )
+
+        # Already expired when created: no inbox counts it, so archiving it changes nothing
+        summary()
+        expired = create(Severity.WARNING, datetime.now() - timedelta(minutes=1))
+        info = create(Severity.INFO)
+        self.alert_service.archive_alert(expired.alert_id)
+        self.assertEqual((summary()['total_alerts'], summary()['warning_alerts']), (1, 0))
+
+        # Also for an inbox built after it, whose watermark lies past the expired alert
+        expired = create(Severity.WARNING, datetime.now() - timedelta(minutes=1))
+        create(Severity.CRITICAL)
+        self.notification_service._inboxes.clear()
+        summary()
+        self.alert_service.archive_alert(expired.alert_id)
+        self.alert_service.archive_alert(info.alert_id)
+        self.assertEqual(summary()['total_alerts'], len(self.alert_service.get_alerts_for_user("user1")))
+        self.assertEqual((summary()['total_alerts'], summary()['warning_alerts']), (1, 0))
+
     def test_user_preference_management(self):
         # Create an alert
         alert = self.alert_service.create_alert(
@@ -190,6 +536,108 @@ class TestNotificationService(unittest.TestCase):
             self.assertIn('status', alert_data)
             self.assertIn('is_snoozed', alert_data)
     
+    def test_alert_audience_resolution(self):
+        self.alert_service.add_team("qa", {"user1", "user2", "ghost"})
+        
+        team_alert = self.alert_service.create_alert(
+            title="QA Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.TEAM,
+            target_ids={"engineering", "qa"}
+        )
+        audience = self.alert_service.get_alert_audience(team_alert)
+        
+        # Overlapping teams count once, unregistered members are skipped
+        self.assertEqual(sorted(u.user_id for u in audience), ["user1", "user2"])
+        self.assertIsNotNone(self.notification_service.get_user_preference("user2", team_alert.alert_id))
+        
+        user_alert = self.alert_service.create_alert(
+            title="Direct Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.USER,
+            target_ids={"user2"}
+        )
+        self.assertEqual([u.user_id for u in self.alert_service.get_alert_audience(user_alert)], ["user2"])
+        self.assertIsNone(self.notification_service.get_user_preference("user1", user_alert.alert_id))
+        
+        self.alert_service.archive_alert(user_alert.alert_id)
+        self.assertEqual(self.alert_service.get_alert_audience(user_alert), [])
+    
+    def test_process_reminders_only_touches_due_preferences(self):
+        alert = self.alert_service.create_alert(
+            title="Reminder Alert",
+            message="Message",
+            severity=Severity.WARNING,
+            created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION,
+            target_ids=set()
+        )
+        
+        # Both users were just notified, nothing is due yet
+        self.assertEqual(self.notification_service.process_reminders(), 0)
+        due_time = self.notification_service.get_next_reminder_time("user1", alert.alert_id)
+        self.assertGreater(due_time, datetime.now() + timedelta(minutes=119))
+        
+        # Read and snoozed preferences drop out of the due set
+        self.notification_service.mark_as_read("user1", alert.alert_id)
+        self.assertIsNone(self.notification_service.get_next_reminder_time("user1", alert.alert_id))
+        self.notification_service.snooze_alert("user2", alert.alert_id)
+        
+        # A frequency change reschedules existing preferences
+        self.alert_service.update_alert(alert.alert_id, reminder_frequency=0)
+        self.assertEqual(self.notification_service.process_reminders(), 0)
+        
+        self.notification_service.mark_as_unread("user1", alert.alert_id)
+        self.assertEqual(self.notification_service.process_reminders(), 1)
+    
+    def test_services_share_interned_ids(self):
+        alert = self.alert_service.create_alert(
+            title="Shared Ids",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION,
+            target_ids=set()
+        )
+        
+        ids = self.alert_service.ids
+        preference = self.notification_service.get_user_preference("user2", alert.alert_id)
+        self.assertEqual(preference.user_index, ids.users.lookup("user2"))
+        self.assertEqual(preference.alert_index, ids.alerts.lookup(alert.alert_id))
+        self.assertEqual(ids.alerts.resolve(preference.alert_index), alert.alert_id)
+        
+        # Ids are translated back to strings at the boundary
+        history = self.notification_service.get_user_delivery_history("user2")
+        self.assertEqual([(d.user_id, d.alert_id) for d in history], [("user2", alert.alert_id)])
+    
+    def test_rebuild_reminders_from_store(self):
+        alert = self.alert_service.create_alert(
+            title="Rebuild Alert",
+            message="Message",
+            severity=Severity.WARNING,
+            created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION,
+            target_ids=set()
+        )
+        
+        # Column writes made behind the queue's back are picked up by a rebuild
+        preference = self.notification_service.get_user_preference("user1", alert.alert_id)
+        preference.last_reminded_at = datetime.now() - timedelta(days=1)
+        self.assertEqual(self.notification_service.process_reminders(), 0)
+        
+        self.assertEqual([p.user_id for p in self.notification_service.get_due_preferences()], ["user1"])
+        self.notification_service.rebuild_reminders()
+        self.assertEqual(self.notification_service.process_reminders(), 1)
+        
+        # Alert events keep the frequency map current, so disabled alerts drop out of the scan
+        preference.last_reminded_at = datetime.now() - timedelta(days=1)
+        self.alert_service.update_alert(alert.alert_id, reminders_enabled=False)
+        self.assertEqual(self.notification_service.get_due_preferences(), [])
+    
     def test_observer_pattern(self):
         # Test that notification service is properly observing alert service
         initial_observer_count = self.alert_service.get_observer_count()
@@ -208,5 +656,537 @@ class TestNotificationService(unittest.TestCase):
             target_ids=set()
         )
 
+class TestMetricsAggregator(unittest.TestCase):
+    
+    def setUp(self):
+        self.alert_service = AlertService()
+        # Alerts created before the aggregator are counted by its initial pass
+        self.alert_service.create_alert("Early", "m", Severity.INFO, "admin1",
+                                        VisibilityType.ORGANIZATION, set())
+        self.metrics = MetricsAggregator(self.alert_service)
+    
+    def test_counts_follow_alert_events(self):
+        team_alert = self.alert_service.create_alert("Team", "m", Severity.WARNING, "admin2",
+                                                     VisibilityType.TEAM, {"engineering"})
+        self.alert_service.create_alerts_bulk([
+            dict(title=f"Bulk {i}", message="m", severity=Severity.CRITICAL, created_by="admin2",
+                 visibility_type=VisibilityType.USER, target_ids={"user1"},
+                 expiry_time=datetime.now() + timedelta(hours=1))
+            for i in range(3)
+        ])
+        self.alert_service.update_alert(team_alert.alert_id, severity=Severity.CRITICAL)
+        self.alert_service.archive_alert(team_alert.alert_id)
+        self.alert_service.expire_due_alerts(datetime.now() + timedelta(hours=2))
+        
+        self.assertEqual(self.metrics.total_alerts(), 5)
+        self.assertEqual(self.metrics.get_severity_counts(), {'info': 1, 'warning': 0, 'critical': 4})
+        self.assertEqual(self.metrics.get_visibility_counts(), {'organization': 1, 'team': 1, 'user': 3})
+        self.assertEqual(self.metrics.get_status_counts(), self.alert_service.get_status_counts())
+        self.assertEqual(self.metrics.get_top_creators(1), [("admin2", 4, 0)])
+        self.assertEqual(self.metrics.get_top_teams(), [("engineering", 1, 0)])
+    
+    def test_space_saving_bounds(self):
+        rng = np.random.default_rng(3)
+        stream = [f"creator{value}" for value in rng.zipf(1.5, 20000) if value < 5000]
+        exact = {}
+        for item in stream:
+            exact[item] = exact.get(item, 0) + 1
+        counter = SpaceSaving(capacity=50)
+        for item in stream:
+            counter.add(item)
+        
+        self.assertEqual(len(counter), 50)
+        for item, count, error in counter.top(50):
+            self.assertLessEqual(exact[item], count)
+            self.assertGreaterEqual(exact[item], count - error)
+        # Everything above total / capacity is tracked, and the top items come out in order
+        heavy = {item for item, count in exact.items() if count > len(stream) / 50}
+        self.assertTrue(heavy <= {item for item, _, _ in counter.top(50)})
+        self.assertEqual([item for item, _, _ in counter.top(3)],
+                         sorted(exact, key=exact.get, reverse=True)[:3])
+    
+    def test_rebuild_after_loading_from_storage(self):
+        storage = MemoryStorage()
+        alert_service = AlertService(storage=storage)
+        for severity in (Severity.INFO, Severity.WARNING):
+            alert_service.create_alert("Stored", "m", severity, "admin1", VisibilityType.ORGANIZATION, set())
+        
+        restarted = AlertService(storage=storage)
+        metrics = MetricsAggregator(restarted)
+        restarted.load_from_storage()
+        self.assertEqual(metrics.total_alerts(), 0)
+        
+        metrics.rebuild()
+        self.assertEqual(metrics.total_alerts(), 2)
+        self.assertEqual(metrics.get_severity_counts(), {'info': 1, 'warning': 1, 'critical': 0})
+
+class TestActivitySeries(unittest.TestCase):
+    
+    def test_events_roll_up_into_hours_and_days(self):
+        series = ActivitySeries(retention_days=3)
+        day = datetime(2024, 3, 1)
+        for minutes in (0, 0.5, 1, 61, 24 * 60 + 5):
+            series.record(READ, (day + timedelta(minutes=minutes)).timestamp())
+        series.record(SNOOZED, day.timestamp(), count=4)
+        
+        self.assertEqual(series.series(READ, MINUTE, day, day + timedelta(minutes=2)),
+                         [(day, 2), (day + timedelta(minutes=1), 1), (day + timedelta(minutes=2), 0)])
+        self.assertEqual(series.count(READ, HOUR, day, day + timedelta(hours=1)), 4)
+        self.assertEqual(series.series(READ, DAY, day, day + timedelta(days=1)),
+                         [(day, 4), (day + timedelta(days=1), 1)])
+        self.assertEqual(series.count(SNOOZED, DAY, day, day + timedelta(days=1)), 4)
+    
+    def test_rings_keep_a_fixed_number_of_buckets(self):
+        series = ActivitySeries(retention_days=3)
+        day = datetime(2024, 3, 1)
+        for days in range(5):
+            series.record(CREATED, (day + timedelta(days=days, hours=12)).timestamp())
+        
+        # Only the last three days are retained, and late events older than that are dropped
+        series.record(CREATED, day.timestamp())
+        self.assertEqual([count for _, count in series.series(CREATED, DAY, day, day + timedelta(days=4))],
+                         [1, 1, 1])
+        self.assertEqual(len(series._rings[MINUTE].keys), 24 * 60)
+        self.assertEqual(len(series._rings[HOUR].keys), 3 * 24)
+    
+    def test_notification_service_records_activity(self):
+        alert_service = AlertService()
+        notification_service = NotificationService(alert_service)
+        alert_service.add_user(User("user1", "User One", "user1@example.com"))
+        alert = alert_service.create_alert("Org", "m", Severity.INFO, "admin1",
+                                           VisibilityType.ORGANIZATION, set())
+        hidden = alert_service.create_alert("Team", "m", Severity.INFO, "admin1",
+                                            VisibilityType.TEAM, {"engineering"})
+        notification_service.mark_as_read("user1", alert.alert_id)
+        notification_service.mark_as_read("user1", alert.alert_id)  # already read, not counted again
+        notification_service.snooze_alert("user1", alert.alert_id)
+        notification_service.snooze_alert("user1", alert.alert_id)  # already snoozed, not counted again
+        notification_service.snooze_alert("user1", hidden.alert_id)  # not visible to user1
+        notification_service.mark_as_read("user1", hidden.alert_id)
+        
+        today = datetime.now()
+        counts = {kind: notification_service.count_activity(kind, DAY, today)
+                  for kind in (CREATED, DELIVERED, READ, SNOOZED)}
+        self.assertEqual(counts, {CREATED: 2, DELIVERED: 1, READ: 1, SNOOZED: 1})
+
+class TestEngagementMetrics(unittest.TestCase):
+    
+    def test_sketch_quantiles_within_relative_accuracy(self):
+        values = np.random.default_rng(7).lognormal(mean=4, sigma=1.5, size=20000)
+        first, second = QuantileSketch(), QuantileSketch()
+        for value in values[:5000]:
+            first.add(value)
+        for value in values[5000:]:
+            second.add(value)
+        first.merge(second)
+        
+        self.assertEqual(first.count, len(values))
+        for q, estimate in zip((0.5, 0.95, 0.99), first.quantiles((0.5, 0.95, 0.99))):
+            exact = np.quantile(values, q, method="lower")
+            self.assertLess(abs(estimate - exact) / exact, 0.03)
+        # Bucket count is bounded by the value range, not the number of values
+        self.assertLess(len(first), 700)
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+    
+    def test_read_and_snooze_latency_per_severity_and_team(self):
+        alert_service = AlertService()
+        notification_service = NotificationService(alert_service)
+        alert_service.add_user(User("user1", "User One", "user1@example.com"))
+        alert_service.add_team("engineering", {"user1"})
+        critical = alert_service.create_alert("Critical", "m", Severity.CRITICAL, "admin1",
+                                              VisibilityType.TEAM, {"engineering"})
+        info = alert_service.create_alert("Info", "m", Severity.INFO, "admin1",
+                                          VisibilityType.ORGANIZATION, set())
+        
+        # Delivered two minutes ago
+        for alert in (critical, info):
+            preference = notification_service.get_user_preference("user1", alert.alert_id)
+            preference.first_delivered_at = datetime.now() - timedelta(minutes=2)
+        notification_service.mark_as_read("user1", critical.alert_id)
+        notification_service.mark_as_read("user1", critical.alert_id)  # no transition, not measured
+        notification_service.snooze_alert("user1", info.alert_id)
+        
+        latencies = notification_service.get_engagement_latencies()
+        read = latencies['time_to_read']
+        self.assertEqual(read['overall']['count'], 1)
+        self.assertEqual(read['by_severity']['critical']['count'], 1)
+        self.assertIsNone(read['by_severity']['info']['p50'])
+        self.assertAlmostEqual(read['by_team']['engineering']['p99'], 120, delta=120 * 0.03)
+        self.assertEqual(latencies['time_to_snooze']['by_severity']['info']['count'], 1)
+    
+    def test_read_latency_counts_from_first_delivery_after_a_reminder(self):
+        alert_service = AlertService()
+        notification_service = NotificationService(alert_service)
+        user = User("user1", "User One", "user1@example.com")
+        alert_service.add_user(user)
+        alert = alert_service.create_alert("Info", "m", Severity.INFO, "admin1",
+                                           VisibilityType.ORGANIZATION, set(), reminder_frequency=5)
+        
+        # First delivered ten minutes ago; a reminder goes out now
+        preference = notification_service.get_user_preference("user1", alert.alert_id)
+        first_delivered_at = datetime.now().replace(microsecond=0) - timedelta(minutes=10)
+        preference.first_delivered_at = first_delivered_at
+        preference.last_reminded_at = first_delivered_at
+        self.assertTrue(notification_service.deliver_notification(user, alert))
+        self.assertEqual(preference.first_delivered_at, first_delivered_at)
+        self.assertGreater(preference.last_reminded_at, first_delivered_at)
+        
+        notification_service.mark_as_read("user1", alert.alert_id)
+        read = notification_service.get_engagement_latencies()['time_to_read']
+        self.assertAlmostEqual(read['overall']['p50'], 600, delta=600 * 0.03)
+
+class TestReportCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.alert_service = AlertService()
+        self.computed = []
+    
+    def compute(self):
+        self.computed.append(len(self.alert_service.list_all_alerts()))
+        return self.computed[-1]
+    
+    def create_alert(self):
+        return self.alert_service.create_alert("Org", "m", Severity.INFO, "admin1",
+                                               VisibilityType.ORGANIZATION, set())
+    
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+    
+    def test_ttl_and_event_invalidation(self):
+        cache = ReportCache(self.alert_service, ttl=60, stale_while_revalidate=False)
+        self.assertEqual(cache.get('alerts', self.compute, (ALERTS,)), 0)
+        self.assertEqual(cache.get('alerts', self.compute, (ALERTS,)), 0)
+        
+        # Membership events leave alert-only sections alone; alert events invalidate them
+        self.alert_service.add_user(User("user1", "User One", "user1@example.com"))
+        self.assertEqual(cache.get('alerts', self.compute, (ALERTS,)), 0)
+        self.create_alert()
+        self.assertEqual(cache.get('alerts', self.compute, (ALERTS,)), 1)
+        
+        with unittest.mock.patch('services.report_cache.time.monotonic', return_value=time.monotonic() + 61):
+            cache.get('alerts', self.compute, (ALERTS,))
+        self.assertEqual(self.computed, [0, 1, 1])
+        
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['recomputes']), (2, 3, 3))
+        self.assertGreater(stats['recompute_seconds']['p99'], 0)
+    
+    def test_concurrent_callers_share_one_computation(self):
+        cache = ReportCache(self.alert_service, ttl=60, stale_while_revalidate=False)
+        started, release = threading.Event(), threading.Event()
+        
+        def slow_compute():
+            started.set()
+            release.wait(5)
+            return self.compute()
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get('alerts', slow_compute)))
+                   for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        self.wait_for(lambda: cache.get_stats()['shared_computations'] == 4)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(results, [0] * 5)
+        self.assertEqual(self.computed, [0])
+    
+    def test_stale_while_revalidate(self):
+        cache = ReportCache(self.alert_service, ttl=60, stale_while_revalidate=True)
+        cache.get('summary', self.compute, (ALERTS, MEMBERSHIP))
+        release = threading.Event()
+        
+        def slow_compute():
+            release.wait(5)
+            return self.compute()
+        
+        # The stale value comes back at once while one background refresh runs
+        self.create_alert()
+        self.assertEqual(cache.get('summary', slow_compute), 0)
+        self.assertEqual(cache.get('summary', slow_compute), 0)
+        release.set()
+        self.wait_for(lambda: cache.get('summary', slow_compute) == 1)
+        self.assertEqual(self.computed, [0, 1])
+        self.assertGreaterEqual(cache.get_stats()['stale_hits'], 2)
+
+class TestDeliveryFactory(unittest.TestCase):
+    
+    def setUp(self):
+        DeliveryFactory.clear_channel_cache()
+    
+    def test_channel_instances_are_reused(self):
+        channel = DeliveryFactory.get_channel(DeliveryType.IN_APP)
+        self.assertIs(DeliveryFactory.get_channel(DeliveryType.IN_APP), channel)
+        
+        # A different configuration gets its own instance
+        logger = unittest.mock.Mock()
+        logged_channel = DeliveryFactory.get_channel(DeliveryType.IN_APP, delivery_logger=logger)
+        self.assertIsNot(logged_channel, channel)
+        self.assertIs(DeliveryFactory.get_channel(DeliveryType.IN_APP, delivery_logger=logger), logged_channel)
+    
+    def test_send_batch_returns_result_per_recipient(self):
+        channel = DeliveryFactory.get_channel(DeliveryType.IN_APP)
+        users = [User("user1", "User One", "user1@example.com"), User("user2", "User Two", "user2@example.com")]
+        alert_service = AlertService()
+        alert = alert_service.create_alert(
+            title="Batch Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION,
+            target_ids=set()
+        )
+        
+        results = channel.send_batch(users, alert)
+        self.assertEqual([r.user_id for r in results], ["user1", "user2"])
+        self.assertTrue(all(results))
+        self.assertEqual(len({r.delivery_id for r in results}), 2)
+
+class FlakyChannel(DeliveryChannel):
+    """Fails each recipient a fixed number of times before succeeding"""
+    
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.attempts = {}
+    
+    def send(self, user, alert) -> bool:
+        self.attempts[user.user_id] = self.attempts.get(user.user_id, 0) + 1
+        return self.attempts[user.user_id] > self.failures
+    
+    def get_channel_type(self) -> str:
+        return "flaky"
+
+class TestDeliveryPipeline(unittest.TestCase):
+    
+    def setUp(self):
+        self.alert_service = AlertService()
+        self.users = [User(f"user{i}", f"User {i}", f"user{i}@example.com") for i in range(5)]
+        for user in self.users:
+            self.alert_service.add_user(user)
+        self.pipeline = DeliveryPipeline(workers=2, batch_size=2, max_retries=2, retry_delay=0.01)
+    
+    def tearDown(self):
+        self.pipeline.stop(timeout=5)
+    
+    def _create_alert(self):
+        return self.alert_service.create_alert(
+            title="Pipeline Alert",
+            message="Message",
+            severity=Severity.INFO,
+            created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION,
+            target_ids=set()
+        )
+    
+    def test_retries_with_backoff(self):
+        channel = FlakyChannel(failures=2)
+        reported = []
+        self.pipeline.submit(channel, self.users, self._create_alert(), lambda alert, results: reported.extend(results))
+        
+        self.assertTrue(self.pipeline.wait_until_idle(timeout=5))
+        self.assertEqual(sorted(r.user_id for r in reported), [u.user_id for u in self.users])
+        self.assertTrue(all(reported))
+        self.assertEqual(self.pipeline.get_stats()["retried"], 10)
+    
+    def test_exhausted_retries_are_reported_as_failures(self):
+        reported = []
+        self.pipeline.submit(FlakyChannel(failures=5), self.users[:1], self._create_alert(),
+                             lambda alert, results: reported.extend(results))
+        
+        self.assertTrue(self.pipeline.wait_until_idle(timeout=5))
+        self.assertEqual(len(reported), 1)
+        self.assertFalse(reported[0])
+        self.assertEqual(self.pipeline.get_stats()["failed"], 1)
+    
+    def test_concurrent_submits_start_one_loop(self):
+        alert = self._create_alert()
+        barrier = threading.Barrier(8)
+        
+        def submit(user):
+            barrier.wait()
+            self.pipeline.submit(FlakyChannel(failures=0), [user], alert)
+        
+        threads = [threading.Thread(target=submit, args=(self.users[i % 5],)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertTrue(self.pipeline.wait_until_idle(timeout=5))
+        loops = [thread for thread in threading.enumerate() if thread.name == "delivery-pipeline"]
+        self.assertEqual(len(loops), 1)
+        self.assertEqual(self.pipeline.get_stats()["submitted"], 8)
+        self.assertEqual(self.pipeline.get_stats()["delivered"], 8)
+    
+    def test_notification_service_fans_out_through_pipeline(self):
+        notification_service = NotificationService(self.alert_service, pipeline=self.pipeline)
+        alert = self._create_alert()
+        
+        self.assertTrue(self.pipeline.wait_until_idle(timeout=5))
+        self.assertEqual(notification_service.get_delivery_stats()["total_deliveries"], 5)
+        preference = notification_service.get_user_preference("user3", alert.alert_id)
+        self.assertIsNotNone(preference.last_reminded_at)
+
+class TestDeliveryLog(unittest.TestCase):
+    
+    def setUp(self):
+        self.log = DeliveryLog(capacity=20, segment_size=10)
+    
+    def tearDown(self):
+        self.log.close()
+    
+    def test_old_segments_spill_and_stay_queryable(self):
+        for i in range(55):
+            self.log.append(f"user{i % 5}", f"alert{i // 10}", "in_app", timestamp=1000.0 + i)
+        
+        # Memory holds at most two segments plus a recycled spare
+        self.assertEqual(len(self.log), 55)
+        self.assertEqual(self.log.get_spilled_count(), 40)
+        self.assertLessEqual(self.log.get_memory_usage(), 3 * 10 * 18)
+        
+        history = self.log.get_user_history("user0")
+        self.assertEqual([d.delivered_at.timestamp() for d in history], [float(t) for t in range(1050, 999, -5)])
+        self.assertEqual(history[-1].alert_id, "alert0")
+        self.assertEqual(len(self.log.get_alert_history("alert1")), 10)
+        self.assertEqual(len(self.log.get_user_history("user1", limit=2)), 2)
+        self.assertEqual(self.log.get_user_history("nobody"), [])
+    
+    def test_counts_by_status_and_channel(self):
+        self.log.append("user1", "alert1", "in_app")
+        self.log.append("user1", "alert1", "email")
+        self.log.append("user2", "alert1", "email", STATUS_FAILED)
+        
+        self.assertEqual(self.log.count("sent"), 2)
+        self.assertEqual(self.log.count(STATUS_FAILED), 1)
+        self.assertEqual(self.log.count(channel="email"), 2)
+        self.assertEqual(self.log.get_counts_by_channel(), {"in_app": 1, "email": 1})
+        self.assertEqual(self.log.get_alert_history("alert1")[0].delivery_status, STATUS_FAILED)
+
+class TestPreferenceStore(unittest.TestCase):
+    
+    def setUp(self):
+        self.store = PreferenceStore()
+    
+    def test_bulk_create_and_lookup(self):
+        rows, created = self.store.get_or_create_rows(["u1", "u2", "u1"], "a1")
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(rows[0], rows[2])
+        self.assertTrue(created.all())
+        
+        # Single inserts land in the recent buffer and are still found
+        view, created = self.store.get_or_create("u3", "a1")
+        self.assertTrue(created)
+        self.assertEqual(self.store.find("u3", "a1"), view.row)
+        rows, created = self.store.get_or_create_rows(["u3", "u2", "u4"], "a1")
+        self.assertEqual(created.tolist(), [False, False, True])
+        self.assertEqual(self.store.count_users(), 4)
+        self.assertEqual(self.store.find_rows(["u4", "nobody"], "a1")[1], -1)
+        self.assertIsNone(self.store.get("u1", "a2"))
+    
+    def test_rows_for_alert_from_chunks(self):
+        self.store.get_or_create_rows(["u1", "u2"], "a1")
+        self.store.get_or_create("u1", "a2")
+        self.store.get_or_create_pairs(["u3", "u3", "u4"], ["a1", "a2", "a1"])
+        
+        expected = {alert_id: np.flatnonzero(self.store.export_columns()['alert'] == self.store.alert_ids.lookup(alert_id))
+                    for alert_id in ("a1", "a2")}
+        for alert_id, rows in expected.items():
+            self.assertEqual(self.store.rows_for_alert(alert_id).tolist(), rows.tolist())
+        self.assertEqual(len(self.store.rows_for_alert("missing")), 0)
+        
+        # A store filled from exported columns indexes the same rows
+        copy = PreferenceStore()
+        copy.load_columns(self.store.export_columns(), list(self.store.user_ids), list(self.store.alert_ids))
+        self.assertEqual(copy.rows_for_alert("a1").tolist(), expected["a1"].tolist())
+    
+    def test_view_writes_through_to_columns(self):
+        view, _ = self.store.get_or_create("u1", "a1")
+        view.mark_read()
+        
+        same = self.store.get("u1", "a1")
+        self.assertEqual(same.status, NotificationStatus.READ)
+        self.assertIsNotNone(same.read_at)
+        same.mark_unread()
+        self.assertIsNone(view.read_at)
+        self.assertEqual((view.user_id, view.alert_id), ("u1", "a1"))
+    
+    def test_vectorized_mask_matches_should_remind(self):
+        now = datetime.now()
+        states = [
+            (NotificationStatus.UNREAD, None, None),
+            (NotificationStatus.UNREAD, now - timedelta(minutes=30), None),
+            (NotificationStatus.UNREAD, now - timedelta(minutes=90), None),
+            (NotificationStatus.READ, None, None),
+            (NotificationStatus.SNOOZED, None, now + timedelta(hours=1)),
+            (NotificationStatus.SNOOZED, now - timedelta(hours=2), now - timedelta(minutes=1)),
+        ]
+        expected = []
+        for i, (status, last_reminded_at, snoozed_until) in enumerate(states):
+            reference = UserAlertPreference(f"u{i}", "a1")
+            view, _ = self.store.get_or_create(f"u{i}", "a1")
+            for preference in (reference, view):
+                preference.status = status
+                preference.last_reminded_at = last_reminded_at
+                preference.snoozed_until = snoozed_until
+            if reference.should_remind(60):
+                expected.append(i)
+        
+        due = self.store.due_rows({"a1": 3600})
+        self.assertEqual(due.tolist(), expected)
+        self.assertEqual(expected, [0, 2, 5])
+        self.assertEqual(len(self.store.due_rows({})), 0)
+
+class TestLogging(unittest.TestCase):
+    
+    def setUp(self):
+        self.output = StringIO()
+        self.logger = get_logger("tests.logging")
+        # Back to the configured defaults for the rest of the suite
+        self.addCleanup(configure_logging)
+    
+    def test_level_filters_records(self):
+        configure_logging(level="WARNING", async_sink=False, stream=self.output)
+        self.logger.info("hidden")
+        self.logger.warning("shown %d", 1)
+        self.logger.error("shown %d", 2)
+        
+        self.assertEqual(self.output.getvalue().splitlines(), ["shown 1", "shown 2"])
+    
+    def test_off_suppresses_every_record(self):
+        configure_logging(level="off", async_sink=False, stream=self.output)
+        self.logger.critical("hidden")
+        
+        self.assertEqual(self.output.getvalue(), "")
+    
+    def test_arguments_are_not_formatted_below_the_level(self):
+        argument = unittest.mock.MagicMock()
+        argument.__str__.return_value = "formatted"
+        configure_logging(level="INFO", async_sink=False, stream=self.output)
+        
+        self.logger.debug("value %s", argument)
+        argument.__str__.assert_not_called()
+        self.logger.info("value %s", argument)
+        argument.__str__.assert_called_once()
+        self.assertEqual(self.output.getvalue(), "value formatted\n")
+    
+    def test_async_sink_writes_queued_records_on_flush(self):
+        configure_logging(level="DEBUG", async_sink=True, stream=self.output)
+        for i in range(100):
+            self.logger.debug("record %d", i)
+        flush_logging()
+        
+        self.assertEqual(self.output.getvalue().splitlines(), [f"record {i}" for i in range(100)])
+        # The listener is restarted, so records after a flush are still written
+        self.logger.info("after flush")
+        flush_logging()
+        self.assertEqual(self.output.getvalue().splitlines()[-1], "after flush")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,314 @@
+import unittest
+import unittest.mock
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_service import AlertService
+from services.activity_series import CREATED, DAY
+from services.notification_service import NotificationService
+from services.snapshotter import Snapshotter
+from storage.base_storage import PreferenceRecord, DeliveryRecord
+from storage.journal import Journal
+from storage.journal_storage import JournalStorage
+from storage.memory_storage import MemoryStorage
+from storage.sqlite_storage import SQLiteStorage
+from storage.storage_factory import StorageFactory
+from models.alert import Severity, VisibilityType
+from models.notification import NotificationStatus
+from models.user import User, UserRole
+
+class StorageBackendTests:
+    """Behaviour every storage backend must share"""
+
+    def make_storage(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.storage = self.make_storage()
+        self.alert_service = AlertService()
+        self.alert_service.add_user(User("admin1", "Admin", "admin@example.com", UserRole.ADMIN))
+
+    def tearDown(self):
+        self.storage.close()
+
+    def _create_alert(self, visibility_type, target_ids, **kwargs):
+        return self.alert_service.create_alert(
+            title="Alert", message="Message", severity=Severity.WARNING, created_by="admin1",
+            visibility_type=visibility_type, target_ids=target_ids, **kwargs
+        )
+
+    def test_alert_round_trip(self):
+        expiry = datetime.now() + timedelta(hours=1)
+        alert = self._create_alert(VisibilityType.TEAM, {"eng", "ops"}, expiry_time=expiry)
+        alert.reminders_enabled = False
+        self.storage.save_alert(alert)
+
+        loaded, = self.storage.load_alerts()
+        self.assertEqual(loaded.alert_id, alert.alert_id)
+        self.assertEqual(loaded.severity, Severity.WARNING)
+        self.assertEqual(loaded.visibility.target_ids, {"eng", "ops"})
+        self.assertEqual(loaded.expiry_time, expiry)
+        self.assertEqual(loaded.created_at, alert.created_at)
+        self.assertFalse(loaded.reminders_enabled)
+
+    def test_alerts_by_visibility_target(self):
+        org = self._create_alert(VisibilityType.ORGANIZATION, set())
+        team = self._create_alert(VisibilityType.TEAM, {"eng"})
+        user = self._create_alert(VisibilityType.USER, {"user1"})
+        self.storage.save_alerts([org, team, user])
+
+        self.assertEqual(self.storage.get_alert_ids_for_target(VisibilityType.ORGANIZATION), [org.alert_id])
+        self.assertEqual(self.storage.get_alert_ids_for_target(VisibilityType.TEAM, "eng"), [team.alert_id])
+        self.assertEqual(self.storage.get_alert_ids_for_target(VisibilityType.USER, "user1"), [user.alert_id])
+
+        # Retargeting replaces the old index entries
+        team.visibility.target_ids = {"ops"}
+        self.storage.save_alert(team)
+        self.assertEqual(self.storage.get_alert_ids_for_target(VisibilityType.TEAM, "eng"), [])
+        self.assertEqual(self.storage.get_alert_ids_for_target(VisibilityType.TEAM, "ops"), [team.alert_id])
+
+    def test_users_and_teams_round_trip(self):
+        self.storage.save_users([User("user1", "User One", "u1@example.com", phone="+15550001")])
+        self.alert_service.add_team("eng", {"user1", "user2"}, name="Engineering")
+        self.storage.save_team(self.alert_service.get_team("eng"))
+
+        user, = self.storage.load_users()
+        self.assertEqual(user.phone, "+15550001")
+        team, = self.storage.load_teams()
+        self.assertEqual(team.name, "Engineering")
+        self.assertEqual(team.member_ids, {"user1", "user2"})
+
+    def test_preferences_by_user_and_status(self):
+        now = datetime.now().timestamp()
+        self.storage.save_preferences([
+            PreferenceRecord("user1", "a1", "unread", None, None, None, now),
+            PreferenceRecord("user1", "a2", "read", None, now, now, now),
+            PreferenceRecord("user2", "a1", "unread", None, None, None, now)
+        ])
+        # Saving the same key again replaces it
+        self.storage.save_preferences([PreferenceRecord("user1", "a1", "snoozed", now + 60, None, None, now)])
+
+        self.assertEqual(len(list(self.storage.load_preferences())), 3)
+        self.assertEqual(len(self.storage.get_preferences_for_user("user1")), 2)
+        snoozed, = self.storage.get_preferences_for_user("user1", "snoozed")
+        self.assertEqual(snoozed.snoozed_until, now + 60)
+        self.assertEqual(self.storage.get_preferences_for_user("user1", "unread"), [])
+
+    def test_deliveries_by_time(self):
+        start = datetime(2024, 1, 1)
+        self.storage.append_deliveries([
+            DeliveryRecord("user1", "a1", "in_app", "sent", (start + timedelta(minutes=minute)).timestamp())
+            for minute in (30, 10, 20, 40)
+        ])
+
+        deliveries = self.storage.get_deliveries_between(start + timedelta(minutes=10), start + timedelta(minutes=40))
+        self.assertEqual([d.delivered_at for d in deliveries],
+                         [(start + timedelta(minutes=minute)).timestamp() for minute in (10, 20, 30)])
+
+class TestMemoryStorage(StorageBackendTests, unittest.TestCase):
+
+    def make_storage(self):
+        return MemoryStorage()
+
+class TestSQLiteStorage(StorageBackendTests, unittest.TestCase):
+
+    def make_storage(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        return SQLiteStorage(os.path.join(self.directory, "alerts.db"))
+
+    def test_wal_mode(self):
+        mode, = self.storage._connection().execute("PRAGMA journal_mode").fetchone()
+        self.assertEqual(mode, "wal")
+
+    def test_one_connection_per_thread(self):
+        connections = []
+        thread = threading.Thread(target=lambda: connections.append(self.storage._connection()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(self.storage._connection(), self.storage._connection())
+        self.assertIsNot(connections[0], self.storage._connection())
+
+    def test_failed_batch_is_rolled_back(self):
+        now = datetime.now().timestamp()
+        with self.assertRaises(Exception):
+            self.storage.save_preferences([
+                PreferenceRecord("user1", "a1", "unread", None, None, None, now),
+                PreferenceRecord("user1", "a2", "unread", None, None, None, None)  # created_at is NOT NULL
+            ])
+        self.assertEqual(list(self.storage.load_preferences()), [])
+
+    def test_factory_creates_backend_from_url(self):
+        storage = StorageFactory.create_storage("sqlite:///" + os.path.join(self.directory, "other.db"))
+        self.addCleanup(storage.close)
+        self.assertIsInstance(storage, SQLiteStorage)
+        self.assertIsInstance(StorageFactory.create_storage("memory://"), MemoryStorage)
+
+        # Per-thread connections would each see their own empty in-memory database
+        for url in ("sqlite:///", "sqlite:///:memory:"):
+            with self.assertRaises(ValueError):
+                StorageFactory.create_storage(url)
+        with self.assertRaises(ValueError):
+            StorageFactory.create_storage("postgres://localhost/alerts")
+
+    def test_services_restart_from_storage(self):
+        alert_service = AlertService(storage=self.storage)
+        notification_service = NotificationService(alert_service)
+        alert_service.add_user(User("admin1", "Admin", "admin@example.com", UserRole.ADMIN))
+        alert_service.add_user(User("user1", "User One", "u1@example.com"))
+        alert_service.add_team("eng", {"user1"})
+        alert = alert_service.create_alert(
+            title="Outage", message="Down", severity=Severity.CRITICAL, created_by="admin1",
+            visibility_type=VisibilityType.TEAM, target_ids={"eng"}
+        )
+        notification_service.snooze_alert("user1", alert.alert_id)
+
+        restarted = AlertService(storage=self.storage)
+        restarted_notifications = NotificationService(restarted)
+        observer = unittest.mock.Mock()
+        restarted.add_observer(observer)
+        self.assertEqual(restarted.load_from_storage(), 1)
+        self.assertEqual(restarted_notifications.load_from_storage(), 1)
+        # Loading restores state; it raises no events, membership included
+        self.assertEqual(observer.method_calls, [])
+
+        self.assertEqual([a.alert_id for a in restarted.get_alerts_for_user("user1")], [alert.alert_id])
+        self.assertEqual(restarted.get_user_teams("user1"), {"eng"})
+        preference = restarted_notifications.get_user_preference("user1", alert.alert_id)
+        self.assertEqual(preference.status, NotificationStatus.SNOOZED)
+        self.assertIsNotNone(preference.last_reminded_at)
+        self.assertIsNotNone(preference.first_delivered_at)
+        self.assertGreaterEqual(restarted_notifications.get_next_reminder_time("user1", alert.alert_id),
+                                preference.snoozed_until)
+        self.assertEqual(len(self.storage.get_deliveries_between(alert.created_at, datetime.now() + timedelta(1))), 1)
+        # Restored alerts count towards the creation trend
+        self.assertEqual(restarted_notifications.count_activity(CREATED, DAY, alert.created_at), 1)
+
+class TestJournalStorage(StorageBackendTests, unittest.TestCase):
+
+    def make_storage(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        return JournalStorage(self.directory, group_commit_ms=1)
+
+    def _build_services(self, storage):
+        alert_service = AlertService(storage=storage)
+        notification_service = NotificationService(alert_service)
+        return alert_service, notification_service
+
+    def test_restart_from_snapshot_and_journal_tail(self):
+        alert_service, notification_service = self._build_services(self.storage)
+        alert_service.add_user(User("admin1", "Admin", "admin@example.com", UserRole.ADMIN))
+        alert_service.add_user(User("user1", "User One", "u1@example.com"))
+        first = alert_service.create_alert(
+            title="First", message="Message", severity=Severity.INFO, created_by="admin1",
+            visibility_type=VisibilityType.ORGANIZATION, target_ids=set()
+        )
+        snapshot_seq = Snapshotter(self.storage, alert_service, notification_service).run_once()
+
+        # Changes after the snapshot only exist in the journal tail
+        second = alert_service.create_alert(
+            title="Second", message="Message", severity=Severity.CRITICAL, created_by="admin1",
+            visibility_type=VisibilityType.USER, target_ids={"user1"}
+        )
+        notification_service.mark_as_read("user1", first.alert_id)
+        alert_service.add_team("eng", {"user1"})
+        self.storage.close()
+
+        storage = JournalStorage(self.directory)
+        self.addCleanup(storage.close)
+        tail = list(storage.journal.replay(snapshot_seq))
+        self.assertTrue(tail)
+        self.assertTrue(all(seq > snapshot_seq for seq, _, _ in tail))
+
+        restarted, restarted_notifications = self._build_services(storage)
+        self.assertEqual(restarted.load_from_storage(), 2)
+        self.assertEqual(restarted_notifications.load_from_storage(), 3)
+
+        self.assertEqual([a.alert_id for a in restarted.get_alerts_for_user("user1")],
+                         [first.alert_id, second.alert_id])
+        self.assertEqual(restarted.get_user_teams("user1"), {"eng"})
+        self.assertEqual(restarted_notifications.get_user_preference("user1", first.alert_id).status,
+                         NotificationStatus.READ)
+        self.assertIsNone(restarted_notifications.get_next_reminder_time("user1", first.alert_id))
+        self.assertIsNotNone(restarted_notifications.get_next_reminder_time("user1", second.alert_id))
+
+    def test_snapshot_drops_covered_journal_segments(self):
+        alert_service, notification_service = self._build_services(self.storage)
+        for i in range(3):
+            alert_service.add_user(User(f"user{i}", "User", "user@example.com"))
+            self.storage.snapshot(alert_service, notification_service)
+
+        snapshots = [name for name in os.listdir(self.directory) if name.startswith("snapshot-")]
+        self.assertEqual(len(snapshots), 1)
+        self.assertEqual(len(self.storage.journal.segments()), 1)
+        self.assertEqual(len(self.storage.load_users()), 3)
+
+    def test_background_snapshotter_stops_without_waiting_out_its_interval(self):
+        alert_service, notification_service = self._build_services(self.storage)
+        alert_service.add_user(User("user1", "User One", "u1@example.com"))
+        snapshotter = Snapshotter(self.storage, alert_service, notification_service, interval=3600)
+        snapshotter.start()
+        self.addCleanup(snapshotter.stop)
+
+        # The first snapshot is taken as soon as it starts
+        deadline = time.monotonic() + 5
+        while not any(name.startswith("snapshot-") for name in os.listdir(self.directory)):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        start = time.monotonic()
+        snapshotter.stop()
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertFalse(snapshotter.is_running())
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def _open(self, **kwargs):
+        journal = Journal(self.directory, **kwargs)
+        self.addCleanup(journal.close)
+        return journal
+
+    def test_group_commit_shares_one_fsync(self):
+        journal = self._open(group_commit_ms=50, group_commit_records=1000)
+        seqs = [journal.append(1, {"n": n}) for n in range(100)]
+
+        self.assertEqual(seqs, list(range(1, 101)))
+        self.assertTrue(journal.wait(seqs[-1], timeout=5))
+        self.assertEqual(journal.get_fsync_count(), 1)
+
+    def test_full_group_commits_before_the_window(self):
+        journal = self._open(group_commit_ms=60000, group_commit_records=10)
+        for n in range(10):
+            seq = journal.append(1, n)
+        self.assertTrue(journal.wait(seq, timeout=5))
+
+    def test_replay_after_seq_and_torn_tail(self):
+        journal = self._open(group_commit_ms=1)
+        for n in range(5):
+            journal.append(2, n)
+        journal.close()
+
+        _, path = journal.segments()[-1]
+        with open(path, "ab") as segment:
+            segment.write(b"\x05\x00\x00")  # a record cut off mid-header
+
+        reopened = self._open()
+        self.assertEqual([(seq, payload) for seq, _, payload in reopened.replay(3)], [(4, 3), (5, 4)])
+        self.assertEqual(reopened.append(2, 5), 6)
+        self.assertEqual([payload for _, _, payload in reopened.replay()], [0, 1, 2, 3, 4, 5])
+
+if __name__ == '__main__':
+    unittest.main()